@@ -100,6 +100,12 @@ def typing(session: nox.Session):
     session.run("pyre", "--source-directory", "src")
 
 
+@nox.session
+def benchmark(session: nox.Session):
+    install(session, ".", "PyYAML", editable=True)
+    session.run("python", "tests/benchmark.py", *session.posargs)
+
+
 @nox.session
 def create_vectors(session: nox.Session):
     install(session, ".", "PyYAML", editable=True)
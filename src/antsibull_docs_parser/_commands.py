@@ -0,0 +1,761 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2022, Ansible Project
+"""
+Command parsers for the built-in markup.
+
+The public classes are re-exported by :mod:`antsibull_docs_parser.parser`.
+"""
+
+from __future__ import annotations
+
+import abc
+import re
+import typing as t
+from enum import Enum as _Enum
+
+from . import dom
+from .diagnostics import DiagnosticCode, _repr
+
+_IGNORE_MARKER = "ignore:"
+_ARRAY_STUB_RE = re.compile(r"\[([^\]]*)\]")
+_FQCN_TYPE_PREFIX_RE = re.compile(r"^([^.]+\.[^.]+\.[^#]+)#([^:]+):(.*)$")
+_FQCN = re.compile(r"^[A-Za-z0-9_]+\.[A-Za-z0-9_]+(?:\.[A-Za-z0-9_]+)+$")
+_PLUGIN_TYPE = re.compile(r"^[a-z_]+$")
+# Non-breaking and zero-width spaces are never replaced
+_SPACES_TO_KEEP = "\u00a0\u202f\u2007\u2060\u200b\u200c\u200d\ufeff"
+# A run of whitespace that is replaced by a single space
+_WHITESPACE = re.compile(f"[^\\S{_SPACES_TO_KEEP}]+")
+# A run of whitespace that contains a newline
+_WHITESPACE_WITH_NEWLINE = re.compile(
+    f"[^\\S{_SPACES_TO_KEEP}]*[\\n\\r][^\\S{_SPACES_TO_KEEP}]*"
+)
+# A run of whitespace that does not contain a newline
+_WHITESPACE_WITHOUT_NEWLINE = re.compile(f"[^\\S\\n\\r{_SPACES_TO_KEEP}]+")
+# ASCII texts that do not match these do not need whitespace processing
+_ASCII_WHITESPACE_TO_STRIP = re.compile(r"[\t\n\v\f\r\x1c-\x1f]| {2}")
+_ASCII_WHITESPACE_TO_KEEP_SINGLE_NEWLINES = re.compile(r"[\t\v\f\r\x1c-\x1f]|[ \n]{2}")
+_DANGEROUS_WS = str.maketrans("\t\n\r", "   ")
+
+
+def _is_fqcn(text: str) -> bool:
+    return _FQCN.match(text) is not None
+
+
+def _is_plugin_type(text: str) -> bool:
+    # We do not want to hard-code a list of valid plugin types that might be
+    # inaccurate, so we simply check whether this is a valid kind of Python
+    # identifier usually used for plugin types. If ansible-core ever adds one
+    # with digits, we'll have to update this.
+    return _PLUGIN_TYPE.match(text) is not None
+
+
+class _MarkupError(ValueError):
+    """
+    Raised by the built-in commands for invalid markup.
+    """
+
+    def __init__(self, code: DiagnosticCode, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class Whitespace(_Enum):
+    """
+    How whitespace should be parsed.
+    """
+
+    IGNORE = 0
+    """Keep all whitespace as-is."""
+
+    STRIP = 1
+    """
+    Reduce all whitespace (space, tabs, newlines, ...) to regular breakable or
+    non-breakable spaces. Multiple spaces are kept in everything that's often
+    rendered code-style, like ``C()``, ``O()``, ``V()``, ``RV()``, ``E()``.
+    """
+
+    KEEP_SINGLE_NEWLINES = 2
+    """Similar to STRIP, but keep single newlines intact."""
+
+
+def _process_whitespace(
+    text: str,
+    *,
+    whitespace: Whitespace,
+    code_environment: bool = False,
+    no_newlines: bool = False,
+) -> str:
+    if whitespace == Whitespace.IGNORE:
+        return text
+    if code_environment:
+        return text.translate(_DANGEROUS_WS)
+    if whitespace == Whitespace.STRIP or no_newlines:
+        if text.isascii() and _ASCII_WHITESPACE_TO_STRIP.search(text) is None:
+            return text
+        return _WHITESPACE.sub(" ", text)
+    if (
+        text.isascii()
+        and _ASCII_WHITESPACE_TO_KEEP_SINGLE_NEWLINES.search(text) is None
+    ):
+        return text
+    text = _WHITESPACE_WITH_NEWLINE.sub("\n", text)
+    return _WHITESPACE_WITHOUT_NEWLINE.sub(" ", text)
+
+
+class Context(t.NamedTuple):
+    """
+    Describes the context in which markup is parsed.
+
+    If an option or return value is referenced without a plugin or role entrypoint,
+    the information from the context is used, if available.
+
+    So if ``O(bam)`` is used in the context of a plugin ``foo.bar.baz``,
+    it is assumed that ``bam`` is an option of ``foo.bar.baz``.
+
+    If the context does not have a current plugin, ``O(bam)`` references an unknown plugin.
+    """
+
+    current_plugin: dom.PluginIdentifier | None = None
+    """The current plugin for this context."""
+
+    role_entrypoint: str | None = None
+    """The role entrypoint for this context, if the current plugin is a role."""
+
+
+class CommandError(t.NamedTuple):
+    """
+    An error found by :meth:`CommandParser.validate`.
+    """
+
+    code: DiagnosticCode
+    """The kind of the error."""
+
+    message: str
+    """The description of the error."""
+
+
+class CommandParser(abc.ABC):
+    command: str
+    parameters: int
+    escaped_arguments: bool
+    strip_surrounding_whitespace: bool
+
+    def __init__(
+        self,
+        command: str,
+        parameters: int,
+        escaped_arguments: bool = False,
+        *,
+        strip_surrounding_whitespace: bool = False,
+    ):
+        self.command = command
+        self.parameters = parameters
+        self.escaped_arguments = escaped_arguments
+        self.strip_surrounding_whitespace = strip_surrounding_whitespace
+
+    @abc.abstractmethod
+    def parse(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart:
+        pass  # pragma: no cover
+
+    def uses_context(  # pylint:disable=no-self-use
+        self,
+        parameters: list[str],  # pylint:disable=unused-argument
+        whitespace: Whitespace,  # pylint:disable=unused-argument
+    ) -> bool:
+        """
+        Determine whether the result of :meth:`parse` for these parameters depends on
+        the context.
+
+        The default implementation always returns ``True``. Results that do not depend
+        on the context can be reused for different contexts.
+        """
+        return True
+
+    def validate(
+        self,
+        parameters: list[str],
+        context: Context,
+        whitespace: Whitespace,
+    ) -> CommandError | None:
+        """
+        Determine whether :meth:`parse` succeeds for these parameters, without creating
+        a part if possible.
+
+        The default implementation calls :meth:`parse`, and converts an exception into
+        an error.
+        """
+        result = _call_parse(self, parameters, context, None, whitespace)
+        return result if isinstance(result, CommandError) else None
+
+
+def _call_parse(
+    cmd: CommandParser,
+    parameters: list[str],
+    context: Context,
+    source: str | None,
+    whitespace: Whitespace,
+) -> dom.AnyPart | CommandError:
+    try:
+        return cmd.parse(parameters, context, source=source, whitespace=whitespace)
+    except _MarkupError as exc:
+        return CommandError(exc.code, f"{exc}")
+    except Exception as exc:  # pylint:disable=broad-except
+        return CommandError(DiagnosticCode.OTHER, f"{exc}")
+
+
+class CommandParserEx(CommandParser):
+    old_markup: bool
+
+    def __init__(
+        self,
+        command: str,
+        parameters: int,
+        escaped_arguments: bool = False,
+        old_markup: bool = False,
+        *,
+        strip_surrounding_whitespace: bool = False,
+    ):
+        super().__init__(
+            command,
+            parameters,
+            escaped_arguments=escaped_arguments,
+            strip_surrounding_whitespace=strip_surrounding_whitespace,
+        )
+        self.old_markup = old_markup
+
+    def uses_context(self, parameters: list[str], whitespace: Whitespace) -> bool:
+        # Only O() and RV() use the context
+        return False
+
+    def parse_or_error(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart | CommandError:
+        """
+        Same as :meth:`parse`, but returns an error instead of raising an exception.
+
+        The parser uses this method instead of :meth:`parse`, since raising and catching
+        exceptions is slow for texts with many errors. The default implementation calls
+        :meth:`parse`, and converts an exception into an error.
+        """
+        return _call_parse(self, parameters, context, source, whitespace)
+
+
+class _InfallibleCommandParser(CommandParserEx):
+    @abc.abstractmethod
+    def parse(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart:
+        pass  # pragma: no cover
+
+    def parse_or_error(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart | CommandError:
+        return self.parse(parameters, context, source, whitespace)
+
+    def validate(
+        self,
+        parameters: list[str],
+        context: Context,
+        whitespace: Whitespace,
+    ) -> CommandError | None:
+        return None
+
+
+class _FallibleCommandParser(CommandParserEx):
+    @abc.abstractmethod
+    def parse_or_error(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart | CommandError:
+        pass  # pragma: no cover
+
+    def parse(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart:
+        result = self.parse_or_error(parameters, context, source, whitespace)
+        if isinstance(result, CommandError):
+            raise _MarkupError(*result)
+        return result
+
+
+def _check_fqcn(kind: str, fqcn: str) -> CommandError | None:
+    if _is_fqcn(fqcn):
+        return None
+    return CommandError(
+        DiagnosticCode.INVALID_FQCN, f"{kind} name {_repr(fqcn)} is not a FQCN"
+    )
+
+
+def _check_plugin_type(plugin_type: str) -> CommandError | None:
+    if _is_plugin_type(plugin_type):
+        return None
+    return CommandError(
+        DiagnosticCode.INVALID_PLUGIN_TYPE,
+        f"Plugin type {_repr(plugin_type)} is not valid",
+    )
+
+
+def _check_plugin_reference(name: str) -> CommandError | None:
+    if "#" not in name:
+        return CommandError(
+            DiagnosticCode.INVALID_PLUGIN_REFERENCE,
+            f"Parameter {_repr(name)} is not of the form FQCN#type",
+        )
+    fqcn, ptype = name.split("#", 1)
+    return _check_fqcn("Plugin", fqcn) or _check_plugin_type(ptype)
+
+
+# Classic Ansible docs markup:
+
+
+class _Italics(_InfallibleCommandParser):
+    def __init__(self):
+        super().__init__("I", 1, old_markup=True)
+
+    def parse(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart:
+        return dom.ItalicPart(
+            text=_process_whitespace(
+                parameters[0], whitespace=whitespace, no_newlines=True
+            ),
+            source=source,
+        )
+
+
+class _Bold(_InfallibleCommandParser):
+    def __init__(self):
+        super().__init__("B", 1, old_markup=True)
+
+    def parse(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart:
+        return dom.BoldPart(
+            text=_process_whitespace(
+                parameters[0], whitespace=whitespace, no_newlines=True
+            ),
+            source=source,
+        )
+
+
+class _Module(_FallibleCommandParser):
+    def __init__(self):
+        super().__init__("M", 1, old_markup=True)
+
+    def parse_or_error(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart | CommandError:
+        fqcn = _process_whitespace(
+            parameters[0], whitespace=whitespace, no_newlines=True
+        )
+        error = _check_fqcn("Module", fqcn)
+        if error is not None:
+            return error
+        return dom.ModulePart(fqcn=fqcn, source=source)
+
+    def validate(
+        self,
+        parameters: list[str],
+        context: Context,
+        whitespace: Whitespace,
+    ) -> CommandError | None:
+        return _check_fqcn(
+            "Module",
+            _process_whitespace(parameters[0], whitespace=whitespace, no_newlines=True),
+        )
+
+
+class _URL(_InfallibleCommandParser):
+    def __init__(self):
+        super().__init__("U", 1, old_markup=True)
+
+    def parse(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart:
+        return dom.URLPart(
+            url=_process_whitespace(
+                parameters[0], whitespace=whitespace, no_newlines=True
+            ),
+            source=source,
+        )
+
+
+class _Link(_InfallibleCommandParser):
+    def __init__(self):
+        super().__init__("L", 2, old_markup=True)
+
+    def parse(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart:
+        text = _process_whitespace(
+            parameters[0], whitespace=whitespace, no_newlines=True
+        )
+        url = _process_whitespace(
+            parameters[1], whitespace=whitespace, no_newlines=True
+        )
+        return dom.LinkPart(text=text, url=url, source=source)
+
+
+class _RSTRef(_InfallibleCommandParser):
+    def __init__(self):
+        super().__init__("R", 2, old_markup=True)
+
+    def parse(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart:
+        text = _process_whitespace(
+            parameters[0], whitespace=whitespace, no_newlines=True
+        )
+        ref = _process_whitespace(
+            parameters[1], whitespace=whitespace, no_newlines=True
+        )
+        return dom.RSTRefPart(text=text, ref=ref, source=source)
+
+
+class _Code(_InfallibleCommandParser):
+    def __init__(self):
+        super().__init__("C", 1, old_markup=True)
+
+    def parse(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart:
+        return dom.CodePart(
+            text=_process_whitespace(
+                parameters[0],
+                whitespace=whitespace,
+                code_environment=True,
+                no_newlines=True,
+            ),
+            source=source,
+        )
+
+
+class _HorizontalLine(_InfallibleCommandParser):
+    def __init__(self):
+        super().__init__(
+            "HORIZONTALLINE", 0, old_markup=True, strip_surrounding_whitespace=True
+        )
+
+    def parse(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart:
+        return dom.HorizontalLinePart(source=source)
+
+
+# Semantic Ansible docs markup:
+
+
+def _split_option_like(
+    text: str,
+    context: Context,
+) -> (
+    tuple[
+        dom.PluginIdentifier | None,
+        str | None,
+        str,
+        str | None,
+    ]
+    | CommandError
+):
+    value = None
+    if "=" in text:
+        text, value = text.split("=", 1)
+    entrypoint: str | None = None
+    m = _FQCN_TYPE_PREFIX_RE.match(text)
+    if m:
+        plugin_fqcn = m.group(1)
+        plugin_type = m.group(2)
+        error = _check_fqcn("Plugin", plugin_fqcn) or _check_plugin_type(plugin_type)
+        if error is not None:
+            return error
+        plugin_identifier = dom.PluginIdentifier(fqcn=plugin_fqcn, type=plugin_type)
+        text = m.group(3)
+    elif text.startswith(_IGNORE_MARKER):
+        plugin_identifier = None
+        text = text[len(_IGNORE_MARKER) :]
+    else:
+        plugin_identifier = context.current_plugin
+        entrypoint = context.role_entrypoint
+    if plugin_identifier is not None and plugin_identifier.type == "role":
+        part1, sep, part2 = text.partition(":")
+        if sep:
+            entrypoint = part1
+            text = part2
+        if entrypoint is None:
+            return CommandError(
+                DiagnosticCode.MISSING_ENTRYPOINT,
+                "Role reference is missing entrypoint",
+            )
+    if ":" in text or "#" in text:
+        return CommandError(
+            DiagnosticCode.INVALID_NAME,
+            f"Invalid option/return value name {_repr(text)}",
+        )
+    return plugin_identifier, entrypoint, text, value
+
+
+def _validate_option_like(
+    parameter: str, context: Context, whitespace: Whitespace
+) -> CommandError | None:
+    result = _split_option_like(
+        _process_whitespace(
+            parameter,
+            whitespace=whitespace,
+            code_environment=True,
+            no_newlines=True,
+        ),
+        context,
+    )
+    return result if isinstance(result, CommandError) else None
+
+
+def _option_like_uses_context(parameter: str, whitespace: Whitespace) -> bool:
+    text = _process_whitespace(
+        parameter, whitespace=whitespace, code_environment=True, no_newlines=True
+    )
+    text = text.split("=", 1)[0]
+    return _FQCN_TYPE_PREFIX_RE.match(text) is None and not text.startswith(
+        _IGNORE_MARKER
+    )
+
+
+class _Plugin(_FallibleCommandParser):
+    def __init__(self):
+        super().__init__("P", 1, escaped_arguments=True)
+
+    def parse_or_error(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart | CommandError:
+        name = _process_whitespace(
+            parameters[0], whitespace=whitespace, no_newlines=True
+        )
+        error = _check_plugin_reference(name)
+        if error is not None:
+            return error
+        fqcn, ptype = name.split("#", 1)
+        return dom.PluginPart(
+            plugin=dom.PluginIdentifier(fqcn=fqcn, type=ptype), source=source
+        )
+
+    def validate(
+        self,
+        parameters: list[str],
+        context: Context,
+        whitespace: Whitespace,
+    ) -> CommandError | None:
+        return _check_plugin_reference(
+            _process_whitespace(parameters[0], whitespace=whitespace, no_newlines=True)
+        )
+
+
+class _EnvVar(_InfallibleCommandParser):
+    def __init__(self):
+        super().__init__("E", 1, escaped_arguments=True)
+
+    def parse(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart:
+        return dom.EnvVariablePart(
+            name=_process_whitespace(
+                parameters[0],
+                whitespace=whitespace,
+                code_environment=True,
+                no_newlines=True,
+            ),
+            source=source,
+        )
+
+
+class _OptionValue(_InfallibleCommandParser):
+    def __init__(self):
+        super().__init__("V", 1, escaped_arguments=True)
+
+    def parse(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart:
+        return dom.OptionValuePart(
+            value=_process_whitespace(
+                parameters[0],
+                whitespace=whitespace,
+                code_environment=True,
+                no_newlines=True,
+            ),
+            source=source,
+        )
+
+
+class _OptionName(_FallibleCommandParser):
+    def __init__(self):
+        super().__init__("O", 1, escaped_arguments=True)
+
+    def uses_context(self, parameters: list[str], whitespace: Whitespace) -> bool:
+        return _option_like_uses_context(parameters[0], whitespace)
+
+    def validate(
+        self,
+        parameters: list[str],
+        context: Context,
+        whitespace: Whitespace,
+    ) -> CommandError | None:
+        return _validate_option_like(parameters[0], context, whitespace)
+
+    def parse_or_error(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart | CommandError:
+        result = _split_option_like(
+            _process_whitespace(
+                parameters[0],
+                whitespace=whitespace,
+                code_environment=True,
+                no_newlines=True,
+            ),
+            context,
+        )
+        if isinstance(result, CommandError):
+            return result
+        plugin, entrypoint, name, value = result
+        return dom.OptionNamePart(
+            plugin=plugin,
+            entrypoint=entrypoint,
+            link=_ARRAY_STUB_RE.sub("", name).split("."),
+            name=name,
+            value=value,
+            source=source,
+        )
+
+
+class _ReturnValue(_FallibleCommandParser):
+    def __init__(self):
+        super().__init__("RV", 1, escaped_arguments=True)
+
+    def uses_context(self, parameters: list[str], whitespace: Whitespace) -> bool:
+        return _option_like_uses_context(parameters[0], whitespace)
+
+    def validate(
+        self,
+        parameters: list[str],
+        context: Context,
+        whitespace: Whitespace,
+    ) -> CommandError | None:
+        return _validate_option_like(parameters[0], context, whitespace)
+
+    def parse_or_error(
+        self,
+        parameters: list[str],
+        context: Context,
+        source: str | None,
+        whitespace: Whitespace,
+    ) -> dom.AnyPart | CommandError:
+        result = _split_option_like(
+            _process_whitespace(
+                parameters[0],
+                whitespace=whitespace,
+                code_environment=True,
+                no_newlines=True,
+            ),
+            context,
+        )
+        if isinstance(result, CommandError):
+            return result
+        plugin, entrypoint, name, value = result
+        return dom.ReturnValuePart(
+            plugin=plugin,
+            entrypoint=entrypoint,
+            link=_ARRAY_STUB_RE.sub("", name).split("."),
+            name=name,
+            value=value,
+            source=source,
+        )
+
+
+_COMMANDS = [
+    _Italics(),
+    _Bold(),
+    _Module(),
+    _URL(),
+    _Link(),
+    _RSTRef(),
+    _Code(),
+    _HorizontalLine(),
+    _Plugin(),
+    _EnvVar(),
+    _OptionValue(),
+    _OptionName(),
+    _ReturnValue(),
+]
@@ -0,0 +1,166 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+"""
+Internal escaping code shared by the serializers.
+
+Every escape function first checks whether the text contains a character that needs
+escaping at all, and returns the text unchanged if it does not. The ``*_name`` and
+``*_url`` functions are memoized with a bounded cache, since the same FQCNs and URLs
+are escaped over and over again when rendering documentation.
+"""
+
+from __future__ import annotations
+
+import functools
+import re
+from urllib.parse import quote
+
+# The number of distinct names and URLs remembered by each memoized function
+MEMO_SIZE = 1024
+
+_HTML_SPECIAL = re.compile(r"[&<>']")
+_HTML_ATTRIBUTE_SPECIAL = re.compile(r"""[&<>'"]""")
+
+_MD_CHARACTERS = """!"#$%&'()*+,:;<=>?@[\\]^_`{|}~.-"""
+_MD_SPECIAL = re.compile(r"""[!"#$%&'()*+,:;<=>?@[\\\]^_`{|}~.-]""")
+_MD_TABLE = str.maketrans({character: f"\\{character}" for character in _MD_CHARACTERS})
+
+_RST_SPECIAL = re.compile(r"[\\<>_*`|-]")
+
+# We include several characters in safe to be compatible to JavaScript's encodeURI() method.
+# https://developer.mozilla.org/en-US/docs/Web/JavaScript/Reference/Global_Objects/encodeURI
+_URL_SAFE = ":/#?!*'();@&=+$,"
+_URL_UNCHANGED = re.compile(r"[A-Za-z0-9_.~:/#?!*'();@&=+$,-]*")
+
+
+def html_escape(text: str) -> str:
+    """
+    Escape ``&``, ``<``, ``>``, and ``'`` for HTML. Double quotes are kept as they are.
+
+    This is ``html.escape()`` without escaping ``"``.
+    """
+    if _HTML_SPECIAL.search(text) is None:
+        return text
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace("'", "&#x27;")
+    )
+
+
+def html_attribute_escape(text: str) -> str:
+    """
+    Escape a text for use in a quoted HTML attribute. This is ``html.escape()``.
+    """
+    if _HTML_ATTRIBUTE_SPECIAL.search(text) is None:
+        return text
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&#x27;")
+    )
+
+
+def md_escape(text: str) -> str:
+    """
+    Escape all ASCII punctuation characters that have a meaning in MarkDown.
+    """
+    if _MD_SPECIAL.search(text) is None:
+        return text
+    return text.translate(_MD_TABLE)
+
+
+def rst_escape_characters(text: str) -> str:
+    """
+    Escape the characters that have a meaning in RST with a backslash.
+    """
+    if _RST_SPECIAL.search(text) is None:
+        return text
+    return (
+        text.replace("\\", "\\\\")
+        .replace("<", "\\<")
+        .replace(">", "\\>")
+        .replace("_", "\\_")
+        .replace("*", "\\*")
+        .replace("`", "\\`")
+        .replace("|", "\\|")
+        .replace("-", "\\-")
+    )
+
+
+def url_escape(url: str) -> str:
+    """
+    Percent-encode a URL like JavaScript's ``encodeURI()``.
+    """
+    if _URL_UNCHANGED.fullmatch(url) is not None:
+        return url
+    return quote(url, safe=_URL_SAFE)
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def html_escape_name(name: str) -> str:
+    """
+    Memoized :func:`html_escape` for FQCNs and similar names.
+    """
+    return html_escape(name)
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def md_escape_name(name: str) -> str:
+    """
+    Memoized :func:`md_escape` for FQCNs and similar names.
+    """
+    return md_escape(name)
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def rst_escape_name(name: str) -> str:
+    """
+    Memoized :func:`rst_escape_characters` for FQCNs and similar names.
+    """
+    return rst_escape_characters(name)
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def html_escape_url(url: str) -> str:
+    """
+    Memoized :func:`url_escape` followed by :func:`html_attribute_escape`.
+    """
+    return html_attribute_escape(url_escape(url))
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def md_escape_url(url: str) -> str:
+    """
+    Memoized :func:`url_escape` followed by :func:`md_escape`.
+    """
+    return md_escape(url_escape(url))
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def rst_escape_url(url: str) -> str:
+    """
+    Memoized :func:`url_escape`.
+    """
+    return url_escape(url)
+
+
+def clear_memos() -> None:
+    """
+    Clear the caches of all memoized functions.
+    """
+    for function in (
+        html_escape_name,
+        md_escape_name,
+        rst_escape_name,
+        html_escape_url,
+        md_escape_url,
+        rst_escape_url,
+    ):
+        function.cache_clear()
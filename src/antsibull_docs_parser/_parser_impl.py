@@ -9,10 +9,14 @@ Internal parsing code.
 
 from __future__ import annotations
 
+import abc
 import re
+import typing as t
 
 _ESCAPE_OR_COMMA = re.compile(r"\\(.)| *(,) *")
 _ESCAPE_OR_CLOSING = re.compile(r"\\(.)|([)])")
+_BACKSLASH_OR_COMMA = re.compile(r"[\\,]")
+_BACKSLASH_OR_CLOSING = re.compile(r"[\\)]")
 
 
 def parse_parameters_escaped(
@@ -108,3 +112,308 @@ def parse_parameters_unescaped(
     result.append(parameter)
     index = next_index + 1
     return result, index, None
+
+
+def _rstrip_index(text: str, start: int, end: int, chars: str = " \t") -> int:
+    while end > start and text[end - 1] in chars:
+        end -= 1
+    return end
+
+
+def _lstrip_index(text: str, start: int, end: int, chars: str = " \t") -> int:
+    while start < end and text[start] in chars:
+        start += 1
+    return start
+
+
+def scan_parameters_escaped(
+    text: str,
+    index: int,
+    parameter_count: int,
+    strict: bool,
+) -> tuple[list[str], int, str | None]:
+    """
+    Same as parse_parameters_escaped(), but faster.
+
+    Most parameters do not contain backslashes, so the separating commas and the
+    closing parenthesis are first found with str.find(). Only if there is a backslash
+    before one of them, the parameters are scanned by _scan_escaped_parameters().
+    """
+    length = len(text)
+    result: list[str] = []
+    pos = index
+    for _ in range(parameter_count - 1):
+        comma = text.find(",", pos)
+        if comma < 0 or text.find("\\", pos, comma) >= 0:
+            return _scan_escaped_parameters(text, index, parameter_count, strict)
+        result.append(text[pos:comma].rstrip(" "))
+        pos = _lstrip_index(text, comma + 1, length, " ")
+    closing = text.find(")", pos)
+    if closing < 0 or text.find("\\", pos, closing) >= 0:
+        return _scan_escaped_parameters(text, index, parameter_count, strict)
+    result.append(text[pos:closing])
+    return result, closing + 1, None
+
+
+def _scan_escaped_parameters(
+    text: str,
+    index: int,
+    parameter_count: int,
+    strict: bool,
+) -> tuple[list[str], int, str | None]:
+    """
+    Same as parse_parameters_escaped(), but finds the next special character with a
+    single character class search and handles it directly, instead of trying several
+    alternatives at every position.
+    """
+    start_index = index
+    length = len(text)
+    result: list[str] = []
+    value: list[str] = []
+    pos = index
+    search = (
+        _BACKSLASH_OR_COMMA.search
+        if parameter_count > 1
+        else _BACKSLASH_OR_CLOSING.search
+    )
+    while True:
+        match = search(text, pos)
+        if match is None:
+            break
+        pos = match.start(0)
+        if text[pos] == "\\":
+            if pos + 1 == length or text[pos + 1] == "\n":
+                # A backslash that does not escape anything is kept as-is
+                pos += 1
+                continue
+            escaped = text[pos + 1]
+            if strict and escaped not in ("\\", ")"):
+                break
+            value.append(text[index:pos])
+            value.append(escaped)
+            index = pos = pos + 2
+        elif len(result) + 1 < parameter_count:
+            value.append(text[index:pos].rstrip(" "))
+            result.append("".join(value))
+            value = []
+            index = pos = _lstrip_index(text, pos + 1, length, " ")
+            if len(result) + 1 == parameter_count:
+                search = _BACKSLASH_OR_CLOSING.search
+        else:
+            value.append(text[index:pos])
+            result.append("".join(value))
+            return result, pos + 1, None
+    # Errors are rare, so leave their exact reporting to the reference implementation
+    return parse_parameters_escaped(text, start_index, parameter_count, strict)
+
+
+class CommandInfo(t.Protocol):
+    """
+    The properties of a command that a scanner needs to know about.
+    """
+
+    command: str
+    parameters: int
+    escaped_arguments: bool
+    strip_surrounding_whitespace: bool
+
+
+CommandT = t.TypeVar("CommandT", bound=CommandInfo)
+
+# Every token is a tuple ``(command, start, end, parameters, error)``. For plain text,
+# ``command``, ``parameters`` and ``error`` are ``None`` and ``text[start:end]`` is the text.
+Token = t.Tuple[
+    t.Optional[CommandT], int, int, t.Optional[t.List[str]], t.Optional[str]
+]
+
+
+class Scanner(t.Generic[CommandT], metaclass=abc.ABCMeta):
+    """
+    Splits a string into plain text and commands with their parameters.
+    """
+
+    _re: re.Pattern
+
+    def __init__(self, commands: t.Sequence[CommandT]):
+        self._group_map: dict[str, CommandT] = {
+            cmd.command + ("(" if cmd.parameters else ""): cmd for cmd in commands
+        }
+        self._parameterless = tuple(
+            cmd.command for cmd in commands if not cmd.parameters
+        )
+        self._has_parameters = any(cmd.parameters for cmd in commands)
+
+    def contains_commands(self, text: str) -> bool:
+        """
+        Determine whether the text contains at least one command.
+
+        Commands with parameters can only occur if the text contains an opening
+        parenthesis, and commands without parameters only if their name occurs,
+        so most texts without markup are rejected by substring checks alone.
+        """
+        candidate = (self._has_parameters and "(" in text) or any(
+            name in text for name in self._parameterless
+        )
+        return candidate and self._re.search(text) is not None
+
+    @abc.abstractmethod
+    def scan(
+        self, text: str, strict: bool, index: int = 0
+    ) -> t.Iterator[Token[CommandT]]:
+        """
+        Scan the text, starting at the given index in text state.
+        """
+
+
+class RegexScanner(Scanner[CommandT]):
+    """
+    Searches for the next command with a regular expression, and then parses its
+    parameters with parse_parameters_escaped() resp. parse_parameters_unescaped().
+    """
+
+    def __init__(self, commands: t.Sequence[CommandT]):
+        super().__init__(commands)
+        if commands:
+            self._re = re.compile(
+                "(" + "|".join([_command_re(cmd) for cmd in commands]) + ")"
+            )
+        else:
+            self._re = re.compile("x^")  # does not match anything
+
+    def scan(
+        self, text: str, strict: bool, index: int = 0
+    ) -> t.Iterator[Token[CommandT]]:
+        length = len(text)
+        while index < length:
+            m = self._re.search(text, index)
+            if m is None:
+                yield None, index, length, None, None
+                break
+            cmd = self._group_map[m.group(1)]
+            start = m.start(1)
+            if start > index:
+                end = start
+                if cmd.strip_surrounding_whitespace:
+                    end = _rstrip_index(text, index, end)
+                yield None, index, end, None, None
+            args: list[str]
+            error: str | None = None
+            end_index = m.end(1)
+            if cmd.parameters == 0:
+                args = []
+            elif cmd.escaped_arguments:
+                args, end_index, error = parse_parameters_escaped(
+                    text, end_index, cmd.parameters, strict=strict
+                )
+            else:
+                args, end_index, error = parse_parameters_unescaped(
+                    text, end_index, cmd.parameters, strict=strict
+                )
+            yield cmd, start, end_index, args, error
+            index = end_index
+            if cmd.strip_surrounding_whitespace:
+                index = _lstrip_index(text, index, length)
+
+
+_ParameterScanner = t.Callable[
+    [str, int, int, bool], t.Tuple[t.List[str], int, t.Optional[str]]
+]
+
+
+class StateMachineScanner(Scanner[CommandT]):
+    """
+    Scans the string in a single forward pass.
+
+    In text state, the next command opening is found with one regular expression that
+    is prefixed by a lookahead for the first letters of all commands, which allows the
+    regular expression engine to skip over most of the text without trying every
+    alternative. The command opening then selects the parameter state from a
+    precomputed transition table. In parameter state, separating commas and the
+    closing parenthesis are found with str.find() by scan_parameters_escaped() resp.
+    parse_parameters_unescaped(). Escapes are handled by a slower character class
+    search only if there is a backslash.
+    """
+
+    _transitions: dict[str, tuple[CommandT, int, _ParameterScanner | None, bool]]
+
+    def __init__(self, commands: t.Sequence[CommandT]):
+        super().__init__(commands)
+        self._transitions = {}
+        for key, cmd in self._group_map.items():
+            parameter_scanner: _ParameterScanner | None = None
+            if cmd.parameters:
+                parameter_scanner = (
+                    scan_parameters_escaped
+                    if cmd.escaped_arguments
+                    else parse_parameters_unescaped
+                )
+            self._transitions[key] = (
+                cmd,
+                cmd.parameters,
+                parameter_scanner,
+                cmd.strip_surrounding_whitespace,
+            )
+        if commands:
+            first_letters = sorted({cmd.command[0] for cmd in commands})
+            self._re = re.compile(
+                "(?=["
+                + "".join(re.escape(letter) for letter in first_letters)
+                + "])(?:"
+                + "|".join([_command_re(cmd) for cmd in commands])
+                + ")"
+            )
+        else:
+            self._re = re.compile("x^")  # does not match anything
+
+    def scan(
+        self, text: str, strict: bool, index: int = 0
+    ) -> t.Iterator[Token[CommandT]]:
+        search = self._re.search
+        transitions = self._transitions
+        length = len(text)
+        while index < length:
+            m = search(text, index)
+            if m is None:
+                yield None, index, length, None, None
+                return
+            start, opening_end = m.span(0)
+            cmd, parameter_count, parameter_scanner, strip = transitions[m.group(0)]
+            if start > index:
+                end = _rstrip_index(text, index, start) if strip else start
+                yield None, index, end, None, None
+            index = opening_end
+            if parameter_scanner is None:
+                yield cmd, start, index, [], None
+            else:
+                args, index, error = parameter_scanner(
+                    text, index, parameter_count, strict
+                )
+                yield cmd, start, index, args, error
+            if strip:
+                index = _lstrip_index(text, index, length)
+
+
+def _command_re(command: CommandInfo) -> str:
+    return (
+        r"\b"
+        + re.escape(command.command)
+        + (r"\b" if command.parameters == 0 else r"\(")
+    )
+
+
+ScannerEngine = t.Union[t.Literal["regex"], t.Literal["state-machine"]]
+
+_SCANNERS: dict[str, type[Scanner]] = {
+    "regex": RegexScanner,
+    "state-machine": StateMachineScanner,
+}
+
+
+def create_scanner(
+    commands: t.Sequence[CommandT], engine: ScannerEngine
+) -> Scanner[CommandT]:
+    try:
+        scanner_class = _SCANNERS[engine]
+    except KeyError:
+        raise ValueError(f"Unknown scanner engine {engine!r}") from None
+    return scanner_class(commands)
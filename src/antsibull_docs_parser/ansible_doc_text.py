@@ -12,8 +12,10 @@ from __future__ import annotations
 import typing as t
 
 from . import dom
-from .format import Formatter, LinkProvider
+from .format import CompiledFormatter, FormatSpec, Formatter, LinkProvider
 from .format import format_paragraphs as _format_paragraphs
+from .format import format_paragraphs_stream as _format_paragraphs_stream
+from .format import format_paragraphs_utf8 as _format_paragraphs_utf8
 
 
 class AnsibleDocTextFormatter(Formatter):
@@ -86,10 +88,16 @@ class AnsibleDocTextFormatter(Formatter):
 
 DEFAULT_ANSIBLE_DOC_FORMATTER = AnsibleDocTextFormatter()
 
+ANSIBLE_DOC_TEXT_FORMAT = FormatSpec(DEFAULT_ANSIBLE_DOC_FORMATTER, par_sep="\n\n")
+"""
+Output format for :func:`antsibull_docs_parser.format.render_multi` matching
+:func:`to_ansible_doc_text`.
+"""
+
 
 def to_ansible_doc_text(
     paragraphs: t.Sequence[dom.Paragraph],
-    formatter: Formatter = DEFAULT_ANSIBLE_DOC_FORMATTER,
+    formatter: Formatter | CompiledFormatter = DEFAULT_ANSIBLE_DOC_FORMATTER,
     link_provider: LinkProvider | None = None,
     par_start: str = "",
     par_end: str = "",
@@ -110,3 +118,61 @@ def to_ansible_doc_text(
         par_empty=par_empty,
         current_plugin=current_plugin,
     )
+
+
+def to_ansible_doc_text_utf8(
+    paragraphs: t.Sequence[dom.Paragraph],
+    destination: bytearray | t.BinaryIO,
+    formatter: Formatter | CompiledFormatter = DEFAULT_ANSIBLE_DOC_FORMATTER,
+    link_provider: LinkProvider | None = None,
+    par_start: str = "",
+    par_end: str = "",
+    par_sep: str = "\n\n",
+    par_empty: str = "",
+    current_plugin: dom.PluginIdentifier | None = None,
+) -> int:
+    """
+    Same as :func:`to_ansible_doc_text`, but writes the result encoded as UTF-8 to ``destination``.
+
+    See :func:`antsibull_docs_parser.format.format_paragraphs_utf8` for details.
+    """
+    return _format_paragraphs_utf8(
+        paragraphs,
+        destination,
+        formatter=formatter,
+        link_provider=link_provider,
+        par_start=par_start,
+        par_end=par_end,
+        par_sep=par_sep,
+        par_empty=par_empty,
+        current_plugin=current_plugin,
+    )
+
+
+def to_ansible_doc_text_stream(
+    paragraphs: t.Sequence[dom.Paragraph],
+    destination: t.TextIO | t.Callable[[str], object],
+    formatter: Formatter | CompiledFormatter = DEFAULT_ANSIBLE_DOC_FORMATTER,
+    link_provider: LinkProvider | None = None,
+    par_start: str = "",
+    par_end: str = "",
+    par_sep: str = "\n\n",
+    par_empty: str = "",
+    current_plugin: dom.PluginIdentifier | None = None,
+) -> int:
+    """
+    Same as :func:`to_ansible_doc_text`, but writes the result to ``destination``.
+
+    See :func:`antsibull_docs_parser.format.format_paragraphs_stream` for details.
+    """
+    return _format_paragraphs_stream(
+        paragraphs,
+        destination,
+        formatter=formatter,
+        link_provider=link_provider,
+        par_start=par_start,
+        par_end=par_end,
+        par_sep=par_sep,
+        par_empty=par_empty,
+        current_plugin=current_plugin,
+    )
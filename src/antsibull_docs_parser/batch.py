@@ -0,0 +1,129 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+"""
+Parsing many texts at once.
+"""
+
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import typing as t
+
+from . import dom
+from .interning import InternTable
+from .parser import (
+    Context,
+    Whitespace,
+    _decode_text,
+    _ParseOptions,
+    _reject_collect,
+    parse,
+)
+
+
+def _parse_chunk(
+    chunk: t.Iterable[
+        tuple[str | bytes | memoryview | t.Sequence[str | bytes | memoryview], Context]
+    ],
+    options: _ParseOptions,
+    intern_table: InternTable | None = None,
+) -> list[list[dom.Paragraph]]:
+    return [
+        parse(
+            text,
+            context,
+            errors=options.errors,
+            only_classic_markup=options.only_classic_markup,
+            strict=options.strict,
+            add_source=options.add_source,
+            helpful_errors=options.helpful_errors,
+            whitespace=options.whitespace,
+            add_span=options.add_span,
+            intern_table=intern_table,
+        )
+        for text, context in chunk
+    ]
+
+
+def parse_many(
+    items: t.Iterable[
+        tuple[str | bytes | memoryview | t.Sequence[str | bytes | memoryview], Context]
+    ],
+    errors: dom.ErrorType = "message",
+    only_classic_markup: bool = False,
+    strict: bool = False,
+    add_source: bool = False,
+    helpful_errors: bool = True,
+    *,
+    whitespace: Whitespace = Whitespace.IGNORE,
+    add_span: bool = False,
+    executor: concurrent.futures.Executor | None = None,
+    chunk_size: int | None = None,
+    intern_table: InternTable | None = None,
+) -> list[list[dom.Paragraph]]:
+    """
+    Parse many texts, each in its own context, with the same options.
+
+    :param items: An iterable of pairs ``(text, context)``. ``text`` and ``context``
+        are the same as the corresponding parameters of :func:`parse`.
+
+    :param executor: An optional executor from :mod:`concurrent.futures`.
+
+        If not provided, the texts are parsed one after another in the current thread.
+        If provided, the texts are split up into chunks, and every chunk is parsed in
+        a job submitted to the executor. Since parsing is CPU-bound, a
+        :class:`concurrent.futures.ProcessPoolExecutor` is usually the best choice.
+        Create the executor once and reuse it for multiple calls, since starting
+        worker processes is expensive.
+
+    :param chunk_size: The number of texts per job. By default, the texts are split
+        into four chunks per CPU.
+
+    :param intern_table: An optional table used to deduplicate plugin identifiers and
+        related strings, see :func:`parse`. If an executor is used, the results are
+        interned in the current thread once they are available.
+
+    The other parameters are the same as for :func:`parse`. If ``errors`` is
+    ``"exception"``, the first exception in input order is raised.
+    ``errors="collect"`` is not supported.
+
+    :return: A list with the result of :func:`parse` for every item, in input order.
+    """
+    _reject_collect(errors, "parse_many")
+    options = _ParseOptions(
+        errors=errors,
+        only_classic_markup=only_classic_markup,
+        strict=strict,
+        add_source=add_source,
+        helpful_errors=helpful_errors,
+        whitespace=whitespace,
+        add_span=add_span,
+    )
+    if executor is None:
+        return _parse_chunk(items, options, intern_table)
+
+    # memoryview objects cannot be sent to other processes
+    all_items = [(_decode_text(text), context) for text, context in items]
+    if chunk_size is None:
+        chunk_count = 4 * (os.cpu_count() or 1)
+        chunk_size = max(1, -(-len(all_items) // chunk_count))
+    elif chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    futures = [
+        executor.submit(_parse_chunk, all_items[start : start + chunk_size], options)
+        for start in range(0, len(all_items), chunk_size)
+    ]
+    result: list[list[dom.Paragraph]] = []
+    for future in futures:
+        if intern_table is None:
+            result.extend(future.result())
+        else:
+            result.extend(
+                intern_table.intern_paragraphs(paragraphs)
+                for paragraphs in future.result()
+            )
+    return result
@@ -0,0 +1,157 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+"""
+Caching of parse results.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import typing as t
+from collections import OrderedDict
+
+from . import dom
+
+_CachedParagraphs = t.Tuple[t.Tuple[dom.AnyPart, ...], ...]
+
+# Parts which contain mutable lists
+_PARTS_WITH_LINK = (dom.PartType.OPTION_NAME, dom.PartType.RETURN_VALUE)
+
+
+def _estimate_size(key: t.Hashable, paragraphs: _CachedParagraphs) -> int:
+    size = sys.getsizeof(key)
+    if isinstance(key, tuple):
+        size += sum(sys.getsizeof(entry) for entry in key)
+    size += sys.getsizeof(paragraphs)
+    for paragraph in paragraphs:
+        size += sys.getsizeof(paragraph)
+        for part in paragraph:
+            size += sys.getsizeof(part)
+            for value in part:
+                if isinstance(value, (str, tuple)):
+                    size += sys.getsizeof(value)
+                elif isinstance(value, list):
+                    size += sys.getsizeof(value)
+                    size += sum(sys.getsizeof(entry) for entry in value)
+    return size
+
+
+def _copy_part(part: dom.AnyPart) -> dom.AnyPart:
+    if part.type in _PARTS_WITH_LINK:
+        part = t.cast(t.Union[dom.OptionNamePart, dom.ReturnValuePart], part)
+        return part._replace(link=list(part.link))
+    return part
+
+
+class CacheStatistics(t.NamedTuple):
+    """
+    Statistics of a :class:`ParseCache`.
+    """
+
+    hits: int
+    """How often a result was found in the cache."""
+
+    misses: int
+    """How often a result was not found in the cache."""
+
+    evictions: int
+    """How many entries have been removed to stay within the limits."""
+
+    entries: int
+    """The current number of entries."""
+
+    size: int
+    """The estimated current size of all entries in bytes."""
+
+
+class ParseCache:
+    """
+    A thread-safe bounded cache for parse results with LRU (least recently used)
+    eviction.
+
+    Pass an instance to :func:`antsibull_docs_parser.parser.parse` with the ``cache``
+    parameter. Every lookup returns a fresh copy of the paragraphs, so callers can
+    modify the result without affecting the cache.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int | None = None):
+        """
+        :param max_entries: The maximal number of entries to store.
+
+        :param max_bytes: The maximal estimated size of all entries in bytes.
+            ``None`` means no limit.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[t.Hashable, tuple[_CachedParagraphs, int]] = (
+            OrderedDict()
+        )
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: t.Hashable) -> list[dom.Paragraph] | None:
+        """
+        Look up the paragraphs for a key. Returns ``None`` if the key is not present.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return [[_copy_part(part) for part in paragraph] for paragraph in entry[0]]
+
+    def put(self, key: t.Hashable, paragraphs: t.Sequence[dom.Paragraph]) -> None:
+        """
+        Store the paragraphs for a key. The paragraphs are copied.
+        """
+        frozen = tuple(
+            tuple(_copy_part(part) for part in paragraph) for paragraph in paragraphs
+        )
+        size = _estimate_size(key, frozen)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            old_entry = self._entries.pop(key, None)
+            if old_entry is not None:
+                self._size -= old_entry[1]
+            self._entries[key] = (frozen, size)
+            self._size += size
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._size > self.max_bytes
+            ):
+                evicted_entry = self._entries.popitem(last=False)[1]
+                self._size -= evicted_entry[1]
+                self._evictions += 1
+
+    def clear(self) -> None:
+        """
+        Remove all entries. The statistics are not reset.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def statistics(self) -> CacheStatistics:
+        """
+        The current statistics.
+        """
+        with self._lock:
+            return CacheStatistics(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size=self._size,
+            )
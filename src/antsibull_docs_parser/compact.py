@@ -0,0 +1,211 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+"""
+Compact representation of paragraphs.
+"""
+
+from __future__ import annotations
+
+import inspect
+import sys
+import typing as t
+from array import array
+from collections.abc import Sequence
+
+from . import dom
+
+# How a field of a part is encoded in the values array
+_STRING = 0  # string index, or -1 for None (one value)
+_PLUGIN = 1  # string indices of FQCN and type, or -1 twice for None (two values)
+_STRING_LIST = 2  # number of strings, followed by their string indices
+_SPAN = 3  # start and end index, or -1 twice for None (two values)
+
+_FIELD_KINDS = {
+    "plugin": _PLUGIN,
+    "link": _STRING_LIST,
+    "span": _SPAN,
+}
+
+
+def _get_layouts() -> dict[int, tuple[type, tuple[int, ...]]]:
+    layouts = {}
+    for part_class in t.get_args(dom.AnyPart):
+        part_type = inspect.signature(part_class).parameters["type"].default
+        kinds = tuple(
+            _FIELD_KINDS.get(field, _STRING)
+            for field in part_class._fields
+            if field != "type"
+        )
+        layouts[part_type.value] = (part_class, kinds)
+    return layouts
+
+
+_LAYOUTS = _get_layouts()
+
+
+class CompactParagraph(Sequence):
+    """
+    A read-only paragraph that needs a lot less memory than a list of parts.
+
+    The part types are stored in a byte array, all strings in one string, and all
+    other information in an integer array. The parts are created on access, so every
+    access returns a new part object that is equal to the original part.
+
+    The savings grow with the number of parts. For paragraphs consisting of a single
+    short part, the overhead of the arrays is larger than the savings.
+
+    A compact paragraph can be used everywhere a paragraph can be read, for example
+    with :func:`antsibull_docs_parser.dom.walk` and
+    :func:`antsibull_docs_parser.format.format_paragraphs`.
+    """
+
+    # _data contains three sections:
+    # 1. for every part, the index of its first value in section 2; followed by the
+    #    number of values in section 2;
+    # 2. the values of all fields of all parts, encoded according to their kinds;
+    # 3. the start index of every string in _text, followed by the length of _text.
+    __slots__ = ("_types", "_data", "_text")
+
+    def __init__(self, parts: t.Iterable[dom.AnyPart] = ()):
+        """
+        :param parts: The parts of the paragraph.
+        """
+        types = array("B")
+        starts = array("i")
+        values = array("i")
+        strings: list[str] = []
+        string_indices: dict[str, int] = {}
+
+        def add_string(value: str) -> int:
+            index = string_indices.get(value)
+            if index is None:
+                index = len(strings)
+                string_indices[value] = index
+                strings.append(value)
+            return index
+
+        for part in parts:
+            kinds = _LAYOUTS[part.type.value][1]
+            types.append(part.type.value)
+            starts.append(len(values))
+            for kind, value in zip(kinds, part):
+                if kind == _STRING:
+                    string = t.cast("str | None", value)
+                    values.append(-1 if string is None else add_string(string))
+                elif kind == _SPAN:
+                    span = t.cast("tuple[int, int] | None", value)
+                    values.extend((-1, -1) if span is None else span)
+                elif kind == _PLUGIN:
+                    plugin = t.cast("dom.PluginIdentifier | None", value)
+                    if plugin is None:
+                        values.extend((-1, -1))
+                    else:
+                        values.append(add_string(plugin.fqcn))
+                        values.append(add_string(plugin.type))
+                else:
+                    entries = t.cast(list[str], value)
+                    values.append(len(entries))
+                    values.extend(add_string(entry) for entry in entries)
+        starts.append(len(values))
+
+        data = starts
+        data.extend(values)
+        position = 0
+        for string in strings:
+            data.append(position)
+            position += len(string)
+        data.append(position)
+
+        self._types = types
+        self._data = data
+        self._text = "".join(strings)
+
+    def _get_part(self, index: int) -> dom.AnyPart:
+        part_class, kinds = _LAYOUTS[self._types[index]]
+        values = self._data
+        text = self._text
+        part_count = len(self._types)
+        bounds_start = part_count + 1 + values[part_count]
+
+        def get_string(string_index: int) -> str | None:
+            if string_index < 0:
+                return None
+            position = bounds_start + string_index
+            return text[values[position] : values[position + 1]]
+
+        position = part_count + 1 + values[index]
+        fields: list[t.Any] = []
+        for kind in kinds:
+            value = values[position]
+            if kind == _STRING:
+                fields.append(get_string(value))
+                position += 1
+            elif kind == _SPAN:
+                fields.append(None if value < 0 else (value, values[position + 1]))
+                position += 2
+            elif kind == _PLUGIN:
+                fields.append(
+                    None
+                    if value < 0
+                    else dom.PluginIdentifier(
+                        fqcn=t.cast(str, get_string(value)),
+                        type=t.cast(str, get_string(values[position + 1])),
+                    )
+                )
+                position += 2
+            else:
+                fields.append(
+                    [
+                        get_string(entry)
+                        for entry in values[position + 1 : position + 1 + value]
+                    ]
+                )
+                position += 1 + value
+        return part_class(*fields)
+
+    @t.overload
+    def __getitem__(self, index: int) -> dom.AnyPart: ...
+
+    @t.overload
+    def __getitem__(self, index: slice) -> dom.Paragraph: ...
+
+    def __getitem__(self, index: int | slice) -> dom.AnyPart | dom.Paragraph:
+        if isinstance(index, slice):
+            return [self._get_part(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("CompactParagraph index out of range")
+        return self._get_part(index)
+
+    def __len__(self) -> int:
+        return len(self._types)
+
+    def __iter__(self) -> t.Iterator[dom.AnyPart]:
+        for index in range(len(self._types)):
+            yield self._get_part(index)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CompactParagraph):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"CompactParagraph({list(self)!r})"
+
+    def __sizeof__(self) -> int:
+        return (
+            object.__sizeof__(self)
+            + sys.getsizeof(self._types)
+            + sys.getsizeof(self._data)
+            + sys.getsizeof(self._text)
+        )
+
+    def to_paragraph(self) -> dom.Paragraph:
+        """
+        Convert to a regular paragraph, that is, a list of parts.
+        """
+        return list(self)
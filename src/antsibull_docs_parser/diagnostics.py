@@ -0,0 +1,229 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+"""
+Structured diagnostics for markup errors.
+"""
+
+from __future__ import annotations
+
+from enum import Enum as _Enum
+
+from .lines import LineIndex, Position
+
+
+def _repr(text: str) -> str:
+    # Do something like repr(), but prefer double quotes
+    text = repr(text)
+    return f'"{text[1:-1]}"'
+
+
+class DiagnosticCode(_Enum):
+    """
+    Identifies the kind of a markup error.
+    """
+
+    MISSING_COMMA = "missing-comma"
+    """A comma separating two parameters is missing."""
+
+    MISSING_CLOSING_PARENTHESIS = "missing-closing-parenthesis"
+    """The closing parenthesis after the last parameter is missing."""
+
+    UNNECESSARY_ESCAPE = "unnecessary-escape"
+    """A character was escaped that does not need escaping (only in strict mode)."""
+
+    INVALID_FQCN = "invalid-fqcn"
+    """A module or plugin name is not a FQCN."""
+
+    INVALID_PLUGIN_TYPE = "invalid-plugin-type"
+    """A plugin type is not valid."""
+
+    INVALID_PLUGIN_REFERENCE = "invalid-plugin-reference"
+    """A plugin reference is not of the form ``FQCN#type``."""
+
+    MISSING_ENTRYPOINT = "missing-entrypoint"
+    """A reference to a role's option or return value has no entrypoint."""
+
+    INVALID_NAME = "invalid-name"
+    """An option or return value name is not valid."""
+
+    OTHER = "other"
+    """Any other error, for example raised by a custom command parser."""
+
+
+_SCANNER_ERRORS = (
+    ("Cannot find comma ", DiagnosticCode.MISSING_COMMA),
+    ("Cannot find closing ", DiagnosticCode.MISSING_CLOSING_PARENTHESIS),
+    ("Unnecessarily escaped ", DiagnosticCode.UNNECESSARY_ESCAPE),
+)
+
+
+def _get_scanner_error_code(error: str) -> DiagnosticCode:
+    for prefix, code in _SCANNER_ERRORS:
+        if error.startswith(prefix):
+            return code
+    return DiagnosticCode.OTHER  # pragma: no cover
+
+
+class Diagnostic:
+    """
+    A markup error found while parsing.
+
+    The error message is only formatted when :attr:`message` is accessed.
+    """
+
+    __slots__ = (
+        "command",
+        "paragraph",
+        "start",
+        "end",
+        "code",
+        "detail",
+        "_text",
+        "_text_offset",
+        "_where",
+        "_helpful_errors",
+        "_has_parameters",
+        "_line_index",
+        "_message",
+    )
+
+    command: str
+    """The name of the command, like ``"O"`` or ``"HORIZONTALLINE"``."""
+
+    paragraph: int | None
+    """
+    The index of the paragraph, if a sequence of paragraphs was parsed.
+    Otherwise ``None``.
+    """
+
+    start: int
+    """The start index of the faulty markup in the paragraph."""
+
+    end: int
+    """The end index (exclusive) of the faulty markup in the paragraph."""
+
+    code: DiagnosticCode
+    """The kind of the error."""
+
+    detail: str
+    """The description of the error, without the position and the faulty markup."""
+
+    def __init__(
+        self,
+        command: str,
+        paragraph: int | None,
+        start: int,
+        end: int,
+        code: DiagnosticCode,
+        detail: str,
+        *,
+        text: str,
+        text_offset: int = 0,
+        where: str | None = None,
+        helpful_errors: bool = True,
+        has_parameters: bool = True,
+        line_index: LineIndex | None = None,
+    ):
+        """
+        :param text: The parsed text. ``text[start - text_offset:end - text_offset]``
+            must be the faulty markup.
+        :param where: Location information appended to the position in the message.
+            If ``None``, ``" of paragraph <paragraph + 1>"`` is used if ``paragraph``
+            is not ``None``, and nothing otherwise.
+        :param helpful_errors: Whether to include the faulty markup in the message.
+        :param has_parameters: Whether the command has parameters.
+        :param line_index: The line index of the paragraph. Needed for
+            :attr:`position` and :attr:`end_position`.
+        """
+        self.command = command
+        self.paragraph = paragraph
+        self.start = start
+        self.end = end
+        self.code = code
+        self.detail = detail
+        self._text = text
+        self._text_offset = text_offset
+        self._where: str | None = where
+        self._helpful_errors = helpful_errors
+        self._has_parameters = has_parameters
+        self._line_index = line_index
+        self._message: str | None = None
+
+    @property
+    def source(self) -> str:
+        """
+        The faulty markup.
+        """
+        return self._text[self.start - self._text_offset : self.end - self._text_offset]
+
+    @property
+    def position(self) -> Position | None:
+        """
+        The line and column of :attr:`start` in the paragraph, or ``None`` if not known.
+
+        The parser provides this for ``errors="collect"`` and for validation.
+        """
+        if self._line_index is None:
+            return None
+        return self._line_index.position(self.start)
+
+    @property
+    def end_position(self) -> Position | None:
+        """
+        The line and column of :attr:`end` in the paragraph, or ``None`` if not known.
+        """
+        if self._line_index is None:
+            return None
+        return self._line_index.position(self.end)
+
+    @property
+    def message(self) -> str:
+        """
+        The error message, as used for :class:`antsibull_docs_parser.dom.ErrorPart`
+        and for exceptions.
+        """
+        if self._message is None:
+            if self._helpful_errors:
+                error_source = _repr(self.source)
+            else:
+                error_source = f'{self.command}{"()" if self._has_parameters else ""}'
+            where = self._where
+            if where is None:
+                where = (
+                    f" of paragraph {self.paragraph + 1}"
+                    if self.paragraph is not None
+                    else ""
+                )
+            self._message = (
+                f"While parsing {error_source} at index {self.start + 1}"
+                f"{where}: {self.detail}"
+            )
+        return self._message
+
+    def _key(self) -> tuple:
+        return (
+            self.command,
+            self.paragraph,
+            self.start,
+            self.end,
+            self.code,
+            self.message,
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Diagnostic):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    def __repr__(self) -> str:
+        return (
+            f"Diagnostic(command={self.command!r}, paragraph={self.paragraph!r},"
+            f" start={self.start!r}, end={self.end!r}, code={self.code},"
+            f" message={self.message!r})"
+        )
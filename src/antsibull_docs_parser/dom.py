@@ -10,11 +10,17 @@ DOM classes used by parser.
 from __future__ import annotations
 
 import abc
+import itertools
 import typing as t
 from enum import Enum
 from typing import NamedTuple
 
-ErrorType = t.Union[t.Literal["ignore"], t.Literal["message"], t.Literal["exception"]]
+ErrorType = t.Union[
+    t.Literal["ignore"],
+    t.Literal["message"],
+    t.Literal["exception"],
+    t.Literal["collect"],
+]
 
 
 class PluginIdentifier(NamedTuple):
@@ -62,6 +68,9 @@ class TextPart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.TEXT] = PartType.TEXT
     """The type of this part."""
 
@@ -77,6 +86,9 @@ class ItalicPart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.ITALIC] = PartType.ITALIC
     """The type of this part."""
 
@@ -92,6 +104,9 @@ class BoldPart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.BOLD] = PartType.BOLD
     """The type of this part."""
 
@@ -107,6 +122,9 @@ class ModulePart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.MODULE] = PartType.MODULE
     """The type of this part."""
 
@@ -123,6 +141,9 @@ class PluginPart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.PLUGIN] = PartType.PLUGIN
     """The type of this part."""
 
@@ -138,6 +159,9 @@ class URLPart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.URL] = PartType.URL
     """The type of this part."""
 
@@ -156,6 +180,9 @@ class LinkPart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.LINK] = PartType.LINK
     """The type of this part."""
 
@@ -175,6 +202,9 @@ class RSTRefPart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.RST_REF] = PartType.RST_REF
     """The type of this part."""
 
@@ -190,6 +220,9 @@ class CodePart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.CODE] = PartType.CODE
     """The type of this part."""
 
@@ -222,6 +255,9 @@ class OptionNamePart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.OPTION_NAME] = PartType.OPTION_NAME
 
 
@@ -236,6 +272,9 @@ class OptionValuePart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.OPTION_VALUE] = PartType.OPTION_VALUE
     """The type of this part."""
 
@@ -251,6 +290,9 @@ class EnvVariablePart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.ENV_VARIABLE] = PartType.ENV_VARIABLE
     """The type of this part."""
 
@@ -283,6 +325,9 @@ class ReturnValuePart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.RETURN_VALUE] = PartType.RETURN_VALUE
     """The type of this part."""
 
@@ -295,6 +340,9 @@ class HorizontalLinePart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.HORIZONTAL_LINE] = PartType.HORIZONTAL_LINE
     """The type of this part."""
 
@@ -313,6 +361,9 @@ class ErrorPart(NamedTuple):
     source: str | None = None
     """The (optional) source of the markup that caused the error."""
 
+    span: tuple[int, int] | None = None
+    """The (optional) start and end index of the markup in the parsed text."""
+
     type: t.Literal[PartType.ERROR] = PartType.ERROR
     """The type of this part."""
 
@@ -341,6 +392,24 @@ Paragraph = list[AnyPart]
 """A paragraph is a sequence of parts."""
 
 
+def get_source(part: AnyPart, text: str) -> str | None:
+    """
+    Return the source of a part.
+
+    :param part: A part parsed with ``add_source=True`` or ``add_span=True``.
+
+    :param text: The paragraph the part was parsed from. Only used if the part
+        has a ``span``, but no ``source``.
+
+    :return: The source, or ``None`` if the part has neither a source nor a span.
+    """
+    if part.source is not None:
+        return part.source
+    if part.span is not None:
+        return text[part.span[0] : part.span[1]]
+    return None
+
+
 class Walker(abc.ABC):
     """
     Abstract base class for walker whose methods will be called for parts of a paragraph.
@@ -459,41 +528,45 @@ class NoopWalker(Walker):
         pass
 
 
-# pylint:disable-next=too-many-branches
-def walk(paragraph: Paragraph, walker: Walker) -> None:  # noqa: C901
+_PROCESS_METHODS: dict[PartType, str] = {
+    PartType.ERROR: "process_error",
+    PartType.BOLD: "process_bold",
+    PartType.CODE: "process_code",
+    PartType.HORIZONTAL_LINE: "process_horizontal_line",
+    PartType.ITALIC: "process_italic",
+    PartType.LINK: "process_link",
+    PartType.MODULE: "process_module",
+    PartType.RST_REF: "process_rst_ref",
+    PartType.URL: "process_url",
+    PartType.TEXT: "process_text",
+    PartType.ENV_VARIABLE: "process_env_variable",
+    PartType.OPTION_NAME: "process_option_name",
+    PartType.OPTION_VALUE: "process_option_value",
+    PartType.PLUGIN: "process_plugin",
+    PartType.RETURN_VALUE: "process_return_value",
+}
+
+
+def walk(paragraph: t.Iterable[AnyPart], walker: Walker) -> None:
     """
     Call the corresponding methods of a walker object for every part of the paragraph.
+
+    The paragraph can also be an iterator, like the ones produced by
+    :func:`antsibull_docs_parser.parser.iter_parse`, or a
+    :class:`antsibull_docs_parser.compact.CompactParagraph`.
     """
     for part in paragraph:
-        if part.type == PartType.ERROR:
-            walker.process_error(t.cast(ErrorPart, part))
-        elif part.type == PartType.BOLD:
-            walker.process_bold(t.cast(BoldPart, part))
-        elif part.type == PartType.CODE:
-            walker.process_code(t.cast(CodePart, part))
-        elif part.type == PartType.HORIZONTAL_LINE:
-            walker.process_horizontal_line(t.cast(HorizontalLinePart, part))
-        elif part.type == PartType.ITALIC:
-            walker.process_italic(t.cast(ItalicPart, part))
-        elif part.type == PartType.LINK:
-            walker.process_link(t.cast(LinkPart, part))
-        elif part.type == PartType.MODULE:
-            walker.process_module(t.cast(ModulePart, part))
-        elif part.type == PartType.RST_REF:
-            walker.process_rst_ref(t.cast(RSTRefPart, part))
-        elif part.type == PartType.URL:
-            walker.process_url(t.cast(URLPart, part))
-        elif part.type == PartType.TEXT:
-            walker.process_text(t.cast(TextPart, part))
-        elif part.type == PartType.ENV_VARIABLE:
-            walker.process_env_variable(t.cast(EnvVariablePart, part))
-        elif part.type == PartType.OPTION_NAME:
-            walker.process_option_name(t.cast(OptionNamePart, part))
-        elif part.type == PartType.OPTION_VALUE:
-            walker.process_option_value(t.cast(OptionValuePart, part))
-        elif part.type == PartType.PLUGIN:
-            walker.process_plugin(t.cast(PluginPart, part))
-        elif part.type == PartType.RETURN_VALUE:
-            walker.process_return_value(t.cast(ReturnValuePart, part))
-        else:
-            raise RuntimeError(f"Internal error: unknown type {part.type!r}")
+        try:
+            method = _PROCESS_METHODS[part.type]
+        except (KeyError, TypeError):
+            raise RuntimeError(f"Internal error: unknown type {part.type!r}") from None
+        getattr(walker, method)(part)
+
+
+def walk_many(paragraphs: t.Iterable[t.Iterable[AnyPart]], walker: Walker) -> None:
+    """
+    Call the corresponding methods of a walker object for every part of all paragraphs.
+
+    This is the same as calling :func:`walk` for every paragraph.
+    """
+    walk(itertools.chain.from_iterable(paragraphs), walker)
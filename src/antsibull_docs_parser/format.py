@@ -113,19 +113,23 @@ class Formatter(abc.ABC):
         pass  # pragma: no cover
 
 
+class _Destination(t.Protocol):
+    def append(self, text: str, /) -> None: ...
+
+
 class _FormatWalker(dom.Walker):
     """
     Walker which calls a formatter's functions and stores the result in a list.
     """
 
-    destination: list[str]
+    destination: _Destination
     formatter: Formatter
     link_provider: LinkProvider
     current_plugin: dom.PluginIdentifier | None
 
     def __init__(
         self,
-        destination: list[str],
+        destination: _Destination,
         formatter: Formatter,
         link_provider: LinkProvider,
         current_plugin: dom.PluginIdentifier | None,
@@ -203,10 +207,205 @@ class _FormatWalker(dom.Walker):
         self.destination.append(self.formatter.format_return_value(part, url))
 
 
-def format_paragraphs(
-    paragraphs: t.Sequence[dom.Paragraph],
+def _get_module_link(
+    link_provider: LinkProvider,
+) -> t.Callable[[dom.ModulePart], str | None]:
+    plugin_link = link_provider.plugin_link
+
+    def get_link(part: dom.ModulePart) -> str | None:
+        return plugin_link(dom.PluginIdentifier(fqcn=part.fqcn, type="module"))
+
+    return get_link
+
+
+def _get_plugin_link(
+    link_provider: LinkProvider,
+) -> t.Callable[[dom.PluginPart], str | None]:
+    plugin_link = link_provider.plugin_link
+
+    def get_link(part: dom.PluginPart) -> str | None:
+        return plugin_link(part.plugin)
+
+    return get_link
+
+
+def _get_option_like_link(
+    link_provider: LinkProvider,
+    current_plugin: dom.PluginIdentifier | None,
+    what: t.Literal["option"] | t.Literal["retval"],
+) -> t.Callable[[dom.OptionNamePart | dom.ReturnValuePart], str | None]:
+    plugin_option_like_link = link_provider.plugin_option_like_link
+
+    def get_link(part: dom.OptionNamePart | dom.ReturnValuePart) -> str | None:
+        if not part.plugin:
+            return None
+        return plugin_option_like_link(
+            part.plugin,
+            part.entrypoint,
+            what,
+            part.link,
+            part.plugin == current_plugin,
+        )
+
+    return get_link
+
+
+_FORMAT_METHODS: dict[dom.PartType, str] = {
+    dom.PartType.ERROR: "format_error",
+    dom.PartType.BOLD: "format_bold",
+    dom.PartType.CODE: "format_code",
+    dom.PartType.HORIZONTAL_LINE: "format_horizontal_line",
+    dom.PartType.ITALIC: "format_italic",
+    dom.PartType.LINK: "format_link",
+    dom.PartType.MODULE: "format_module",
+    dom.PartType.RST_REF: "format_rst_ref",
+    dom.PartType.URL: "format_url",
+    dom.PartType.TEXT: "format_text",
+    dom.PartType.ENV_VARIABLE: "format_env_variable",
+    dom.PartType.OPTION_NAME: "format_option_name",
+    dom.PartType.OPTION_VALUE: "format_option_value",
+    dom.PartType.PLUGIN: "format_plugin",
+    dom.PartType.RETURN_VALUE: "format_return_value",
+}
+
+
+def _get_link_getters(
+    link_provider: LinkProvider,
+    current_plugin: dom.PluginIdentifier | None,
+) -> dict[dom.PartType, t.Callable[[t.Any], str | None]]:
+    # The URLs passed to the formatter methods for parts that reference plugins
+    return {
+        dom.PartType.MODULE: _get_module_link(link_provider),
+        dom.PartType.OPTION_NAME: _get_option_like_link(
+            link_provider, current_plugin, "option"
+        ),
+        dom.PartType.PLUGIN: _get_plugin_link(link_provider),
+        dom.PartType.RETURN_VALUE: _get_option_like_link(
+            link_provider, current_plugin, "retval"
+        ),
+    }
+
+
+def _with_link(
+    format_part: t.Callable[[t.Any, str | None], str],
+    get_link: t.Callable[[t.Any], str | None],
+) -> t.Callable[[t.Any], str]:
+    def format_with_link(part: t.Any) -> str:
+        return format_part(part, get_link(part))
+
+    return format_with_link
+
+
+class _FormatTable(dict[dom.PartType, t.Callable[[t.Any], str]]):
+    def __missing__(self, key: t.Any) -> t.NoReturn:
+        raise RuntimeError(f"Internal error: unknown type {key!r}")
+
+
+class CompiledFormatter:
+    """
+    A formatter combined with a link provider and the current plugin, which formats
+    parts without a walker.
+
+    For every part type, the formatter method and the link lookup are resolved once,
+    so formatting a part only needs a single lookup. Use :func:`compile_formatter` to
+    create an instance, and reuse it for many paragraphs.
+    """
+
+    def __init__(self, table: _FormatTable):
+        self._table = table
+
+    @property
+    def format_functions(self) -> t.Mapping[dom.PartType, t.Callable[[t.Any], str]]:
+        """
+        The function formatting a part, for every part type.
+        """
+        return self._table
+
+    def format_part(self, part: dom.AnyPart) -> str:
+        """
+        Format a single part.
+        """
+        return self._table[part.type](part)
+
+    def format_paragraph(self, paragraph: t.Iterable[dom.AnyPart]) -> str:
+        """
+        Format all parts of a paragraph and concatenate the results.
+        """
+        table = self._table
+        return "".join([table[part.type](part) for part in paragraph])
+
+    def format_paragraphs(
+        self,
+        paragraphs: t.Iterable[t.Iterable[dom.AnyPart]],
+        par_start: str = "",
+        par_end: str = "",
+        par_sep: str = "",
+        par_empty: str = "",
+        *,
+        postprocess_paragraph: t.Callable[[str], str] | None = None,
+    ) -> str:
+        """
+        Same as :func:`format_paragraphs` with the formatter, link provider, and
+        current plugin that were compiled.
+        """
+        table = self._table
+        result: list[str] = []
+        for paragraph in paragraphs:
+            if result:
+                result.append(par_sep)
+            result.append(par_start)
+            par = "".join([table[part.type](part) for part in paragraph])
+            if postprocess_paragraph:
+                par = postprocess_paragraph(par)
+            result.append(par or par_empty)
+            result.append(par_end)
+        return "".join(result)
+
+
+def compile_formatter(
     formatter: Formatter,
     link_provider: LinkProvider | None = None,
+    current_plugin: dom.PluginIdentifier | None = None,
+) -> CompiledFormatter:
+    """
+    Compile a formatter and a link provider into a table with one function per part
+    type.
+
+    The result produces the same output as :func:`format_paragraphs`, and thus as the
+    ``to_*`` functions when passed the same arguments, but is faster when used for many
+    paragraphs. The formatter's methods and the link provider's methods are looked up
+    only once, so replacing them later has no effect on the compiled formatter.
+    """
+    if link_provider is None:
+        link_provider = _DefaultLinkProvider()
+    link_getters = _get_link_getters(link_provider, current_plugin)
+    table = _FormatTable()
+    for part_type, method in _FORMAT_METHODS.items():
+        format_part = getattr(formatter, method)
+        get_link = link_getters.get(part_type)
+        table[part_type] = (
+            format_part if get_link is None else _with_link(format_part, get_link)
+        )
+    return CompiledFormatter(table)
+
+
+def _check_compiled(
+    formatter: Formatter | CompiledFormatter,
+    link_provider: LinkProvider | None,
+    current_plugin: dom.PluginIdentifier | None,
+) -> None:
+    if isinstance(formatter, CompiledFormatter) and (
+        link_provider is not None or current_plugin is not None
+    ):
+        raise ValueError(
+            "link_provider and current_plugin cannot be used with a compiled formatter"
+        )
+
+
+def format_paragraphs(
+    paragraphs: t.Iterable[t.Iterable[dom.AnyPart]],
+    formatter: Formatter | CompiledFormatter,
+    link_provider: LinkProvider | None = None,
     par_start: str = "",
     par_end: str = "",
     par_sep: str = "",
@@ -221,7 +420,26 @@ def format_paragraphs(
 
     ``link_provider`` and ``current_plugin`` will be used to compute optional URLs
     that will be passed to the formatter.
+
+    ``paragraphs`` can also be an iterator of iterators of parts, like the one returned
+    by :func:`antsibull_docs_parser.parser.iter_parse`. Every part is discarded once
+    it has been formatted. The paragraphs can also be
+    :class:`antsibull_docs_parser.compact.CompactParagraph` objects.
+
+    ``formatter`` can also be the result of :func:`compile_formatter`. In that case,
+    ``link_provider`` and ``current_plugin`` must not be provided, since they have
+    been compiled into it.
     """
+    if isinstance(formatter, CompiledFormatter):
+        _check_compiled(formatter, link_provider, current_plugin)
+        return formatter.format_paragraphs(
+            paragraphs,
+            par_start=par_start,
+            par_end=par_end,
+            par_sep=par_sep,
+            par_empty=par_empty,
+            postprocess_paragraph=postprocess_paragraph,
+        )
     if link_provider is None:
         link_provider = _DefaultLinkProvider()
     result: list[str] = []
@@ -242,3 +460,294 @@ def format_paragraphs(
 
         result.append(par_end)
     return "".join(result)
+
+
+class FormatSpec(t.NamedTuple):
+    """
+    Describes an output format for :func:`render_multi`.
+
+    The fields have the same meaning as the corresponding parameters of
+    :func:`format_paragraphs`.
+    """
+
+    formatter: Formatter
+    par_start: str = ""
+    par_end: str = ""
+    par_sep: str = ""
+    par_empty: str = ""
+    postprocess_paragraph: t.Callable[[str], str] | None = None
+
+
+def _append_paragraph(result: list[str], par: str, spec: FormatSpec) -> None:
+    if result:
+        result.append(spec.par_sep)
+    result.append(spec.par_start)
+    if spec.postprocess_paragraph:
+        par = spec.postprocess_paragraph(par)
+    result.append(par or spec.par_empty)
+    result.append(spec.par_end)
+
+
+def render_multi(
+    paragraphs: t.Iterable[t.Iterable[dom.AnyPart]],
+    formats: t.Mapping[str, FormatSpec],
+    link_provider: LinkProvider | None = None,
+    current_plugin: dom.PluginIdentifier | None = None,
+) -> dict[str, str]:
+    """
+    Format paragraphs in several output formats at once.
+
+    The paragraphs are traversed only once, and the link provider is asked only once
+    per part for a URL, which is then passed to the formatters of all formats. The
+    result for every format is the same as the result of :func:`format_paragraphs`
+    with the format's formatter and options.
+
+    ``paragraphs`` can also be an iterator of iterators of parts, like the one returned
+    by :func:`antsibull_docs_parser.parser.iter_parse`.
+
+    :param formats: Maps names to output formats. The ``to_*`` modules provide
+        specifications matching the defaults of their functions, like
+        :data:`antsibull_docs_parser.html.HTML_FORMAT`.
+    :return: Maps the names of ``formats`` to the formatted texts.
+    """
+    if link_provider is None:
+        link_provider = _DefaultLinkProvider()
+    link_getters = _get_link_getters(link_provider, current_plugin)
+    specs = list(formats.values())
+    format_methods = {
+        part_type: [getattr(spec.formatter, method) for spec in specs]
+        for part_type, method in _FORMAT_METHODS.items()
+    }
+    results: list[list[str]] = [[] for _ in specs]
+    for paragraph in paragraphs:
+        par_results: list[list[str]] = [[] for _ in specs]
+        for part in paragraph:
+            methods = format_methods.get(part.type)
+            if methods is None:
+                raise RuntimeError(f"Internal error: unknown type {part.type!r}")
+            get_link = link_getters.get(part.type)
+            if get_link is None:
+                for par_result, method in zip(par_results, methods):
+                    par_result.append(method(part))
+            else:
+                url = get_link(part)
+                for par_result, method in zip(par_results, methods):
+                    par_result.append(method(part, url))
+        for result, par_result, spec in zip(results, par_results, specs):
+            _append_paragraph(result, "".join(par_result), spec)
+    return {name: "".join(result) for name, result in zip(formats, results)}
+
+
+class _Writer(t.Protocol):
+    written: int
+
+    def append(self, text: str, /) -> None: ...
+
+
+class _UTF8Writer:
+    """
+    Encodes strings as UTF-8 and writes them to a bytearray or binary sink.
+    """
+
+    def __init__(self, destination: bytearray | t.BinaryIO):
+        if isinstance(destination, bytearray):
+            self._write: t.Callable[[bytes], object] = destination.extend
+        else:
+            self._write = destination.write
+        self.written = 0
+
+    def append(self, text: str) -> None:
+        if text:
+            data = text.encode("utf-8")
+            self._write(data)
+            self.written += len(data)
+
+
+class _TextWriter:
+    """
+    Writes strings to a text sink or a write callable.
+    """
+
+    def __init__(self, destination: t.TextIO | t.Callable[[str], object]):
+        if callable(destination):
+            self._write: t.Callable[[str], object] = destination
+        else:
+            self._write = destination.write
+        self.written = 0
+
+    def append(self, text: str) -> None:
+        if text:
+            self._write(text)
+            self.written += len(text)
+
+
+def _write_compiled_paragraph(
+    paragraph: t.Iterable[dom.AnyPart],
+    writer: _Writer,
+    table: t.Mapping[dom.PartType, t.Callable[[t.Any], str]],
+    par_empty: str,
+    postprocess_paragraph: t.Callable[[str], str] | None,
+) -> None:
+    if postprocess_paragraph is not None:
+        par = "".join([table[part.type](part) for part in paragraph])
+        writer.append(postprocess_paragraph(par) or par_empty)
+        return
+    written = writer.written
+    for part in paragraph:
+        writer.append(table[part.type](part))
+    if writer.written == written:
+        writer.append(par_empty)
+
+
+def _write_walked_paragraph(
+    paragraph: t.Iterable[dom.AnyPart],
+    writer: _Writer,
+    formatter: Formatter,
+    link_provider: LinkProvider,
+    current_plugin: dom.PluginIdentifier | None,
+    par_empty: str,
+    postprocess_paragraph: t.Callable[[str], str] | None,
+) -> None:
+    if postprocess_paragraph is not None:
+        par_result: list[str] = []
+        walker = _FormatWalker(par_result, formatter, link_provider, current_plugin)
+        dom.walk(paragraph, walker)
+        writer.append(postprocess_paragraph("".join(par_result)) or par_empty)
+        return
+    written = writer.written
+    dom.walk(paragraph, _FormatWalker(writer, formatter, link_provider, current_plugin))
+    if writer.written == written:
+        writer.append(par_empty)
+
+
+def _write_paragraphs(
+    paragraphs: t.Iterable[t.Iterable[dom.AnyPart]],
+    writer: _Writer,
+    formatter: Formatter | CompiledFormatter,
+    link_provider: LinkProvider | None,
+    par_start: str,
+    par_end: str,
+    par_sep: str,
+    par_empty: str,
+    current_plugin: dom.PluginIdentifier | None,
+    postprocess_paragraph: t.Callable[[str], str] | None,
+) -> None:
+    _check_compiled(formatter, link_provider, current_plugin)
+    table = (
+        formatter.format_functions if isinstance(formatter, CompiledFormatter) else None
+    )
+    if link_provider is None:
+        link_provider = _DefaultLinkProvider()
+    first = True
+    for paragraph in paragraphs:
+        if not first:
+            writer.append(par_sep)
+        first = False
+        writer.append(par_start)
+        if table is not None:
+            _write_compiled_paragraph(
+                paragraph, writer, table, par_empty, postprocess_paragraph
+            )
+        else:
+            _write_walked_paragraph(
+                paragraph,
+                writer,
+                t.cast(Formatter, formatter),
+                link_provider,
+                current_plugin,
+                par_empty,
+                postprocess_paragraph,
+            )
+        writer.append(par_end)
+
+
+def format_paragraphs_utf8(
+    paragraphs: t.Iterable[t.Iterable[dom.AnyPart]],
+    destination: bytearray | t.BinaryIO,
+    formatter: Formatter | CompiledFormatter,
+    link_provider: LinkProvider | None = None,
+    par_start: str = "",
+    par_end: str = "",
+    par_sep: str = "",
+    par_empty: str = "",
+    current_plugin: dom.PluginIdentifier | None = None,
+    *,
+    postprocess_paragraph: t.Callable[[str], str] | None = None,
+) -> int:
+    """
+    Same as :func:`format_paragraphs`, but writes the result encoded as UTF-8 to
+    ``destination`` instead of returning it.
+
+    ``destination`` is either a ``bytearray``, which is extended, or a binary file-like
+    object with a ``write()`` method. The bytes written are identical to
+    ``format_paragraphs(...).encode("utf-8")``.
+
+    Without ``postprocess_paragraph``, the results of the formatter are written part by
+    part, so the paragraphs are never joined into strings.
+
+    ``formatter`` can also be the result of :func:`compile_formatter`, as for
+    :func:`format_paragraphs`.
+
+    :return: The number of bytes written.
+    """
+    writer = _UTF8Writer(destination)
+    _write_paragraphs(
+        paragraphs,
+        writer,
+        formatter,
+        link_provider,
+        par_start,
+        par_end,
+        par_sep,
+        par_empty,
+        current_plugin,
+        postprocess_paragraph,
+    )
+    return writer.written
+
+
+def format_paragraphs_stream(
+    paragraphs: t.Iterable[t.Iterable[dom.AnyPart]],
+    destination: t.TextIO | t.Callable[[str], object],
+    formatter: Formatter | CompiledFormatter,
+    link_provider: LinkProvider | None = None,
+    par_start: str = "",
+    par_end: str = "",
+    par_sep: str = "",
+    par_empty: str = "",
+    current_plugin: dom.PluginIdentifier | None = None,
+    *,
+    postprocess_paragraph: t.Callable[[str], str] | None = None,
+) -> int:
+    """
+    Same as :func:`format_paragraphs`, but writes the result to ``destination``
+    instead of returning it.
+
+    ``destination`` is either a text file-like object with a ``write()`` method, like
+    an open file or ``sys.stdout``, or a callable that is called with every string.
+    The concatenation of the strings written is identical to the result of
+    :func:`format_paragraphs`.
+
+    Without ``postprocess_paragraph``, the results of the formatter are written part by
+    part, so neither the paragraphs nor the whole result are joined into strings. With
+    it, one paragraph at a time is joined.
+
+    ``formatter`` can also be the result of :func:`compile_formatter`, as for
+    :func:`format_paragraphs`.
+
+    :return: The number of characters written.
+    """
+    writer = _TextWriter(destination)
+    _write_paragraphs(
+        paragraphs,
+        writer,
+        formatter,
+        link_provider,
+        par_start,
+        par_end,
+        par_sep,
+        par_empty,
+        current_plugin,
+        postprocess_paragraph,
+    )
+    return writer.written
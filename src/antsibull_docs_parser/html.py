@@ -10,22 +10,15 @@ HTML serialization.
 from __future__ import annotations
 
 import typing as t
-from html import escape as _html_escape
-from urllib.parse import quote
 
 from . import dom
-from .format import Formatter, LinkProvider
+from ._escape import html_escape
+from ._escape import html_escape_name as _html_escape_name
+from ._escape import html_escape_url as _html_escape_url
+from .format import CompiledFormatter, FormatSpec, Formatter, LinkProvider
 from .format import format_paragraphs as _format_paragraphs
-
-
-def html_escape(text: str) -> str:
-    return _html_escape(text).replace("&quot;", '"')
-
-
-def _url_escape(url: str) -> str:
-    # We include several characters in safe to be compatible to JavaScript's encodeURI() method.
-    # https://developer.mozilla.org/en-US/docs/Web/JavaScript/Reference/Global_Objects/encodeURI
-    return quote(url, safe=":/#?!*'();@&=+$,")
+from .format import format_paragraphs_stream as _format_paragraphs_stream
+from .format import format_paragraphs_utf8 as _format_paragraphs_utf8
 
 
 class AntsibullHTMLFormatter(Formatter):
@@ -37,7 +30,7 @@ class AntsibullHTMLFormatter(Formatter):
         link_end = ""
         if url:
             link_start = (
-                f'<a class="reference internal" href="{_html_escape(_url_escape(url))}">'
+                f'<a class="reference internal" href="{_html_escape_url(url)}">'
                 '<span class="std std-ref"><span class="pre">'
             )
             link_end = "</span></span></a>"
@@ -77,24 +70,21 @@ class AntsibullHTMLFormatter(Formatter):
         return f"<em>{html_escape(part.text)}</em>"
 
     def format_link(self, part: dom.LinkPart) -> str:
-        return f"<a href='{_html_escape(_url_escape(part.url))}'>{html_escape(part.text)}</a>"
+        return f"<a href='{_html_escape_url(part.url)}'>{html_escape(part.text)}</a>"
 
     def format_module(self, part: dom.ModulePart, url: str | None) -> str:
         if not url:
-            return f"<span class='module'>{html_escape(part.fqcn)}</span>"
+            return f"<span class='module'>{_html_escape_name(part.fqcn)}</span>"
         return (
-            f"<a href='{_html_escape(_url_escape(url))}' class='module'>"
-            f"{html_escape(part.fqcn)}</a>"
+            f"<a href='{_html_escape_url(url)}' class='module'>"
+            f"{_html_escape_name(part.fqcn)}</a>"
         )
 
     def format_rst_ref(self, part: dom.RSTRefPart) -> str:
         return f"<span class='module'>{html_escape(part.text)}</span>"
 
     def format_url(self, part: dom.URLPart) -> str:
-        return (
-            f"<a href='{_html_escape(_url_escape(part.url))}'>"
-            f"{html_escape(part.url)}</a>"
-        )
+        return f"<a href='{_html_escape_url(part.url)}'>{html_escape(part.url)}</a>"
 
     def format_text(self, part: dom.TextPart) -> str:
         return html_escape(part.text)
@@ -113,10 +103,10 @@ class AntsibullHTMLFormatter(Formatter):
 
     def format_plugin(self, part: dom.PluginPart, url: str | None) -> str:
         if not url:
-            return f"<span class='module'>{html_escape(part.plugin.fqcn)}</span>"
+            return f"<span class='module'>{_html_escape_name(part.plugin.fqcn)}</span>"
         return (
-            f"<a href='{_html_escape(_url_escape(url))}' class='module'>"
-            f"{html_escape(part.plugin.fqcn)}</a>"
+            f"<a href='{_html_escape_url(url)}' class='module'>"
+            f"{_html_escape_name(part.plugin.fqcn)}</a>"
         )
 
     def format_return_value(self, part: dom.ReturnValuePart, url: str | None) -> str:
@@ -131,7 +121,7 @@ class PlainHTMLFormatter(Formatter):
         link_start = ""
         link_end = ""
         if url:
-            link_start = f'<a href="{_html_escape(_url_escape(url))}">'
+            link_start = f'<a href="{_html_escape_url(url)}">'
             link_end = "</a>"
         strong_start = ""
         strong_end = ""
@@ -160,23 +150,18 @@ class PlainHTMLFormatter(Formatter):
         return f"<em>{html_escape(part.text)}</em>"
 
     def format_link(self, part: dom.LinkPart) -> str:
-        return f"<a href='{_html_escape(_url_escape(part.url))}'>{html_escape(part.text)}</a>"
+        return f"<a href='{_html_escape_url(part.url)}'>{html_escape(part.text)}</a>"
 
     def format_module(self, part: dom.ModulePart, url: str | None) -> str:
         if not url:
-            return f"<span>{html_escape(part.fqcn)}</span>"
-        return (
-            f"<a href='{_html_escape(_url_escape(url))}'>{html_escape(part.fqcn)}</a>"
-        )
+            return f"<span>{_html_escape_name(part.fqcn)}</span>"
+        return f"<a href='{_html_escape_url(url)}'>{_html_escape_name(part.fqcn)}</a>"
 
     def format_rst_ref(self, part: dom.RSTRefPart) -> str:
         return f"<span>{html_escape(part.text)}</span>"
 
     def format_url(self, part: dom.URLPart) -> str:
-        return (
-            f"<a href='{_html_escape(_url_escape(part.url))}'>"
-            f"{html_escape(part.url)}</a>"
-        )
+        return f"<a href='{_html_escape_url(part.url)}'>{html_escape(part.url)}</a>"
 
     def format_text(self, part: dom.TextPart) -> str:
         return html_escape(part.text)
@@ -192,8 +177,8 @@ class PlainHTMLFormatter(Formatter):
 
     def format_plugin(self, part: dom.PluginPart, url: str | None) -> str:
         if not url:
-            return f"<span>{html_escape(part.plugin.fqcn)}</span>"
-        return f"<a href='{_html_escape(_url_escape(url))}'>{html_escape(part.plugin.fqcn)}</a>"
+            return f"<span>{_html_escape_name(part.plugin.fqcn)}</span>"
+        return f"<a href='{_html_escape_url(url)}'>{_html_escape_name(part.plugin.fqcn)}</a>"
 
     def format_return_value(self, part: dom.ReturnValuePart, url: str | None) -> str:
         return self._format_option_like(part, url)
@@ -202,10 +187,22 @@ class PlainHTMLFormatter(Formatter):
 DEFAULT_ANTSIBULL_FORMATTER = AntsibullHTMLFormatter()
 DEFAULT_PLAIN_FORMATTER = PlainHTMLFormatter()
 
+HTML_FORMAT = FormatSpec(DEFAULT_ANTSIBULL_FORMATTER, par_start="<p>", par_end="</p>")
+"""
+Output format for :func:`antsibull_docs_parser.format.render_multi` matching
+:func:`to_html`.
+"""
+
+HTML_PLAIN_FORMAT = FormatSpec(DEFAULT_PLAIN_FORMATTER, par_start="<p>", par_end="</p>")
+"""
+Output format for :func:`antsibull_docs_parser.format.render_multi` matching
+:func:`to_html_plain`.
+"""
+
 
 def to_html(
     paragraphs: t.Sequence[dom.Paragraph],
-    formatter: Formatter = DEFAULT_ANTSIBULL_FORMATTER,
+    formatter: Formatter | CompiledFormatter = DEFAULT_ANTSIBULL_FORMATTER,
     link_provider: LinkProvider | None = None,
     par_start: str = "<p>",
     par_end: str = "</p>",
@@ -228,9 +225,67 @@ def to_html(
     )
 
 
+def to_html_utf8(
+    paragraphs: t.Sequence[dom.Paragraph],
+    destination: bytearray | t.BinaryIO,
+    formatter: Formatter | CompiledFormatter = DEFAULT_ANTSIBULL_FORMATTER,
+    link_provider: LinkProvider | None = None,
+    par_start: str = "<p>",
+    par_end: str = "</p>",
+    par_sep: str = "",
+    par_empty: str = "",
+    current_plugin: dom.PluginIdentifier | None = None,
+) -> int:
+    """
+    Same as :func:`to_html`, but writes the result encoded as UTF-8 to ``destination``.
+
+    See :func:`antsibull_docs_parser.format.format_paragraphs_utf8` for details.
+    """
+    return _format_paragraphs_utf8(
+        paragraphs,
+        destination,
+        formatter=formatter,
+        link_provider=link_provider,
+        par_start=par_start,
+        par_end=par_end,
+        par_sep=par_sep,
+        par_empty=par_empty,
+        current_plugin=current_plugin,
+    )
+
+
+def to_html_stream(
+    paragraphs: t.Sequence[dom.Paragraph],
+    destination: t.TextIO | t.Callable[[str], object],
+    formatter: Formatter | CompiledFormatter = DEFAULT_ANTSIBULL_FORMATTER,
+    link_provider: LinkProvider | None = None,
+    par_start: str = "<p>",
+    par_end: str = "</p>",
+    par_sep: str = "",
+    par_empty: str = "",
+    current_plugin: dom.PluginIdentifier | None = None,
+) -> int:
+    """
+    Same as :func:`to_html`, but writes the result to ``destination``.
+
+    See :func:`antsibull_docs_parser.format.format_paragraphs_stream` for details.
+    """
+    return _format_paragraphs_stream(
+        paragraphs,
+        destination,
+        formatter=formatter,
+        link_provider=link_provider,
+        par_start=par_start,
+        par_end=par_end,
+        par_sep=par_sep,
+        par_empty=par_empty,
+        current_plugin=current_plugin,
+    )
+
+
 def to_html_plain(
     paragraphs: t.Sequence[dom.Paragraph],
-    formatter: Formatter = DEFAULT_PLAIN_FORMATTER,
+    formatter: Formatter | CompiledFormatter = DEFAULT_PLAIN_FORMATTER,
     link_provider: LinkProvider | None = None,
     par_start: str = "<p>",
     par_end: str = "</p>",
@@ -251,3 +306,61 @@ def to_html_plain(
         par_empty=par_empty,
         current_plugin=current_plugin,
     )
+
+
+def to_html_plain_utf8(
+    paragraphs: t.Sequence[dom.Paragraph],
+    destination: bytearray | t.BinaryIO,
+    formatter: Formatter | CompiledFormatter = DEFAULT_PLAIN_FORMATTER,
+    link_provider: LinkProvider | None = None,
+    par_start: str = "<p>",
+    par_end: str = "</p>",
+    par_sep: str = "",
+    par_empty: str = "",
+    current_plugin: dom.PluginIdentifier | None = None,
+) -> int:
+    """
+    Same as :func:`to_html_plain`, but writes the result encoded as UTF-8 to ``destination``.
+
+    See :func:`antsibull_docs_parser.format.format_paragraphs_utf8` for details.
+    """
+    return _format_paragraphs_utf8(
+        paragraphs,
+        destination,
+        formatter=formatter,
+        link_provider=link_provider,
+        par_start=par_start,
+        par_end=par_end,
+        par_sep=par_sep,
+        par_empty=par_empty,
+        current_plugin=current_plugin,
+    )
+
+
+def to_html_plain_stream(
+    paragraphs: t.Sequence[dom.Paragraph],
+    destination: t.TextIO | t.Callable[[str], object],
+    formatter: Formatter | CompiledFormatter = DEFAULT_PLAIN_FORMATTER,
+    link_provider: LinkProvider | None = None,
+    par_start: str = "<p>",
+    par_end: str = "</p>",
+    par_sep: str = "",
+    par_empty: str = "",
+    current_plugin: dom.PluginIdentifier | None = None,
+) -> int:
+    """
+    Same as :func:`to_html_plain`, but writes the result to ``destination``.
+
+    See :func:`antsibull_docs_parser.format.format_paragraphs_stream` for details.
+    """
+    return _format_paragraphs_stream(
+        paragraphs,
+        destination,
+        formatter=formatter,
+        link_provider=link_provider,
+        par_start=par_start,
+        par_end=par_end,
+        par_sep=par_sep,
+        par_empty=par_empty,
+        current_plugin=current_plugin,
+    )
@@ -0,0 +1,157 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+"""
+Interning of plugin identifiers and related strings across parse results.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import typing as t
+
+from . import dom
+
+_OPTION_LIKE = (dom.PartType.OPTION_NAME, dom.PartType.RETURN_VALUE)
+
+
+class InternStatistics(t.NamedTuple):
+    """
+    Statistics of an :class:`InternTable`.
+    """
+
+    strings: int
+    """The number of distinct strings in the table."""
+
+    plugins: int
+    """The number of distinct plugin identifiers in the table."""
+
+    lookups: int
+    """How often a string or plugin identifier was looked up."""
+
+    bytes_saved: int
+    """
+    The estimated number of bytes saved by replacing equal objects with the objects
+    from the table.
+    """
+
+
+class InternTable:
+    """
+    A thread-safe table that deduplicates FQCNs, plugin types, role entrypoints, and
+    plugin identifiers.
+
+    Pass an instance to :func:`antsibull_docs_parser.parser.parse` with the
+    ``intern_table`` parameter. All parts parsed with the same table share the same
+    objects for equal values, so the values are stored only once.
+    """
+
+    def __init__(self) -> None:
+        self._strings: dict[str, str] = {}
+        self._plugins: dict[dom.PluginIdentifier, dom.PluginIdentifier] = {}
+        self._lookups = 0
+        self._bytes_saved = 0
+        self._lock = threading.Lock()
+
+    def _intern_string(self, value: str) -> str:
+        # Must be called with the lock held
+        self._lookups += 1
+        result = self._strings.setdefault(value, value)
+        if result is not value:
+            self._bytes_saved += sys.getsizeof(value)
+        return result
+
+    def intern_string(self, value: str) -> str:
+        """
+        Return the string from the table that is equal to ``value``. If there is none,
+        ``value`` is added to the table.
+        """
+        with self._lock:
+            return self._intern_string(value)
+
+    def intern_plugin(self, plugin: dom.PluginIdentifier) -> dom.PluginIdentifier:
+        """
+        Return the plugin identifier from the table that is equal to ``plugin``. If
+        there is none, a plugin identifier with interned strings is added to the table.
+        """
+        with self._lock:
+            self._lookups += 1
+            result = self._plugins.get(plugin)
+            if result is None:
+                fqcn = self._intern_string(plugin.fqcn)
+                plugin_type = self._intern_string(plugin.type)
+                if fqcn is not plugin.fqcn or plugin_type is not plugin.type:
+                    result = dom.PluginIdentifier(fqcn=fqcn, type=plugin_type)
+                else:
+                    result = plugin
+                self._plugins[result] = result
+            elif result is not plugin:
+                self._bytes_saved += sys.getsizeof(plugin)
+                for value, interned_value in zip(plugin, result):
+                    if value is not interned_value:
+                        self._bytes_saved += sys.getsizeof(value)
+            return result
+
+    def intern_part(self, part: dom.AnyPart) -> dom.AnyPart:
+        """
+        Return a part equal to ``part`` whose FQCNs, plugin types, role entrypoints,
+        and plugin identifiers come from the table.
+        """
+        if part.type == dom.PartType.MODULE:
+            module_part = t.cast(dom.ModulePart, part)
+            fqcn = self.intern_string(module_part.fqcn)
+            if fqcn is not module_part.fqcn:
+                return module_part._replace(fqcn=fqcn)
+        elif part.type == dom.PartType.PLUGIN:
+            plugin_part = t.cast(dom.PluginPart, part)
+            plugin = self.intern_plugin(plugin_part.plugin)
+            if plugin is not plugin_part.plugin:
+                return plugin_part._replace(plugin=plugin)
+        elif part.type in _OPTION_LIKE:
+            option_part = t.cast(t.Union[dom.OptionNamePart, dom.ReturnValuePart], part)
+            option_plugin = option_part.plugin
+            if option_plugin is not None:
+                option_plugin = self.intern_plugin(option_plugin)
+            entrypoint = option_part.entrypoint
+            if entrypoint is not None:
+                entrypoint = self.intern_string(entrypoint)
+            if (
+                option_plugin is not option_part.plugin
+                or entrypoint is not option_part.entrypoint
+            ):
+                return option_part._replace(plugin=option_plugin, entrypoint=entrypoint)
+        return part
+
+    def intern_paragraphs(
+        self, paragraphs: t.Iterable[dom.Paragraph]
+    ) -> list[dom.Paragraph]:
+        """
+        Apply :meth:`intern_part` to all parts of the paragraphs.
+        """
+        return [
+            [self.intern_part(part) for part in paragraph] for paragraph in paragraphs
+        ]
+
+    def clear(self) -> None:
+        """
+        Remove all entries. The statistics are not reset.
+        """
+        with self._lock:
+            self._strings.clear()
+            self._plugins.clear()
+
+    @property
+    def statistics(self) -> InternStatistics:
+        """
+        The current statistics.
+        """
+        with self._lock:
+            return InternStatistics(
+                strings=len(self._strings),
+                plugins=len(self._plugins),
+                lookups=self._lookups,
+                bytes_saved=self._bytes_saved,
+            )
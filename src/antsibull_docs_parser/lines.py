@@ -0,0 +1,72 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+"""
+Mapping of indices in a text to line and column numbers.
+"""
+
+from __future__ import annotations
+
+import typing as t
+from bisect import bisect_right
+
+
+class Position(t.NamedTuple):
+    """
+    A position in a text.
+    """
+
+    line: int
+    """The line number, starting with 0."""
+
+    column: int
+    """The column number in the line, starting with 0."""
+
+
+class LineIndex:
+    """
+    Maps indices in a text to line and column numbers.
+
+    Lines are separated by ``\\n``. The offsets of the line starts are computed once,
+    when the first position is requested. Every lookup then takes logarithmic time in
+    the number of lines.
+    """
+
+    __slots__ = ("_text", "_starts")
+
+    def __init__(self, text: str):
+        self._text = text
+        self._starts: list[int] | None = None
+
+    def _get_starts(self) -> list[int]:
+        starts = self._starts
+        if starts is None:
+            text = self._text
+            starts = [0]
+            index = text.find("\n")
+            while index >= 0:
+                starts.append(index + 1)
+                index = text.find("\n", index + 1)
+            self._starts = starts
+        return starts
+
+    @property
+    def line_count(self) -> int:
+        """
+        The number of lines of the text.
+        """
+        return len(self._get_starts())
+
+    def position(self, index: int) -> Position:
+        """
+        Determine the line and column of an index in the text.
+
+        :param index: An index between 0 and the length of the text (inclusive).
+        """
+        if not 0 <= index <= len(self._text):
+            raise IndexError(f"Index {index} is outside of the text")
+        starts = self._get_starts()
+        line = bisect_right(starts, index) - 1
+        return Position(line=line, column=index - starts[line])
@@ -9,20 +9,17 @@ MarkDown serialization.
 
 from __future__ import annotations
 
-import re
 import typing as t
 
 from . import dom
-from .format import Formatter, LinkProvider
+from ._escape import html_escape_url as _html_escape_url
+from ._escape import md_escape
+from ._escape import md_escape_name as _md_escape_name
+from ._escape import md_escape_url as _md_escape_url
+from .format import CompiledFormatter, FormatSpec, Formatter, LinkProvider
 from .format import format_paragraphs as _format_paragraphs
-from .html import _url_escape
-from .html import html_escape as _html_escape
-
-_MD_ESCAPE = re.compile(r"""([!"#$%&'()*+,:;<=>?@[\\\]^_`{|}~.-])""")
-
-
-def md_escape(text: str) -> str:
-    return _MD_ESCAPE.sub(r"\\\1", text)
+from .format import format_paragraphs_stream as _format_paragraphs_stream
+from .format import format_paragraphs_utf8 as _format_paragraphs_utf8
 
 
 class MDFormatter(Formatter):
@@ -33,7 +30,7 @@ class MDFormatter(Formatter):
         link_start = ""
         link_end = ""
         if url:
-            link_start = f'<a href="{_html_escape(_url_escape(url))}">'
+            link_start = f'<a href="{_html_escape_url(url)}">'
             link_end = "</a>"
         strong_start = ""
         strong_end = ""
@@ -62,19 +59,19 @@ class MDFormatter(Formatter):
         return f"<em>{md_escape(part.text)}</em>"
 
     def format_link(self, part: dom.LinkPart) -> str:
-        url_escaped = md_escape(_url_escape(part.url))
+        url_escaped = _md_escape_url(part.url)
         return f"[{md_escape(part.text)}]({url_escaped})"
 
     def format_module(self, part: dom.ModulePart, url: str | None) -> str:
         if url:
-            return f"[{md_escape(part.fqcn)}]({md_escape(_url_escape(url))})"
-        return md_escape(part.fqcn)
+            return f"[{_md_escape_name(part.fqcn)}]({_md_escape_url(url)})"
+        return _md_escape_name(part.fqcn)
 
     def format_rst_ref(self, part: dom.RSTRefPart) -> str:
         return md_escape(part.text)
 
     def format_url(self, part: dom.URLPart) -> str:
-        url_escaped = md_escape(_url_escape(part.url))
+        url_escaped = _md_escape_url(part.url)
         return f"[{md_escape(part.url)}]({url_escaped})"
 
     def format_text(self, part: dom.TextPart) -> str:
@@ -91,8 +88,8 @@ class MDFormatter(Formatter):
 
     def format_plugin(self, part: dom.PluginPart, url: str | None) -> str:
         if url:
-            return f"[{md_escape(part.plugin.fqcn)}]({md_escape(_url_escape(url))})"
-        return md_escape(part.plugin.fqcn)
+            return f"[{_md_escape_name(part.plugin.fqcn)}]({_md_escape_url(url)})"
+        return _md_escape_name(part.plugin.fqcn)
 
     def format_return_value(self, part: dom.ReturnValuePart, url: str | None) -> str:
         return self._format_option_like(part, url)
@@ -108,9 +105,30 @@ def postprocess_md_paragraph(par: str) -> str:
     return "\n".join(lines)
 
 
+def _emit_paragraph(par: str) -> str:
+    # Produces the same result as postprocess_md_paragraph(). Most paragraphs have
+    # neither line breaks nor tabs, and then only the paragraph itself is stripped.
+    if par.isprintable():
+        return par.strip()
+    lines = [line for line in map(str.strip, par.splitlines()) if line]
+    return "\n".join(lines).replace("\t", " ")
+
+
+MD_FORMAT = FormatSpec(
+    DEFAULT_FORMATTER,
+    par_sep="\n\n",
+    par_empty=" ",
+    postprocess_paragraph=_emit_paragraph,
+)
+"""
+Output format for :func:`antsibull_docs_parser.format.render_multi` matching
+:func:`to_md`.
+"""
+
+
 def to_md(
     paragraphs: t.Sequence[dom.Paragraph],
-    formatter: Formatter = DEFAULT_FORMATTER,
+    formatter: Formatter | CompiledFormatter = DEFAULT_FORMATTER,
     link_provider: LinkProvider | None = None,
     par_start: str = "",
     par_end: str = "",
@@ -130,5 +148,65 @@ def to_md(
         par_sep=par_sep,
         par_empty=par_empty,
         current_plugin=current_plugin,
-        postprocess_paragraph=postprocess_md_paragraph,
+        postprocess_paragraph=_emit_paragraph,
+    )
+
+
+def to_md_utf8(
+    paragraphs: t.Sequence[dom.Paragraph],
+    destination: bytearray | t.BinaryIO,
+    formatter: Formatter | CompiledFormatter = DEFAULT_FORMATTER,
+    link_provider: LinkProvider | None = None,
+    par_start: str = "",
+    par_end: str = "",
+    par_sep: str = "\n\n",
+    par_empty: str = " ",
+    current_plugin: dom.PluginIdentifier | None = None,
+) -> int:
+    """
+    Same as :func:`to_md`, but writes the result encoded as UTF-8 to ``destination``.
+
+    See :func:`antsibull_docs_parser.format.format_paragraphs_utf8` for details.
+    """
+    return _format_paragraphs_utf8(
+        paragraphs,
+        destination,
+        formatter=formatter,
+        link_provider=link_provider,
+        par_start=par_start,
+        par_end=par_end,
+        par_sep=par_sep,
+        par_empty=par_empty,
+        current_plugin=current_plugin,
+        postprocess_paragraph=_emit_paragraph,
+    )
+
+
+def to_md_stream(
+    paragraphs: t.Sequence[dom.Paragraph],
+    destination: t.TextIO | t.Callable[[str], object],
+    formatter: Formatter | CompiledFormatter = DEFAULT_FORMATTER,
+    link_provider: LinkProvider | None = None,
+    par_start: str = "",
+    par_end: str = "",
+    par_sep: str = "\n\n",
+    par_empty: str = " ",
+    current_plugin: dom.PluginIdentifier | None = None,
+) -> int:
+    """
+    Same as :func:`to_md`, but writes the result to ``destination``.
+
+    See :func:`antsibull_docs_parser.format.format_paragraphs_stream` for details.
+    """
+    return _format_paragraphs_stream(
+        paragraphs,
+        destination,
+        formatter=formatter,
+        link_provider=link_provider,
+        par_start=par_start,
+        par_end=par_end,
+        par_sep=par_sep,
+        par_empty=par_empty,
+        current_plugin=current_plugin,
+        postprocess_paragraph=_emit_paragraph,
     )
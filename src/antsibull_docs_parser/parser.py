@@ -9,646 +9,219 @@ Parser for formatted texts.
 
 from __future__ import annotations
 
-import abc
-import re
 import typing as t
-from enum import Enum as _Enum
 
 from . import dom
-from ._parser_impl import parse_parameters_escaped, parse_parameters_unescaped
-
-_IGNORE_MARKER = "ignore:"
-_ARRAY_STUB_RE = re.compile(r"\[([^\]]*)\]")
-_FQCN_TYPE_PREFIX_RE = re.compile(r"^([^.]+\.[^.]+\.[^#]+)#([^:]+):(.*)$")
-_FQCN = re.compile(r"^[A-Za-z0-9_]+\.[A-Za-z0-9_]+(?:\.[A-Za-z0-9_]+)+$")
-_PLUGIN_TYPE = re.compile(r"^[a-z_]+$")
-_WHITESPACE = re.compile(r"([\s]+)")
-_DANGEROUS_WS = re.compile(r"[\t\n\r]")
-_SPACES_TO_KEEP = re.compile(
-    "([\u00a0\u202f\u2007\u2060\u200b\u200c\u200d\ufeff]+)", flags=re.UNICODE
+from ._commands import (
+    _COMMANDS,
+    CommandError,
+    CommandParser,
+    CommandParserEx,
+    Context,
+    Whitespace,
+    _call_parse,
+    _process_whitespace,
 )
+from ._parser_impl import Scanner, ScannerEngine, Token, create_scanner
+from .cache import ParseCache
+from .diagnostics import (
+    Diagnostic,
+    DiagnosticCode,
+    _get_scanner_error_code,
+)
+from .interning import InternTable
+from .lines import LineIndex
 
 
-def _is_fqcn(text: str) -> bool:
-    return _FQCN.match(text) is not None
-
-
-def _is_plugin_type(text: str) -> bool:
-    # We do not want to hard-code a list of valid plugin types that might be
-    # inaccurate, so we simply check whether this is a valid kind of Python
-    # identifier usually used for plugin types. If ansible-core ever adds one
-    # with digits, we'll have to update this.
-    return _PLUGIN_TYPE.match(text) is not None
+def _decode(text: str | bytes | memoryview) -> str:
+    if isinstance(text, str):
+        return text
+    return str(text, "utf-8")
 
 
-def _repr(text: str) -> str:
-    # Do something like repr(), but prefer double quotes
-    text = repr(text)
-    return f'"{text[1:-1]}"'
+def _decode_text(
+    text: str | bytes | memoryview | t.Sequence[str | bytes | memoryview],
+) -> str | t.Sequence[str]:
+    if isinstance(text, str):
+        return text
+    if isinstance(text, (bytes, bytearray, memoryview)):
+        return str(text, "utf-8")
+    return [_decode(par) for par in text]
 
 
-class Whitespace(_Enum):
+def _get_paragraphs(text: str | t.Sequence[str]) -> tuple[t.Sequence[str], bool]:
     """
-    How whitespace should be parsed.
+    Return the paragraphs of a decoded text, and whether the text is a sequence of
+    paragraphs.
     """
+    if isinstance(text, str):
+        return ([text] if text else []), False
+    return text, True
 
-    IGNORE = 0
-    """Keep all whitespace as-is."""
 
-    STRIP = 1
-    """
-    Reduce all whitespace (space, tabs, newlines, ...) to regular breakable or
-    non-breakable spaces. Multiple spaces are kept in everything that's often
-    rendered code-style, like ``C()``, ``O()``, ``V()``, ``RV()``, ``E()``.
-    """
-
-    KEEP_SINGLE_NEWLINES = 2
-    """Similar to STRIP, but keep single newlines intact."""
+def _check_collect(errors: dom.ErrorType, diagnostics: list[Diagnostic] | None) -> None:
+    if errors == "collect" and diagnostics is None:
+        raise ValueError('errors="collect" needs a diagnostics list')
 
 
-def _add_whitespace(
-    result: list[str],
-    ws: str,
-    *,
-    whitespace: Whitespace,
-    no_newlines: bool = False,
-) -> None:
-    if (
-        whitespace == Whitespace.KEEP_SINGLE_NEWLINES
-        and not no_newlines
-        and any(lb in ws for lb in "\n\r")
-    ):
-        result.append("\n")
-    else:
-        result.append(" ")
+def _reject_collect(errors: dom.ErrorType, function: str) -> None:
+    if errors == "collect":
+        raise ValueError(f'{function}() does not support errors="collect"')
 
 
-def _process_whitespace(
+def _parse_command(
     text: str,
+    cmd: CommandParser,
+    index: int,
+    end_index: int,
+    args: list[str],
+    error: str | None,
+    context: Context,
+    errors: dom.ErrorType,
+    where: str | None,
     *,
+    add_source: bool,
+    helpful_errors: bool,
     whitespace: Whitespace,
-    code_environment: bool = False,
-    no_newlines: bool = False,
-) -> str:
-    if whitespace == Whitespace.IGNORE:
-        return text
-    length = len(text)
-    index = 0
-    result = []
-    while index < length:
-        m = _WHITESPACE.search(text, index)
-        if m is None:
-            result.append(text[index:])
-            break
-        if m.start(1) > index:
-            result.append(text[index : m.start(1)])
-        ws = m.group(1)
-        if code_environment:
-            result.append(_DANGEROUS_WS.sub(" ", ws))
+    offset: int,
+    add_span: bool,
+    intern_table: InternTable | None,
+    diagnostics: list[Diagnostic] | None = None,
+    paragraph_index: int | None = None,
+    line_index: LineIndex | None = None,
+) -> dom.AnyPart | None:
+    source = text[index:end_index] if add_source else None
+    span = (index + offset - 1, end_index + offset - 1) if add_span else None
+    if error is None:
+        if isinstance(cmd, CommandParserEx):
+            result = cmd.parse_or_error(args, context, source, whitespace)
         else:
-            ws_index = 0
-            ws_length = len(ws)
-            while ws_index < ws_length:
-                wsm = _SPACES_TO_KEEP.search(ws, ws_index)
-                if wsm is None:
-                    _add_whitespace(
-                        result,
-                        ws[ws_index:],
-                        whitespace=whitespace,
-                        no_newlines=no_newlines,
-                    )
-                    break
-                if wsm.start(1) > ws_index:
-                    _add_whitespace(
-                        result,
-                        ws[ws_index : wsm.start(1)],
-                        whitespace=whitespace,
-                        no_newlines=no_newlines,
-                    )
-                result.append(wsm.group(1))
-                ws_index = wsm.end(1)
-        index = m.end(1)
-    return "".join(result)
-
-
-class Context(t.NamedTuple):
-    """
-    Describes the context in which markup is parsed.
-
-    If an option or return value is referenced without a plugin or role entrypoint,
-    the information from the context is used, if available.
-
-    So if ``O(bam)`` is used in the context of a plugin ``foo.bar.baz``,
-    it is assumed that ``bam`` is an option of ``foo.bar.baz``.
-
-    If the context does not have a current plugin, ``O(bam)`` references an unknown plugin.
-    """
-
-    current_plugin: dom.PluginIdentifier | None = None
-    """The current plugin for this context."""
-
-    role_entrypoint: str | None = None
-    """The role entrypoint for this context, if the current plugin is a role."""
-
-
-class CommandParser(abc.ABC):
-    command: str
-    parameters: int
-    escaped_arguments: bool
-    strip_surrounding_whitespace: bool
-
-    def __init__(
-        self,
-        command: str,
-        parameters: int,
-        escaped_arguments: bool = False,
-        *,
-        strip_surrounding_whitespace: bool = False,
-    ):
-        self.command = command
-        self.parameters = parameters
-        self.escaped_arguments = escaped_arguments
-        self.strip_surrounding_whitespace = strip_surrounding_whitespace
-
-    @abc.abstractmethod
-    def parse(
-        self,
-        parameters: list[str],
-        context: Context,
-        source: str | None,
-        whitespace: Whitespace,
-    ) -> dom.AnyPart:
-        pass  # pragma: no cover
-
-
-class CommandParserEx(CommandParser):
-    old_markup: bool
-
-    def __init__(
-        self,
-        command: str,
-        parameters: int,
-        escaped_arguments: bool = False,
-        old_markup: bool = False,
-        *,
-        strip_surrounding_whitespace: bool = False,
-    ):
-        super().__init__(
-            command,
-            parameters,
-            escaped_arguments=escaped_arguments,
-            strip_surrounding_whitespace=strip_surrounding_whitespace,
-        )
-        self.old_markup = old_markup
-
-
-# Classic Ansible docs markup:
-
-
-class _Italics(CommandParserEx):
-    def __init__(self):
-        super().__init__("I", 1, old_markup=True)
-
-    def parse(
-        self,
-        parameters: list[str],
-        context: Context,
-        source: str | None,
-        whitespace: Whitespace,
-    ) -> dom.AnyPart:
-        return dom.ItalicPart(
-            text=_process_whitespace(
-                parameters[0], whitespace=whitespace, no_newlines=True
-            ),
-            source=source,
-        )
-
-
-class _Bold(CommandParserEx):
-    def __init__(self):
-        super().__init__("B", 1, old_markup=True)
-
-    def parse(
-        self,
-        parameters: list[str],
-        context: Context,
-        source: str | None,
-        whitespace: Whitespace,
-    ) -> dom.AnyPart:
-        return dom.BoldPart(
-            text=_process_whitespace(
-                parameters[0], whitespace=whitespace, no_newlines=True
-            ),
-            source=source,
-        )
-
-
-class _Module(CommandParserEx):
-    def __init__(self):
-        super().__init__("M", 1, old_markup=True)
-
-    def parse(
-        self,
-        parameters: list[str],
-        context: Context,
-        source: str | None,
-        whitespace: Whitespace,
-    ) -> dom.AnyPart:
-        fqcn = _process_whitespace(
-            parameters[0], whitespace=whitespace, no_newlines=True
-        )
-        if not _is_fqcn(fqcn):
-            raise ValueError(f"Module name {_repr(fqcn)} is not a FQCN")
-        return dom.ModulePart(fqcn=fqcn, source=source)
-
-
-class _URL(CommandParserEx):
-    def __init__(self):
-        super().__init__("U", 1, old_markup=True)
-
-    def parse(
-        self,
-        parameters: list[str],
-        context: Context,
-        source: str | None,
-        whitespace: Whitespace,
-    ) -> dom.AnyPart:
-        return dom.URLPart(
-            url=_process_whitespace(
-                parameters[0], whitespace=whitespace, no_newlines=True
-            ),
-            source=source,
-        )
-
-
-class _Link(CommandParserEx):
-    def __init__(self):
-        super().__init__("L", 2, old_markup=True)
-
-    def parse(
-        self,
-        parameters: list[str],
-        context: Context,
-        source: str | None,
-        whitespace: Whitespace,
-    ) -> dom.AnyPart:
-        text = _process_whitespace(
-            parameters[0], whitespace=whitespace, no_newlines=True
-        )
-        url = _process_whitespace(
-            parameters[1], whitespace=whitespace, no_newlines=True
-        )
-        return dom.LinkPart(text=text, url=url, source=source)
-
-
-class _RSTRef(CommandParserEx):
-    def __init__(self):
-        super().__init__("R", 2, old_markup=True)
-
-    def parse(
-        self,
-        parameters: list[str],
-        context: Context,
-        source: str | None,
-        whitespace: Whitespace,
-    ) -> dom.AnyPart:
-        text = _process_whitespace(
-            parameters[0], whitespace=whitespace, no_newlines=True
-        )
-        ref = _process_whitespace(
-            parameters[1], whitespace=whitespace, no_newlines=True
-        )
-        return dom.RSTRefPart(text=text, ref=ref, source=source)
-
-
-class _Code(CommandParserEx):
-    def __init__(self):
-        super().__init__("C", 1, old_markup=True)
-
-    def parse(
-        self,
-        parameters: list[str],
-        context: Context,
-        source: str | None,
-        whitespace: Whitespace,
-    ) -> dom.AnyPart:
-        return dom.CodePart(
-            text=_process_whitespace(
-                parameters[0],
-                whitespace=whitespace,
-                code_environment=True,
-                no_newlines=True,
-            ),
-            source=source,
-        )
-
-
-class _HorizontalLine(CommandParserEx):
-    def __init__(self):
-        super().__init__(
-            "HORIZONTALLINE", 0, old_markup=True, strip_surrounding_whitespace=True
-        )
-
-    def parse(
-        self,
-        parameters: list[str],
-        context: Context,
-        source: str | None,
-        whitespace: Whitespace,
-    ) -> dom.AnyPart:
-        return dom.HorizontalLinePart(source=source)
-
-
-# Semantic Ansible docs markup:
-
-
-def _parse_option_like(
-    text: str,
-    context: Context,
-) -> tuple[
-    dom.PluginIdentifier | None,
-    str | None,
-    list[str],
-    str,
-    str | None,
-]:
-    value = None
-    if "=" in text:
-        text, value = text.split("=", 1)
-    entrypoint: str | None = None
-    m = _FQCN_TYPE_PREFIX_RE.match(text)
-    if m:
-        plugin_fqcn = m.group(1)
-        plugin_type = m.group(2)
-        if not _is_fqcn(plugin_fqcn):
-            raise ValueError(f"Plugin name {_repr(plugin_fqcn)} is not a FQCN")
-        if not _is_plugin_type(plugin_type):
-            raise ValueError(f"Plugin type {_repr(plugin_type)} is not valid")
-        plugin_identifier = dom.PluginIdentifier(fqcn=plugin_fqcn, type=plugin_type)
-        text = m.group(3)
-    elif text.startswith(_IGNORE_MARKER):
-        plugin_identifier = None
-        text = text[len(_IGNORE_MARKER) :]
+            result = _call_parse(cmd, args, context, source, whitespace)
+        if not isinstance(result, CommandError):
+            if intern_table is not None:
+                result = intern_table.intern_part(result)
+            return result._replace(span=span) if add_span else result
+        code, error = result
     else:
-        plugin_identifier = context.current_plugin
-        entrypoint = context.role_entrypoint
-    if plugin_identifier is not None and plugin_identifier.type == "role":
-        part1, sep, part2 = text.partition(":")
-        if sep:
-            entrypoint = part1
-            text = part2
-        if entrypoint is None:
-            raise ValueError("Role reference is missing entrypoint")
-    if ":" in text or "#" in text:
-        raise ValueError(f"Invalid option/return value name {_repr(text)}")
-    return (
-        plugin_identifier,
-        entrypoint,
-        _ARRAY_STUB_RE.sub("", text).split("."),
+        code = _get_scanner_error_code(error)
+    if errors not in ("message", "exception", "collect"):
+        return None
+    diagnostic = _create_diagnostic(
         text,
-        value,
+        cmd,
+        index,
+        end_index,
+        code,
+        error,
+        where,
+        helpful_errors=helpful_errors,
+        offset=offset,
+        paragraph_index=paragraph_index,
+        line_index=line_index,
     )
+    if errors == "message":
+        return dom.ErrorPart(message=diagnostic.message, source=source, span=span)
+    if errors == "exception":
+        raise ValueError(diagnostic.message)
+    t.cast(list[Diagnostic], diagnostics).append(diagnostic)
+    return None
 
 
-class _Plugin(CommandParserEx):
-    def __init__(self):
-        super().__init__("P", 1, escaped_arguments=True)
-
-    def parse(
-        self,
-        parameters: list[str],
-        context: Context,
-        source: str | None,
-        whitespace: Whitespace,
-    ) -> dom.AnyPart:
-        name = _process_whitespace(
-            parameters[0], whitespace=whitespace, no_newlines=True
-        )
-        if "#" not in name:
-            raise ValueError(f"Parameter {_repr(name)} is not of the form FQCN#type")
-        fqcn, ptype = name.split("#", 1)
-        if not _is_fqcn(fqcn):
-            raise ValueError(f"Plugin name {_repr(fqcn)} is not a FQCN")
-        if not _is_plugin_type(ptype):
-            raise ValueError(f"Plugin type {_repr(ptype)} is not valid")
-        return dom.PluginPart(
-            plugin=dom.PluginIdentifier(fqcn=fqcn, type=ptype), source=source
-        )
-
-
-class _EnvVar(CommandParserEx):
-    def __init__(self):
-        super().__init__("E", 1, escaped_arguments=True)
-
-    def parse(
-        self,
-        parameters: list[str],
-        context: Context,
-        source: str | None,
-        whitespace: Whitespace,
-    ) -> dom.AnyPart:
-        return dom.EnvVariablePart(
-            name=_process_whitespace(
-                parameters[0],
-                whitespace=whitespace,
-                code_environment=True,
-                no_newlines=True,
-            ),
-            source=source,
-        )
-
+def _create_diagnostic(
+    text: str,
+    cmd: CommandParser,
+    index: int,
+    end_index: int,
+    code: DiagnosticCode,
+    error: str,
+    where: str | None,
+    *,
+    helpful_errors: bool,
+    offset: int,
+    paragraph_index: int | None,
+    line_index: LineIndex | None = None,
+) -> Diagnostic:
+    return Diagnostic(
+        cmd.command,
+        paragraph_index,
+        index + offset - 1,
+        end_index + offset - 1,
+        code,
+        error,
+        text=text,
+        text_offset=offset - 1,
+        where=where,
+        helpful_errors=helpful_errors,
+        has_parameters=cmd.parameters > 0,
+        line_index=line_index,
+    )
 
-class _OptionValue(CommandParserEx):
-    def __init__(self):
-        super().__init__("V", 1, escaped_arguments=True)
 
-    def parse(
-        self,
-        parameters: list[str],
-        context: Context,
-        source: str | None,
-        whitespace: Whitespace,
-    ) -> dom.AnyPart:
-        return dom.OptionValuePart(
-            value=_process_whitespace(
-                parameters[0],
-                whitespace=whitespace,
-                code_environment=True,
-                no_newlines=True,
-            ),
-            source=source,
-        )
+def _create_text(
+    text: str,
+    add_source: bool,
+    whitespace: Whitespace,
+    span: tuple[int, int] | None = None,
+) -> dom.TextPart:
+    text_ws = _process_whitespace(text, whitespace=whitespace)
+    return dom.TextPart(text=text_ws, source=text if add_source else None, span=span)
 
 
-class _OptionName(CommandParserEx):
-    def __init__(self):
-        super().__init__("O", 1, escaped_arguments=True)
+class Parser:
+    _scanner: Scanner[CommandParser]
 
-    def parse(
+    def __init__(
         self,
-        parameters: list[str],
-        context: Context,
-        source: str | None,
-        whitespace: Whitespace,
-    ) -> dom.AnyPart:
-        plugin, entrypoint, link, name, value = _parse_option_like(
-            _process_whitespace(
-                parameters[0],
-                whitespace=whitespace,
-                code_environment=True,
-                no_newlines=True,
-            ),
-            context,
-        )
-        return dom.OptionNamePart(
-            plugin=plugin,
-            entrypoint=entrypoint,
-            link=link,
-            name=name,
-            value=value,
-            source=source,
-        )
-
+        commands: t.Sequence[CommandParser],
+        *,
+        engine: ScannerEngine = "state-machine",
+    ):
+        """
+        Create a parser for the given commands.
 
-class _ReturnValue(CommandParserEx):
-    def __init__(self):
-        super().__init__("RV", 1, escaped_arguments=True)
+        :param commands: The commands to recognize.
 
-    def parse(
-        self,
-        parameters: list[str],
-        context: Context,
-        source: str | None,
-        whitespace: Whitespace,
-    ) -> dom.AnyPart:
-        plugin, entrypoint, link, name, value = _parse_option_like(
-            _process_whitespace(
-                parameters[0],
-                whitespace=whitespace,
-                code_environment=True,
-                no_newlines=True,
-            ),
-            context,
-        )
-        return dom.ReturnValuePart(
-            plugin=plugin,
-            entrypoint=entrypoint,
-            link=link,
-            name=name,
-            value=value,
-            source=source,
-        )
+        :param engine: The scanning engine used to find commands and their parameters.
 
+            ``"state-machine"``
+                Scans the text in a single forward pass. This is the default.
 
-_COMMANDS = [
-    _Italics(),
-    _Bold(),
-    _Module(),
-    _URL(),
-    _Link(),
-    _RSTRef(),
-    _Code(),
-    _HorizontalLine(),
-    _Plugin(),
-    _EnvVar(),
-    _OptionValue(),
-    _OptionName(),
-    _ReturnValue(),
-]
-
-
-def _command_re(command: CommandParser) -> str:
-    return (
-        r"\b"
-        + re.escape(command.command)
-        + (r"\b" if command.parameters == 0 else r"\(")
-    )
+            ``"regex"``
+                Searches for every command with a regular expression and parses its
+                parameters separately. This was the only engine in older versions.
+        """
+        self._scanner = create_scanner(commands, engine)
 
+    def contains_markup(self, text: str) -> bool:
+        """
+        Determine whether a paragraph contains any markup that this parser recognizes.
 
-class Parser:
-    _group_map: t.Mapping[str, CommandParser]
-    _re: re.Pattern
-
-    def __init__(self, commands: t.Sequence[CommandParser]):
-        self._group_map = {
-            cmd.command + ("(" if cmd.parameters else ""): cmd for cmd in commands
-        }
-        if commands:
-            self._re = re.compile(
-                "(" + "|".join([_command_re(cmd) for cmd in commands]) + ")"
-            )
-        else:
-            self._re = re.compile("x^")  # does not match anything
+        If it does not, :meth:`parse_string` returns a single text part (or no part at
+        all if the paragraph is empty).
+        """
+        return self._scanner.contains_commands(text)
 
-    @staticmethod
-    def _parse_command(
-        result: dom.Paragraph,
-        text: str,
-        cmd: CommandParser,
-        index: int,
-        end_index: int,
-        context: Context,
-        errors: dom.ErrorType,
-        where: str,
-        *,
-        strict: bool,
-        add_source: bool,
-        helpful_errors: bool,
-        whitespace: Whitespace,
-        offset: int,
-    ) -> int:
-        args: list[str]
-        error: str | None = None
-        if cmd.parameters == 0:
-            args = []
-        elif cmd.escaped_arguments:
-            args, end_index, error = parse_parameters_escaped(
-                text, end_index, cmd.parameters, strict=strict
-            )
-        else:
-            args, end_index, error = parse_parameters_unescaped(
-                text, end_index, cmd.parameters, strict=strict
-            )
-        source = text[index:end_index] if add_source else None
-        if error is None:
-            try:
-                result.append(
-                    cmd.parse(args, context, source=source, whitespace=whitespace)
-                )
-            except Exception as exc:  # pylint:disable=broad-except
-                error = f"{exc}"
-        if error is not None:
-            error_source = (
-                _repr(text[index:end_index])
-                if helpful_errors
-                else f'{cmd.command}{"()" if cmd.parameters else ""}'
-            )
-            error = f"While parsing {error_source} at index {index + offset}{where}: {error}"
-            if errors == "message":
-                result.append(dom.ErrorPart(message=error, source=source))
-            elif errors == "exception":
-                raise ValueError(error)
-        return end_index
-
-    @staticmethod
-    def _create_text(
-        text: str, add_source: bool, whitespace: Whitespace
-    ) -> dom.TextPart:
-        text_ws = _process_whitespace(text, whitespace=whitespace)
-        return dom.TextPart(text=text_ws, source=text if add_source else None)
-
-    def parse_string(
+    def iter_string(
         self,
         text: str,
         context: Context,
         errors: dom.ErrorType = "message",
-        where: str = "",
+        where: str | None = None,
         strict: bool = False,
         add_source: bool = False,
         helpful_errors: bool = True,
         *,
         whitespace: Whitespace = Whitespace.IGNORE,
-    ) -> dom.Paragraph:
+        add_span: bool = False,
+        intern_table: InternTable | None = None,
+        diagnostics: list[Diagnostic] | None = None,
+        paragraph_index: int | None = None,
+    ) -> t.Iterator[dom.AnyPart]:
+        """
+        Same as :meth:`parse_string`, but yields the parts one by one while scanning.
+        """
+        _check_collect(errors, diagnostics)
+        line_index = LineIndex(text) if errors == "collect" else None
         offset = 1
         if whitespace != Whitespace.IGNORE:
             old_length = len(text)
@@ -656,47 +229,143 @@ class Parser:
             offset += old_length - len(text)
             text = text.rstrip()
 
-        result: dom.Paragraph = []
-        length = len(text)
-        index = 0
-        while index < length:
-            m = self._re.search(text, index)
-            if m is None:
-                result.append(self._create_text(text[index:], add_source, whitespace))
-                break
-            cmd = self._group_map[m.group(1)]
-            if m.start(1) > index:
-                pretext = text[index : m.start(1)]
-                if cmd.strip_surrounding_whitespace:
-                    pretext = pretext.rstrip(" \t")
-                result.append(self._create_text(pretext, add_source, whitespace))
-            index = self._parse_command(
-                result,
+        if not self._scanner.contains_commands(text):
+            if text:
+                yield _create_text(
+                    text,
+                    add_source,
+                    whitespace,
+                    (offset - 1, offset - 1 + len(text)) if add_span else None,
+                )
+            return
+
+        for cmd, index, end_index, args, error in self._scanner.scan(text, strict):
+            if cmd is None:
+                yield _create_text(
+                    text[index:end_index],
+                    add_source,
+                    whitespace,
+                    (index + offset - 1, end_index + offset - 1) if add_span else None,
+                )
+                continue
+            part = _parse_command(
                 text,
                 cmd,
-                m.start(1),
-                m.end(1),
+                index,
+                end_index,
+                t.cast(list[str], args),
+                error,
                 context,
                 errors,
                 where,
-                strict=strict,
                 add_source=add_source,
                 helpful_errors=helpful_errors,
                 whitespace=whitespace,
                 offset=offset,
+                add_span=add_span,
+                intern_table=intern_table,
+                diagnostics=diagnostics,
+                paragraph_index=paragraph_index,
+                line_index=line_index,
             )
-            if cmd.strip_surrounding_whitespace:
-                while index < length and text[index] in " \t":
-                    index += 1
-        return result
+            if part is not None:
+                yield part
+
+    def parse_string(
+        self,
+        text: str,
+        context: Context,
+        errors: dom.ErrorType = "message",
+        where: str | None = None,
+        strict: bool = False,
+        add_source: bool = False,
+        helpful_errors: bool = True,
+        *,
+        whitespace: Whitespace = Whitespace.IGNORE,
+        add_span: bool = False,
+        intern_table: InternTable | None = None,
+        diagnostics: list[Diagnostic] | None = None,
+        paragraph_index: int | None = None,
+    ) -> dom.Paragraph:
+        return list(
+            self.iter_string(
+                text,
+                context,
+                errors=errors,
+                where=where,
+                strict=strict,
+                add_source=add_source,
+                helpful_errors=helpful_errors,
+                whitespace=whitespace,
+                add_span=add_span,
+                intern_table=intern_table,
+                diagnostics=diagnostics,
+                paragraph_index=paragraph_index,
+            )
+        )
+
+
+def _scan(
+    parser: Parser, text: str, strict: bool, index: int = 0
+) -> t.Iterator[Token[CommandParser]]:
+    return parser._scanner.scan(text, strict, index)  # pylint:disable=protected-access
 
 
 _CLASSIC = Parser([cmd for cmd in _COMMANDS if cmd.old_markup])
 _SEMANTIC_MARKUP = Parser(_COMMANDS)
 
 
+def _get_parser(only_classic_markup: bool) -> Parser:
+    return _CLASSIC if only_classic_markup else _SEMANTIC_MARKUP
+
+
+class Classification(t.NamedTuple):
+    """
+    Result of :func:`classify`.
+    """
+
+    needs_parsing: list[int]
+    """The indices of the texts that contain markup."""
+
+    plain: list[int]
+    """
+    The indices of the texts that do not contain any markup.
+
+    Parsing such a text results in one paragraph per non-empty string, each consisting
+    of a single :class:`antsibull_docs_parser.dom.TextPart`.
+    """
+
+
+def classify(
+    texts: t.Iterable[str | t.Sequence[str]],
+    only_classic_markup: bool = False,
+) -> Classification:
+    """
+    Split a corpus of texts into texts that need parsing and texts without any markup.
+
+    :param texts: An iterable of texts. Every text is either a string or a sequence of
+        strings, as accepted by :func:`parse`.
+
+    :param only_classic_markup: Whether to ignore semantic markup and treat it as raw text.
+        Should be the same value that is passed to :func:`parse`.
+
+    :return: The indices of the texts that need parsing, and the indices of the texts
+        that do not contain any markup.
+    """
+    parser = _get_parser(only_classic_markup)
+    result = Classification(needs_parsing=[], plain=[])
+    for index, text in enumerate(texts):
+        if isinstance(text, str):
+            text = [text]
+        if any(parser.contains_markup(par) for par in text):
+            result.needs_parsing.append(index)
+        else:
+            result.plain.append(index)
+    return result
+
+
 def parse(
-    text: str | t.Sequence[str],
+    text: str | bytes | memoryview | t.Sequence[str | bytes | memoryview],
     context: Context,
     errors: dom.ErrorType = "message",
     only_classic_markup: bool = False,
@@ -705,6 +374,10 @@ def parse(
     helpful_errors: bool = True,
     *,
     whitespace: Whitespace = Whitespace.IGNORE,
+    add_span: bool = False,
+    cache: ParseCache | None = None,
+    intern_table: InternTable | None = None,
+    diagnostics: list[Diagnostic] | None = None,
 ) -> list[dom.Paragraph]:
     """
     Parse a string, or a sequence of strings, to a list of paragraphs.
@@ -712,6 +385,11 @@ def parse(
     :param text: A string or a sequence of strings. If given a sequence of strings, will assume
         that this is a list of paragraphs.
 
+        Instead of strings, UTF-8 encoded ``bytes``, ``bytearray``, or ``memoryview`` objects
+        can be passed. They are decoded before parsing, so indices in error messages and spans
+        refer to characters, not bytes. Invalid UTF-8 raises :exc:`UnicodeDecodeError`
+        regardless of ``errors``.
+
     :param context: Contextual information.
 
         Set ``current_plugin`` if the Ansible markup is parsed in the context of a specific plugin,
@@ -737,6 +415,10 @@ def parse(
             Makes the function throw Python exceptions.
             This also means that it will stop processing on the first error.
 
+        ``"collect"``
+            Appends a :class:`antsibull_docs_parser.diagnostics.Diagnostic` for every
+            error to ``diagnostics``, and does not insert anything into the output.
+
     :param only_classic_markup: Whether to ignore semantic markup and treat it as raw text.
 
         Should only be used in very special cases. This is mostly for backwards compatibility
@@ -749,6 +431,12 @@ def parse(
 
     :param add_source: Whether to add the source of every part to the part (``source`` property).
 
+    :param add_span: Whether to add the start and end index of every part in its paragraph
+        to the part (``span`` property).
+
+        This is cheaper than ``add_source``, since the source is not copied.
+        Use :func:`antsibull_docs_parser.dom.get_source` to obtain the source from the span.
+
     :param helpful_errors: Whether to include the faulty markup in error messages.
 
     :param whitespace: How to handle whitespace.
@@ -757,23 +445,170 @@ def parse(
         whitespace sensitive, we recommend to use :attr:`.Whitespace.STRIP` or
         :attr:`.Whitespace.KEEP_SINGLE_NEWLINES`.
 
+    :param cache: An optional cache for parse results.
+
+        If provided, the result is looked up in the cache first, and stored in the cache
+        if it was not found. This is useful if the same texts are parsed repeatedly
+        with the same context and options.
+
+    :param intern_table: An optional table used to deduplicate plugin identifiers,
+        FQCNs, plugin types, and role entrypoints.
+
+        Pass the same :class:`antsibull_docs_parser.interning.InternTable` to all calls
+        when parsing many texts, like all documentation of a collection, whose results
+        are kept in memory.
+
+    :param diagnostics: The list that errors are appended to if ``errors`` is
+        ``"collect"``.
+
     :return: A list of paragraphs. Each paragraph consists of a list of parts.
     """
-    has_paragraphs = True
-    if isinstance(text, str):
-        has_paragraphs = False
-        text = [text] if text else []
-    parser = _CLASSIC if only_classic_markup else _SEMANTIC_MARKUP
+    _check_collect(errors, diagnostics)
+    decoded = _decode_text(text)
+    if cache is not None:
+        if errors == "collect":
+            raise ValueError('A cache cannot be used with errors="collect"')
+        key = (
+            decoded if isinstance(decoded, str) else tuple(decoded),
+            context,
+            errors,
+            only_classic_markup,
+            strict,
+            add_source,
+            helpful_errors,
+            whitespace,
+            add_span,
+        )
+        result = cache.get(key)
+        if result is None:
+            result = parse(
+                decoded,
+                context,
+                errors=errors,
+                only_classic_markup=only_classic_markup,
+                strict=strict,
+                add_source=add_source,
+                helpful_errors=helpful_errors,
+                whitespace=whitespace,
+                add_span=add_span,
+                intern_table=intern_table,
+            )
+            cache.put(key, result)
+        elif intern_table is not None:
+            result = intern_table.intern_paragraphs(result)
+        return result
+
+    texts, has_paragraphs = _get_paragraphs(decoded)
+    parser = _get_parser(only_classic_markup)
     return [
         parser.parse_string(
             par,
             context,
             errors=errors,
-            where=f" of paragraph {index + 1}" if has_paragraphs else "",
             strict=strict,
             add_source=add_source,
             helpful_errors=helpful_errors,
             whitespace=whitespace,
+            add_span=add_span,
+            intern_table=intern_table,
+            diagnostics=diagnostics,
+            paragraph_index=index if has_paragraphs else None,
         )
-        for index, par in enumerate(text)
+        for index, par in enumerate(texts)
     ]
+
+
+def iter_paragraph(
+    text: str | bytes | memoryview,
+    context: Context,
+    errors: dom.ErrorType = "message",
+    only_classic_markup: bool = False,
+    strict: bool = False,
+    add_source: bool = False,
+    helpful_errors: bool = True,
+    *,
+    whitespace: Whitespace = Whitespace.IGNORE,
+    add_span: bool = False,
+    intern_table: InternTable | None = None,
+    diagnostics: list[Diagnostic] | None = None,
+) -> t.Iterator[dom.AnyPart]:
+    """
+    Parse a single paragraph, and yield its parts one by one while scanning.
+
+    The parameters are the same as for :func:`parse`, except that ``text`` must be a
+    string, which is treated as a single paragraph. The parts are the same as the
+    ones of the paragraph returned by ``parse(text, ...)``.
+    """
+    _check_collect(errors, diagnostics)
+    parser = _get_parser(only_classic_markup)
+    return parser.iter_string(
+        _decode(text),
+        context,
+        errors=errors,
+        strict=strict,
+        add_source=add_source,
+        helpful_errors=helpful_errors,
+        whitespace=whitespace,
+        add_span=add_span,
+        intern_table=intern_table,
+        diagnostics=diagnostics,
+    )
+
+
+def iter_parse(
+    text: str | bytes | memoryview | t.Iterable[str | bytes | memoryview],
+    context: Context,
+    errors: dom.ErrorType = "message",
+    only_classic_markup: bool = False,
+    strict: bool = False,
+    add_source: bool = False,
+    helpful_errors: bool = True,
+    *,
+    whitespace: Whitespace = Whitespace.IGNORE,
+    add_span: bool = False,
+    intern_table: InternTable | None = None,
+    diagnostics: list[Diagnostic] | None = None,
+) -> t.Iterator[t.Iterator[dom.AnyPart]]:
+    """
+    Lazy version of :func:`parse`.
+
+    Yields one iterator per paragraph, which in turn yields the paragraph's parts one by
+    one while scanning. This allows to process large texts in a streaming fashion
+    without keeping all parts in memory. A paragraph does not have to be consumed
+    before advancing to the next one.
+
+    The parameters are the same as for :func:`parse`. If ``text`` is not a string, it
+    can be any iterable of strings, which is consumed lazily.
+    If ``errors`` is ``"exception"``, the exception is raised when the faulty part is
+    reached. If ``errors`` is ``"collect"``, the diagnostics are appended when the
+    faulty part is reached.
+    """
+    has_paragraphs = True
+    if isinstance(text, (str, bytes, bytearray, memoryview)):
+        has_paragraphs = False
+        text = [text] if text else []
+    parser = _get_parser(only_classic_markup)
+    for index, par in enumerate(text):
+        yield parser.iter_string(
+            _decode(par),
+            context,
+            errors=errors,
+            strict=strict,
+            add_source=add_source,
+            helpful_errors=helpful_errors,
+            whitespace=whitespace,
+            add_span=add_span,
+            intern_table=intern_table,
+            diagnostics=diagnostics,
+            paragraph_index=index if has_paragraphs else None,
+        )
+
+
+class _ParseOptions(t.NamedTuple):
+    errors: dom.ErrorType
+    only_classic_markup: bool
+    strict: bool
+    add_source: bool
+    helpful_errors: bool
+    whitespace: Whitespace
+    add_span: bool
@@ -0,0 +1,378 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+"""
+Incremental re-parsing of edited paragraphs.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+from . import dom
+from .parser import (
+    CommandParser,
+    Context,
+    Parser,
+    Whitespace,
+    _create_text,
+    _get_parser,
+    _parse_command,
+    _reject_collect,
+    _scan,
+)
+
+
+def reparse_paragraph(
+    paragraph: dom.Paragraph,
+    text: str,
+    edit_start: int,
+    edit_end: int,
+    replacement: str,
+    context: Context,
+    errors: dom.ErrorType = "message",
+    only_classic_markup: bool = False,
+    strict: bool = False,
+    helpful_errors: bool = True,
+    *,
+    whitespace: Whitespace = Whitespace.IGNORE,
+    add_span: bool = False,
+    paragraph_index: int | None = None,
+) -> dom.Paragraph:
+    """
+    Update a parsed paragraph after its text has been edited.
+
+    Only the markup around the edit is scanned again. Parts before and after it are
+    reused. This is useful for editors and linters that parse the same text after
+    every small change.
+
+    :param paragraph: The paragraph parsed from ``text`` with ``add_source=True`` and
+        the same other options.
+
+    :param text: The text before the edit.
+
+    :param edit_start: The index in ``text`` where the edit starts.
+
+    :param edit_end: The index in ``text`` where the edit ends (exclusive).
+
+    :param replacement: The text that replaces ``text[edit_start:edit_end]``.
+
+    :param add_span: Whether ``paragraph`` was parsed with ``add_span=True``. The
+        spans of the result then refer to the edited text.
+
+    :param paragraph_index: The index of the paragraph if ``parse()`` was called with a
+        sequence of strings. This is used for error messages.
+
+    :return: The same paragraph as returned by ``parse(new_text, ..., add_source=True)``
+        for the edited text, resp. by ``parse(new_texts, ..., add_source=True)`` for
+        ``paragraph_index``.
+
+    The other parameters are the same as for :func:`parse`. If the sources in
+    ``paragraph`` do not match ``text``, if errors are ignored, or if leading or
+    trailing whitespace is edited while whitespace is processed, the edited text is
+    parsed completely. ``errors="collect"`` is not supported.
+    """
+    _reject_collect(errors, "reparse_paragraph")
+    parser = _get_parser(only_classic_markup)
+    return reparse_string(
+        parser,
+        paragraph,
+        text,
+        edit_start,
+        edit_end,
+        replacement,
+        context,
+        errors=errors,
+        strict=strict,
+        helpful_errors=helpful_errors,
+        whitespace=whitespace,
+        add_span=add_span,
+        paragraph_index=paragraph_index,
+    )
+
+
+def reparse_string(
+    parser: Parser,
+    paragraph: dom.Paragraph,
+    text: str,
+    edit_start: int,
+    edit_end: int,
+    replacement: str,
+    context: Context,
+    errors: dom.ErrorType = "message",
+    where: str | None = None,
+    strict: bool = False,
+    helpful_errors: bool = True,
+    *,
+    whitespace: Whitespace = Whitespace.IGNORE,
+    add_span: bool = False,
+    paragraph_index: int | None = None,
+) -> dom.Paragraph:
+    """
+    Update the result of :meth:`Parser.parse_string` of ``parser`` after an edit of
+    the text.
+
+    ``paragraph`` must be the result of parsing ``text`` with ``add_source=True``
+    and the same other options. The edit replaces ``text[edit_start:edit_end]`` by
+    ``replacement``. The result is the same as parsing the edited text with
+    ``add_source=True``, and with ``add_span=True`` if ``add_span`` is ``True``.
+    ``errors="collect"`` is not supported.
+    """
+    _reject_collect(errors, "reparse_string")
+    if not 0 <= edit_start <= edit_end <= len(text):
+        raise ValueError(
+            f"Invalid edit range {edit_start}:{edit_end}"
+            f" for text of length {len(text)}"
+        )
+    new_text = text[:edit_start] + replacement + text[edit_end:]
+
+    offset = 1
+    if whitespace != Whitespace.IGNORE:
+        old_length = len(text)
+        text = text.lstrip()
+        offset += old_length - len(text)
+        text = text.rstrip()
+        edit_start -= offset - 1
+        edit_end -= offset - 1
+    # Edits touching leading or trailing whitespace can change the offset of
+    # everything. If errors are ignored, the sources do not cover all markup.
+    spans = None
+    if errors != "ignore" and (
+        whitespace == Whitespace.IGNORE or 0 < edit_start <= edit_end < len(text)
+    ):
+        spans = _find_spans(paragraph, text)
+    if spans is None:
+        return parser.parse_string(
+            new_text,
+            context,
+            errors=errors,
+            where=where,
+            strict=strict,
+            add_source=True,
+            helpful_errors=helpful_errors,
+            whitespace=whitespace,
+            add_span=add_span,
+            paragraph_index=paragraph_index,
+        )
+
+    delta = len(replacement) - (edit_end - edit_start)
+    new_text = text[:edit_start] + replacement + text[edit_end:]
+    keep, restart = _find_restart(paragraph, spans, len(text), edit_start)
+    result = paragraph[:keep]
+    result.extend(
+        _rescan(
+            parser,
+            paragraph,
+            spans,
+            new_text,
+            restart,
+            _find_sync_points(paragraph, spans, keep, edit_end),
+            delta,
+            context,
+            errors,
+            where,
+            strict,
+            helpful_errors,
+            whitespace,
+            offset,
+            add_span,
+            paragraph_index,
+        )
+    )
+    return result
+
+
+def _rescan(
+    parser: Parser,
+    paragraph: dom.Paragraph,
+    spans: list[tuple[int, int]],
+    text: str,
+    restart: int,
+    sync_points: dict[int, int],
+    delta: int,
+    context: Context,
+    errors: dom.ErrorType,
+    where: str | None,
+    strict: bool,
+    helpful_errors: bool,
+    whitespace: Whitespace,
+    offset: int,
+    add_span: bool,
+    paragraph_index: int | None,
+) -> t.Iterator[dom.AnyPart]:
+    for cmd, index, end_index, args, error in _scan(parser, text, strict, restart):
+        if cmd is None:
+            yield _create_text(
+                text[index:end_index],
+                True,
+                whitespace,
+                (index + offset - 1, end_index + offset - 1) if add_span else None,
+            )
+            continue
+        part = _parse_command(
+            text,
+            cmd,
+            index,
+            end_index,
+            t.cast(list[str], args),
+            error,
+            context,
+            errors,
+            where,
+            add_source=True,
+            helpful_errors=helpful_errors,
+            whitespace=whitespace,
+            offset=offset,
+            add_span=add_span,
+            intern_table=None,
+            paragraph_index=paragraph_index,
+        )
+        if part is not None:
+            yield part
+        sync_index = (
+            None
+            if cmd.strip_surrounding_whitespace
+            else sync_points.get(end_index - delta)
+        )
+        if sync_index is not None:
+            # From here on, the old parts are still valid. Only error messages
+            # mention the position, so these have to be recreated, and spans
+            # have to be shifted.
+            for old_index in range(sync_index + 1, len(paragraph)):
+                old_part = paragraph[old_index]
+                if old_part.type == dom.PartType.ERROR:
+                    old_part = _reparse_error(
+                        parser,
+                        text,
+                        spans[old_index][0] + delta,
+                        context,
+                        errors,
+                        where,
+                        strict,
+                        helpful_errors,
+                        whitespace,
+                        offset,
+                        add_span,
+                        paragraph_index,
+                    )
+                elif add_span:
+                    start, end = spans[old_index]
+                    old_part = old_part._replace(
+                        span=(start + delta + offset - 1, end + delta + offset - 1)
+                    )
+                yield old_part
+            return
+
+
+def _reparse_error(
+    parser: Parser,
+    text: str,
+    index: int,
+    context: Context,
+    errors: dom.ErrorType,
+    where: str | None,
+    strict: bool,
+    helpful_errors: bool,
+    whitespace: Whitespace,
+    offset: int,
+    add_span: bool,
+    paragraph_index: int | None,
+) -> dom.AnyPart:
+    cmd, index, end_index, args, error = next(_scan(parser, text, strict, index))
+    return t.cast(
+        dom.AnyPart,
+        _parse_command(
+            text,
+            t.cast(CommandParser, cmd),
+            index,
+            end_index,
+            t.cast(list[str], args),
+            error,
+            context,
+            errors,
+            where,
+            add_source=True,
+            helpful_errors=helpful_errors,
+            whitespace=whitespace,
+            offset=offset,
+            add_span=add_span,
+            intern_table=None,
+            paragraph_index=paragraph_index,
+        ),
+    )
+
+
+def _find_spans(paragraph: dom.Paragraph, text: str) -> list[tuple[int, int]] | None:
+    """
+    Determine the spans of the parts of a paragraph from their sources.
+
+    Returns ``None`` if the paragraph has no sources or does not belong to the text.
+    """
+    spans = []
+    index = 0
+    for part in paragraph:
+        source = part.source
+        if source is None:
+            return None
+        if not text.startswith(source, index):
+            # Commands like HORIZONTALLINE remove surrounding spaces and tabs
+            index = _skip_spaces(text, index)
+            if not text.startswith(source, index):
+                return None
+        end = index + len(source)
+        spans.append((index, end))
+        index = end
+    if _skip_spaces(text, index) != len(text):
+        return None
+    return spans
+
+
+def _find_restart(
+    paragraph: dom.Paragraph,
+    spans: list[tuple[int, int]],
+    text_length: int,
+    edit_start: int,
+) -> tuple[int, int]:
+    """
+    Find the last command that is not affected by an edit.
+
+    Returns the number of parts that can be kept, and the index at which scanning
+    continues in text state.
+    """
+    for index in range(len(paragraph) - 1, -1, -1):
+        if paragraph[index].type == dom.PartType.TEXT:
+            continue
+        next_start = spans[index + 1][0] if index + 1 < len(spans) else text_length
+        if next_start < edit_start:
+            return index + 1, next_start
+    return 0, 0
+
+
+def _find_sync_points(
+    paragraph: dom.Paragraph,
+    spans: list[tuple[int, int]],
+    keep: int,
+    edit_end: int,
+) -> dict[int, int]:
+    """
+    Find the commands ending after an edit at which scanning can synchronize again.
+
+    Returns a mapping of the end index of every such command to its part index.
+    """
+    return {
+        end: index
+        for index, (_, end) in enumerate(spans)
+        if index >= keep
+        and end > edit_end
+        and paragraph[index].type
+        not in (dom.PartType.TEXT, dom.PartType.HORIZONTAL_LINE)
+    }
+
+
+def _skip_spaces(text: str, index: int) -> int:
+    length = len(text)
+    while index < length and text[index] in " \t":
+        index += 1
+    return index
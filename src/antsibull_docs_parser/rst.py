@@ -13,9 +13,13 @@ import re
 import typing as t
 
 from . import dom
-from .format import Formatter, LinkProvider
+from ._escape import rst_escape_characters as _rst_escape_characters
+from ._escape import rst_escape_name as _rst_escape_name_characters
+from ._escape import rst_escape_url as _rst_escape_url
+from .format import CompiledFormatter, FormatSpec, Formatter, LinkProvider
 from .format import format_paragraphs as _format_paragraphs
-from .html import _url_escape
+from .format import format_paragraphs_stream as _format_paragraphs_stream
+from .format import format_paragraphs_utf8 as _format_paragraphs_utf8
 
 _STARTING_WHITESPACE = re.compile(r"^\s")
 _ENDING_WHITESPACE = re.compile(r"\s$")
@@ -28,15 +32,26 @@ def rst_escape(
     must_not_be_empty: bool = False,
 ) -> str:
     """Escape RST specific constructs."""
-    value = value.replace("\\", "\\\\")
-    value = value.replace("<", "\\<")
-    value = value.replace(">", "\\>")
-    value = value.replace("_", "\\_")
-    value = value.replace("*", "\\*")
-    value = value.replace("`", "\\`")
-    value = value.replace("|", "\\|")
-    value = value.replace("-", "\\-")
+    return _rst_escape_whitespace(
+        _rst_escape_characters(value), escape_ending_whitespace, must_not_be_empty
+    )
+
+
+def _rst_escape_name(
+    name: str,
+    escape_ending_whitespace: bool = False,
+    *,
+    must_not_be_empty: bool = False,
+) -> str:
+    # Like rst_escape(), but memoized; for FQCNs and similar names
+    return _rst_escape_whitespace(
+        _rst_escape_name_characters(name), escape_ending_whitespace, must_not_be_empty
+    )
 
+
+def _rst_escape_whitespace(
+    value: str, escape_ending_whitespace: bool, must_not_be_empty: bool
+) -> str:
     # RST does not like it when the inside of `...` starts or ends with a whitespace
     # (here, all kind of whitespaces count, not just spaces...)
     if escape_ending_whitespace and _ENDING_WHITESPACE.match(value[-1:]):
@@ -108,10 +123,10 @@ class AntsibullRSTFormatter(Formatter):
         if not part.url:
             return rst_escape(part.text)
         text = rst_escape(part.text, escape_ending_whitespace=True)
-        return f"\\ `{text} <{_url_escape(part.url)}>`__\\ "
+        return f"\\ `{text} <{_rst_escape_url(part.url)}>`__\\ "
 
     def format_module(self, part: dom.ModulePart, url: str | None) -> str:
-        text = rst_escape(
+        text = _rst_escape_name(
             part.fqcn, escape_ending_whitespace=True, must_not_be_empty=True
         )
         return f"\\ :ref:`{text} <ansible_collections.{part.fqcn}_module>`\\ "
@@ -126,7 +141,7 @@ class AntsibullRSTFormatter(Formatter):
         if not part.url:
             return ""
         url_text = rst_escape(part.url, escape_ending_whitespace=True)
-        return f"\\ `{url_text} <{_url_escape(part.url)}>`__\\ "
+        return f"\\ `{url_text} <{_rst_escape_url(part.url)}>`__\\ "
 
     def format_text(self, part: dom.TextPart) -> str:
         return rst_escape(part.text)
@@ -148,7 +163,7 @@ class AntsibullRSTFormatter(Formatter):
 
     def format_plugin(self, part: dom.PluginPart, url: str | None) -> str:
         return (
-            f"\\ :ref:`{rst_escape(part.plugin.fqcn)} "
+            f"\\ :ref:`{_rst_escape_name(part.plugin.fqcn)} "
             f"<ansible_collections.{part.plugin.fqcn}_{part.plugin.type}>`\\ "
         )
 
@@ -168,7 +183,7 @@ class PlainRSTFormatter(Formatter):
             if plugin.type not in ("module", "role", "playbook"):
                 plugin_result.append(" plugin")
             plugin_result.append(
-                f" :ref:`{rst_escape(plugin.fqcn)}"
+                f" :ref:`{_rst_escape_name(plugin.fqcn)}"
                 f" <ansible_collections.{plugin.fqcn}_{plugin.type}>`"
             )
         entrypoint = part.entrypoint
@@ -224,10 +239,10 @@ class PlainRSTFormatter(Formatter):
         if not part.url:
             return rst_escape(part.text)
         text = rst_escape(part.text, escape_ending_whitespace=True)
-        return f"\\ `{text} <{_url_escape(part.url)}>`__\\ "
+        return f"\\ `{text} <{_rst_escape_url(part.url)}>`__\\ "
 
     def format_module(self, part: dom.ModulePart, url: str | None) -> str:
-        text = rst_escape(
+        text = _rst_escape_name(
             part.fqcn, escape_ending_whitespace=True, must_not_be_empty=True
         )
         return f"\\ :ref:`{text} <ansible_collections.{part.fqcn}_module>`\\ "
@@ -242,7 +257,7 @@ class PlainRSTFormatter(Formatter):
         if not part.url:
             return ""
         url_text = rst_escape(part.url, escape_ending_whitespace=True)
-        return f"\\ `{url_text} <{_url_escape(part.url)}>`__\\ "
+        return f"\\ `{url_text} <{_rst_escape_url(part.url)}>`__\\ "
 
     def format_text(self, part: dom.TextPart) -> str:
         return rst_escape(part.text)
@@ -264,7 +279,7 @@ class PlainRSTFormatter(Formatter):
 
     def format_plugin(self, part: dom.PluginPart, url: str | None) -> str:
         return (
-            f"\\ :ref:`{rst_escape(part.plugin.fqcn)} "
+            f"\\ :ref:`{_rst_escape_name(part.plugin.fqcn)} "
             f"<ansible_collections.{part.plugin.fqcn}_{part.plugin.type}>`\\ "
         )
 
@@ -280,7 +295,7 @@ _BACKSLASH_SPACE_REMOVER_PRE = re.compile("(?<![\\\\])([ ])\\\\ (?![`])")
 _BACKSLASH_SPACE_REMOVER_POST = re.compile("(?<!:`)\\\\ ([ .])")
 
 
-def _remove_backslash_space(line: str) -> str:
+def _trim_backslash_space(line: str) -> str:
     start = 0
     end = len(line)
 
@@ -322,13 +337,55 @@ def _remove_backslash_space(line: str) -> str:
             end -= 1
 
     # Return subset of the line
-    line = line[start:end]
+    return line[start:end]
+
+
+def _remove_backslash_space(line: str) -> str:
+    line = _trim_backslash_space(line)
     line = _BACKSLASH_SPACE_REPEAT.sub("\\\\ ", line)
     line = _BACKSLASH_SPACE_REMOVER_POST.sub("\\1", line)
     line = _BACKSLASH_SPACE_REMOVER_PRE.sub("\\1", line)
     return line
 
 
+def _emit_line(line: str) -> str:
+    # Same result as _remove_backslash_space(line.strip().replace("\t", " ")), but
+    # decides for every '\ ' in one pass by looking at the characters next to it.
+    line = line.strip()
+    if "\\" not in line:
+        return line.replace("\t", " ")
+    chunks = _trim_backslash_space(line.replace("\t", " ")).split("\\ ")
+    if len(chunks) == 1:
+        return chunks[0]
+    for chunk in chunks[:-1]:
+        if chunk.endswith("\\"):
+            # Removing the following '\ ' would create a new '\ ', which the
+            # regular expressions treat differently
+            return _remove_backslash_space(line.replace("\t", " "))
+
+    # Merge repeated '\ ' (empty chunks), and remove '\ ' in front of a space or
+    # dot, unless it directly follows the start of a role's content (':`')
+    kept = [chunks[0]]
+    for chunk in chunks[1:]:
+        if not chunk:
+            continue
+        previous = kept[-1]
+        if chunk[0] in " ." and not previous.endswith(":`"):
+            kept[-1] = previous + chunk
+        else:
+            kept.append(chunk)
+
+    # Remove '\ ' after a space, unless a backtick follows
+    result = [kept[0]]
+    for chunk in kept[1:]:
+        previous = result[-1]
+        if previous[-1] == " " and previous[-2:-1] != "\\" and chunk[0] != "`":
+            result[-1] = previous + chunk
+        else:
+            result.append(chunk)
+    return "\\ ".join(result)
+
+
 def _check_line(index: int, lines: list[str], line: str) -> bool:
     if index < 0 or index >= len(lines):
         return False
@@ -376,9 +433,53 @@ def postprocess_rst_paragraph(par: str) -> str:
     return "\n".join(lines)
 
 
+def _emit_paragraph(par: str) -> str:
+    # Produces the same result as postprocess_rst_paragraph()
+    lines = par.strip().splitlines()
+    if len(lines) == 1:
+        line = lines[0]
+        if line in (".. raw:: html", "------------"):
+            return line
+        return _emit_line(line)
+    lines = [
+        _emit_line(line) if _modify_line(index, line, lines) else line
+        for index, line in enumerate(lines)
+    ]
+    return "\n".join(
+        [
+            line
+            for index, line in enumerate(lines)
+            if line or not _modify_line(index, line, lines)
+        ]
+    )
+
+
+RST_FORMAT = FormatSpec(
+    DEFAULT_ANTSIBULL_FORMATTER,
+    par_sep="\n\n",
+    par_empty="\\",
+    postprocess_paragraph=_emit_paragraph,
+)
+"""
+Output format for :func:`antsibull_docs_parser.format.render_multi` matching
+:func:`to_rst`.
+"""
+
+RST_PLAIN_FORMAT = FormatSpec(
+    DEFAULT_PLAIN_FORMATTER,
+    par_sep="\n\n",
+    par_empty="\\",
+    postprocess_paragraph=_emit_paragraph,
+)
+"""
+Output format for :func:`antsibull_docs_parser.format.render_multi` matching
+:func:`to_rst_plain`.
+"""
+
+
 def to_rst(
     paragraphs: t.Sequence[dom.Paragraph],
-    formatter: Formatter = DEFAULT_ANTSIBULL_FORMATTER,
+    formatter: Formatter | CompiledFormatter = DEFAULT_ANTSIBULL_FORMATTER,
     link_provider: LinkProvider | None = None,
     par_start: str = "",
     par_end: str = "",
@@ -399,13 +500,73 @@ def to_rst(
         par_sep=par_sep,
         par_empty=par_empty,
         current_plugin=current_plugin,
-        postprocess_paragraph=postprocess_rst_paragraph,
+        postprocess_paragraph=_emit_paragraph,
+    )
+
+
+def to_rst_utf8(
+    paragraphs: t.Sequence[dom.Paragraph],
+    destination: bytearray | t.BinaryIO,
+    formatter: Formatter | CompiledFormatter = DEFAULT_ANTSIBULL_FORMATTER,
+    link_provider: LinkProvider | None = None,
+    par_start: str = "",
+    par_end: str = "",
+    par_sep: str = "\n\n",
+    par_empty: str = "\\",
+    current_plugin: dom.PluginIdentifier | None = None,
+) -> int:
+    """
+    Same as :func:`to_rst`, but writes the result encoded as UTF-8 to ``destination``.
+
+    See :func:`antsibull_docs_parser.format.format_paragraphs_utf8` for details.
+    """
+    return _format_paragraphs_utf8(
+        paragraphs,
+        destination,
+        formatter=formatter,
+        link_provider=link_provider,
+        par_start=par_start,
+        par_end=par_end,
+        par_sep=par_sep,
+        par_empty=par_empty,
+        current_plugin=current_plugin,
+        postprocess_paragraph=_emit_paragraph,
+    )
+
+
+def to_rst_stream(
+    paragraphs: t.Sequence[dom.Paragraph],
+    destination: t.TextIO | t.Callable[[str], object],
+    formatter: Formatter | CompiledFormatter = DEFAULT_ANTSIBULL_FORMATTER,
+    link_provider: LinkProvider | None = None,
+    par_start: str = "",
+    par_end: str = "",
+    par_sep: str = "\n\n",
+    par_empty: str = "\\",
+    current_plugin: dom.PluginIdentifier | None = None,
+) -> int:
+    """
+    Same as :func:`to_rst`, but writes the result to ``destination``.
+
+    See :func:`antsibull_docs_parser.format.format_paragraphs_stream` for details.
+    """
+    return _format_paragraphs_stream(
+        paragraphs,
+        destination,
+        formatter=formatter,
+        link_provider=link_provider,
+        par_start=par_start,
+        par_end=par_end,
+        par_sep=par_sep,
+        par_empty=par_empty,
+        current_plugin=current_plugin,
+        postprocess_paragraph=_emit_paragraph,
     )
 
 
 def to_rst_plain(
     paragraphs: t.Sequence[dom.Paragraph],
-    formatter: Formatter = DEFAULT_PLAIN_FORMATTER,
+    formatter: Formatter | CompiledFormatter = DEFAULT_PLAIN_FORMATTER,
     link_provider: LinkProvider | None = None,
     par_start: str = "",
     par_end: str = "",
@@ -425,5 +586,65 @@ def to_rst_plain(
         par_sep=par_sep,
         par_empty=par_empty,
         current_plugin=current_plugin,
-        postprocess_paragraph=postprocess_rst_paragraph,
+        postprocess_paragraph=_emit_paragraph,
+    )
+
+
+def to_rst_plain_utf8(
+    paragraphs: t.Sequence[dom.Paragraph],
+    destination: bytearray | t.BinaryIO,
+    formatter: Formatter | CompiledFormatter = DEFAULT_PLAIN_FORMATTER,
+    link_provider: LinkProvider | None = None,
+    par_start: str = "",
+    par_end: str = "",
+    par_sep: str = "\n\n",
+    par_empty: str = "\\",
+    current_plugin: dom.PluginIdentifier | None = None,
+) -> int:
+    """
+    Same as :func:`to_rst_plain`, but writes the result encoded as UTF-8 to ``destination``.
+
+    See :func:`antsibull_docs_parser.format.format_paragraphs_utf8` for details.
+    """
+    return _format_paragraphs_utf8(
+        paragraphs,
+        destination,
+        formatter=formatter,
+        link_provider=link_provider,
+        par_start=par_start,
+        par_end=par_end,
+        par_sep=par_sep,
+        par_empty=par_empty,
+        current_plugin=current_plugin,
+        postprocess_paragraph=_emit_paragraph,
+    )
+
+
+def to_rst_plain_stream(
+    paragraphs: t.Sequence[dom.Paragraph],
+    destination: t.TextIO | t.Callable[[str], object],
+    formatter: Formatter | CompiledFormatter = DEFAULT_PLAIN_FORMATTER,
+    link_provider: LinkProvider | None = None,
+    par_start: str = "",
+    par_end: str = "",
+    par_sep: str = "\n\n",
+    par_empty: str = "\\",
+    current_plugin: dom.PluginIdentifier | None = None,
+) -> int:
+    """
+    Same as :func:`to_rst_plain`, but writes the result to ``destination``.
+
+    See :func:`antsibull_docs_parser.format.format_paragraphs_stream` for details.
+    """
+    return _format_paragraphs_stream(
+        paragraphs,
+        destination,
+        formatter=formatter,
+        link_provider=link_provider,
+        par_start=par_start,
+        par_end=par_end,
+        par_sep=par_sep,
+        par_empty=par_empty,
+        current_plugin=current_plugin,
+        postprocess_paragraph=_emit_paragraph,
     )
@@ -0,0 +1,285 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+"""
+Parsing without a context, and binding the result to contexts later.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+from . import dom
+from .interning import InternTable
+from .parser import (
+    CommandParser,
+    Context,
+    Parser,
+    Whitespace,
+    _create_text,
+    _decode_text,
+    _get_paragraphs,
+    _get_parser,
+    _parse_command,
+    _ParseOptions,
+    _reject_collect,
+    _scan,
+)
+
+
+class _DeferredCommand(t.NamedTuple):
+    text: str
+    cmd: CommandParser
+    start: int
+    end_index: int
+    args: list[str]
+    where: str | None
+    offset: int
+    paragraph_index: int | None
+
+
+def parse_string_unbound(
+    parser: Parser,
+    text: str,
+    errors: dom.ErrorType = "message",
+    where: str | None = None,
+    strict: bool = False,
+    add_source: bool = False,
+    helpful_errors: bool = True,
+    *,
+    whitespace: Whitespace = Whitespace.IGNORE,
+    add_span: bool = False,
+    intern_table: InternTable | None = None,
+    paragraph_index: int | None = None,
+) -> tuple[list[dom.AnyPart | None], list[_DeferredCommand]]:
+    """
+    Parse a paragraph without a context.
+
+    Returns the parts and the commands whose result depends on the context. The
+    parts contain ``None`` at the positions of these commands. If ``errors`` is
+    ``"exception"``, errors are returned as error parts instead of raised.
+    ``errors="collect"`` is not supported.
+    """
+    _reject_collect(errors, "parse_string_unbound")
+    internal_errors: dom.ErrorType = "ignore" if errors == "ignore" else "message"
+    offset = 1
+    if whitespace != Whitespace.IGNORE:
+        old_length = len(text)
+        text = text.lstrip()
+        offset += old_length - len(text)
+        text = text.rstrip()
+
+    parts: list[dom.AnyPart | None] = []
+    deferred: list[_DeferredCommand] = []
+    if not parser.contains_markup(text):
+        if text:
+            parts.append(
+                _create_text(
+                    text,
+                    add_source,
+                    whitespace,
+                    (offset - 1, offset - 1 + len(text)) if add_span else None,
+                )
+            )
+        return parts, deferred
+
+    context = Context()
+    for cmd, index, end_index, args, error in _scan(parser, text, strict):
+        if cmd is None:
+            parts.append(
+                _create_text(
+                    text[index:end_index],
+                    add_source,
+                    whitespace,
+                    (
+                        (index + offset - 1, end_index + offset - 1)
+                        if add_span
+                        else None
+                    ),
+                )
+            )
+            continue
+        args = t.cast(list[str], args)
+        if error is None and cmd.uses_context(args, whitespace):
+            deferred.append(
+                _DeferredCommand(
+                    text=text,
+                    cmd=cmd,
+                    start=index,
+                    end_index=end_index,
+                    args=args,
+                    where=where,
+                    offset=offset,
+                    paragraph_index=paragraph_index,
+                )
+            )
+            parts.append(None)
+            continue
+        part = _parse_command(
+            text,
+            cmd,
+            index,
+            end_index,
+            args,
+            error,
+            context,
+            internal_errors,
+            where,
+            add_source=add_source,
+            helpful_errors=helpful_errors,
+            whitespace=whitespace,
+            offset=offset,
+            add_span=add_span,
+            intern_table=intern_table,
+            paragraph_index=paragraph_index,
+        )
+        if part is not None:
+            parts.append(part)
+    return parts, deferred
+
+
+class UnboundParagraphs:
+    """
+    The result of :func:`parse_unbound`: paragraphs that are not yet bound to a
+    context.
+
+    Use :func:`bind_context` to obtain the paragraphs for a specific context.
+    """
+
+    def __init__(
+        self,
+        paragraphs: list[list[dom.AnyPart | None]],
+        deferred: list[list[_DeferredCommand]],
+        options: _ParseOptions,
+        intern_table: InternTable | None,
+    ):
+        self._paragraphs = paragraphs
+        self._deferred = deferred
+        self._options = options
+        self._intern_table = intern_table
+
+    @property
+    def depends_on_context(self) -> bool:
+        """
+        Whether the paragraphs contain option or return value parts that depend on the
+        context.
+
+        If this is ``False``, :func:`bind_context` returns the same paragraphs for
+        every context.
+        """
+        return any(self._deferred)
+
+    def __len__(self) -> int:
+        return len(self._paragraphs)
+
+
+def parse_unbound(
+    text: str | bytes | memoryview | t.Sequence[str | bytes | memoryview],
+    errors: dom.ErrorType = "message",
+    only_classic_markup: bool = False,
+    strict: bool = False,
+    add_source: bool = False,
+    helpful_errors: bool = True,
+    *,
+    whitespace: Whitespace = Whitespace.IGNORE,
+    add_span: bool = False,
+    intern_table: InternTable | None = None,
+) -> UnboundParagraphs:
+    """
+    Parse a string, or a sequence of strings, without a context.
+
+    Only option and return value parts that do not explicitly specify a plugin depend
+    on the context. They are parsed when the result is bound to a context with
+    :func:`bind_context`. Everything else is parsed only once. This is useful for
+    texts that are shared by many plugins, like the ones from documentation fragments.
+
+    The parameters are the same as for :func:`parse`. If ``errors`` is
+    ``"exception"``, the exception is raised by :func:`bind_context`.
+    ``errors="collect"`` is not supported.
+    """
+    _reject_collect(errors, "parse_unbound")
+    options = _ParseOptions(
+        errors=errors,
+        only_classic_markup=only_classic_markup,
+        strict=strict,
+        add_source=add_source,
+        helpful_errors=helpful_errors,
+        whitespace=whitespace,
+        add_span=add_span,
+    )
+    texts, has_paragraphs = _get_paragraphs(_decode_text(text))
+    parser = _get_parser(only_classic_markup)
+    paragraphs = []
+    deferred = []
+    for index, par in enumerate(texts):
+        parts, paragraph_deferred = parse_string_unbound(
+            parser,
+            par,
+            errors=errors,
+            strict=strict,
+            add_source=add_source,
+            helpful_errors=helpful_errors,
+            whitespace=whitespace,
+            add_span=add_span,
+            intern_table=intern_table,
+            paragraph_index=index if has_paragraphs else None,
+        )
+        paragraphs.append(parts)
+        deferred.append(paragraph_deferred)
+    return UnboundParagraphs(paragraphs, deferred, options, intern_table)
+
+
+def bind_context(
+    paragraphs: UnboundParagraphs, context: Context
+) -> list[dom.Paragraph]:
+    """
+    Bind the result of :func:`parse_unbound` to a context.
+
+    :param paragraphs: The result of :func:`parse_unbound`.
+
+    :param context: Contextual information, see :func:`parse`.
+
+    :return: The same paragraphs as returned by :func:`parse` for the same text,
+        context, and options. Parts that do not depend on the context are shared
+        between all results bound from the same ``paragraphs``.
+    """
+    # pylint:disable=protected-access
+    options = paragraphs._options
+    result: list[dom.Paragraph] = []
+    for parts, deferred in zip(paragraphs._paragraphs, paragraphs._deferred):
+        if not deferred and options.errors != "exception":
+            result.append(t.cast(dom.Paragraph, list(parts)))
+            continue
+        bound: dom.Paragraph = []
+        next_deferred = 0
+        for part in parts:
+            if part is None:
+                command = deferred[next_deferred]
+                next_deferred += 1
+                part = _parse_command(
+                    command.text,
+                    command.cmd,
+                    command.start,
+                    command.end_index,
+                    command.args,
+                    None,
+                    context,
+                    options.errors,
+                    command.where,
+                    add_source=options.add_source,
+                    helpful_errors=options.helpful_errors,
+                    whitespace=options.whitespace,
+                    offset=command.offset,
+                    add_span=options.add_span,
+                    intern_table=paragraphs._intern_table,
+                    paragraph_index=command.paragraph_index,
+                )
+                if part is None:
+                    continue
+            elif options.errors == "exception" and part.type == dom.PartType.ERROR:
+                raise ValueError(t.cast(dom.ErrorPart, part).message)
+            bound.append(part)
+        result.append(bound)
+    return result
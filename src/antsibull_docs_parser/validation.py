@@ -0,0 +1,121 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+"""
+Validation of markup without creating parts.
+"""
+
+from __future__ import annotations
+
+import typing as t
+
+from .diagnostics import Diagnostic, _get_scanner_error_code
+from .lines import LineIndex
+from .parser import (
+    Context,
+    Parser,
+    Whitespace,
+    _create_diagnostic,
+    _decode_text,
+    _get_paragraphs,
+    _get_parser,
+    _scan,
+)
+
+
+def validate_string(
+    parser: Parser,
+    text: str,
+    context: Context,
+    where: str | None = None,
+    strict: bool = False,
+    helpful_errors: bool = True,
+    *,
+    whitespace: Whitespace = Whitespace.IGNORE,
+    diagnostics: list[Diagnostic] | None = None,
+    paragraph_index: int | None = None,
+) -> list[Diagnostic]:
+    """
+    Find all errors in a paragraph with ``parser`` without creating parts.
+
+    Returns the same diagnostics as :meth:`Parser.parse_string` with
+    ``errors="collect"``.
+    If ``diagnostics`` is provided, they are appended to it, and it is returned.
+    """
+    if diagnostics is None:
+        diagnostics = []
+    line_index = LineIndex(text)
+    offset = 1
+    if whitespace != Whitespace.IGNORE:
+        old_length = len(text)
+        text = text.lstrip()
+        offset += old_length - len(text)
+        text = text.rstrip()
+
+    if not parser.contains_markup(text):
+        return diagnostics
+
+    for cmd, index, end_index, args, error in _scan(parser, text, strict):
+        if cmd is None:
+            continue
+        if error is None:
+            command_error = cmd.validate(t.cast(list[str], args), context, whitespace)
+            if command_error is None:
+                continue
+            code, error = command_error
+        else:
+            code = _get_scanner_error_code(error)
+        diagnostics.append(
+            _create_diagnostic(
+                text,
+                cmd,
+                index,
+                end_index,
+                code,
+                error,
+                where,
+                helpful_errors=helpful_errors,
+                offset=offset,
+                paragraph_index=paragraph_index,
+                line_index=line_index,
+            )
+        )
+    return diagnostics
+
+
+def validate(
+    text: str | bytes | memoryview | t.Sequence[str | bytes | memoryview],
+    context: Context,
+    only_classic_markup: bool = False,
+    strict: bool = False,
+    helpful_errors: bool = True,
+    *,
+    whitespace: Whitespace = Whitespace.IGNORE,
+) -> list[Diagnostic]:
+    """
+    Find all errors in a string, or a sequence of strings, without creating parts.
+
+    This is a lot faster than parsing, and is useful for linting markup.
+
+    The parameters are the same as for :func:`parse`.
+
+    :return: The same diagnostics as appended by :func:`parse` with
+        ``errors="collect"``.
+    """
+    texts, has_paragraphs = _get_paragraphs(_decode_text(text))
+    parser = _get_parser(only_classic_markup)
+    diagnostics: list[Diagnostic] = []
+    for index, par in enumerate(texts):
+        validate_string(
+            parser,
+            par,
+            context,
+            strict=strict,
+            helpful_errors=helpful_errors,
+            whitespace=whitespace,
+            diagnostics=diagnostics,
+            paragraph_index=index if has_paragraphs else None,
+        )
+    return diagnostics
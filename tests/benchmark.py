@@ -0,0 +1,455 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+"""
+Micro-benchmarks for performance critical parts of antsibull-docs-parser.
+
+Run with ``nox -e benchmark``, or ``python tests/benchmark.py [<name>...]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import os
+import re
+import sys
+import timeit
+import typing as t
+from html import escape as _html_escape
+from urllib.parse import quote
+
+import yaml
+
+from antsibull_docs_parser import _escape, dom, md, rst
+from antsibull_docs_parser._parser_impl import (
+    _scan_escaped_parameters,
+    parse_parameters_escaped,
+    scan_parameters_escaped,
+)
+from antsibull_docs_parser.ansible_doc_text import (
+    ANSIBLE_DOC_TEXT_FORMAT,
+    to_ansible_doc_text,
+)
+from antsibull_docs_parser.dom import PartType
+from antsibull_docs_parser.format import (
+    compile_formatter,
+    format_paragraphs,
+    render_multi,
+)
+from antsibull_docs_parser.html import (
+    DEFAULT_ANTSIBULL_FORMATTER,
+    HTML_FORMAT,
+    to_html,
+)
+from antsibull_docs_parser.md import to_md
+from antsibull_docs_parser.parser import (
+    Context,
+    Whitespace,
+    _process_whitespace,
+    parse,
+)
+from antsibull_docs_parser.rst import (
+    RST_FORMAT,
+    RST_PLAIN_FORMAT,
+    to_rst,
+    to_rst_plain,
+)
+from antsibull_docs_parser.validation import validate
+
+Case = t.Tuple[str, t.Callable[[], object]]
+
+BENCHMARKS: dict[str, t.Callable[[], list[Case]]] = {}
+
+
+def benchmark(name: str):
+    def decorator(func: t.Callable[[], list[Case]]) -> t.Callable[[], list[Case]]:
+        BENCHMARKS[name] = func
+        return func
+
+    return decorator
+
+
+_REFERENCE_WHITESPACE = re.compile(r"([\s]+)")
+_REFERENCE_DANGEROUS_WS = re.compile(r"[\t\n\r]")
+_REFERENCE_SPACES_TO_KEEP = re.compile(
+    "([\u00a0\u202f\u2007\u2060\u200b\u200c\u200d\ufeff]+)", flags=re.UNICODE
+)
+
+
+def _reference_process_whitespace(
+    text: str,
+    *,
+    whitespace: Whitespace,
+    code_environment: bool = False,
+    no_newlines: bool = False,
+) -> str:
+    # The previous implementation of _process_whitespace, for comparison
+    def add_whitespace(ws: str) -> None:
+        if (
+            whitespace == Whitespace.KEEP_SINGLE_NEWLINES
+            and not no_newlines
+            and any(lb in ws for lb in "\n\r")
+        ):
+            result.append("\n")
+        else:
+            result.append(" ")
+
+    if whitespace == Whitespace.IGNORE:
+        return text
+    length = len(text)
+    index = 0
+    result: list[str] = []
+    while index < length:
+        m = _REFERENCE_WHITESPACE.search(text, index)
+        if m is None:
+            result.append(text[index:])
+            break
+        if m.start(1) > index:
+            result.append(text[index : m.start(1)])
+        ws = m.group(1)
+        if code_environment:
+            result.append(_REFERENCE_DANGEROUS_WS.sub(" ", ws))
+        else:
+            ws_index = 0
+            ws_length = len(ws)
+            while ws_index < ws_length:
+                wsm = _REFERENCE_SPACES_TO_KEEP.search(ws, ws_index)
+                if wsm is None:
+                    add_whitespace(ws[ws_index:])
+                    break
+                if wsm.start(1) > ws_index:
+                    add_whitespace(ws[ws_index : wsm.start(1)])
+                result.append(wsm.group(1))
+                ws_index = wsm.end(1)
+        index = m.end(1)
+    return "".join(result)
+
+
+_WHITESPACE_TEXTS = {
+    "word": "foo.bar.baz",
+    "sentence": "The quick brown fox jumps over the lazy dog.",
+    "paragraph": (
+        "This module manages the state of a\n  service. It can be used to"
+        " start,\tstop, or  restart\r\nthe service.\n\n"
+    )
+    * 5,
+    "unicode": "Café au lait, s'il vous plaît.\n  Merci beaucoup !",
+}
+
+
+@benchmark("whitespace")
+def _whitespace() -> list[Case]:
+    cases: list[Case] = []
+    for mode in (Whitespace.STRIP, Whitespace.KEEP_SINGLE_NEWLINES):
+        for text_name, text in _WHITESPACE_TEXTS.items():
+            for impl_name, impl in (
+                ("reference", _reference_process_whitespace),
+                ("current", _process_whitespace),
+            ):
+                cases.append(
+                    (
+                        f"{mode.name} {text_name} ({impl_name})",
+                        lambda impl=impl, text=text, mode=mode: impl(
+                            text, whitespace=mode
+                        ),
+                    )
+                )
+    return cases
+
+
+_ESCAPED_ARGUMENTS = {
+    "option": ("O(foo.bar.baz#module:state=present)", 1),
+    "return value": ("RV(foo.bar.baz#module:results[].changed)", 1),
+    "escaped": ("V(a\\)b\\\\c)", 1),
+    "link": ("L(Ansible documentation, https://docs.ansible.com/)", 2),
+}
+
+_OPTION_PARAGRAPH = (
+    "If O(state=present), the value of O(name) is used together with"
+    " O(foo.bar.baz#module:options.path), unless V(absent) is returned in"
+    " RV(results[].changed). See O(foo.bar.baz#role:main:state) for details. "
+) * 10
+
+
+@benchmark("escaped-arguments")
+def _escaped_arguments() -> list[Case]:
+    cases: list[Case] = []
+    for text_name, (text, parameter_count) in _ESCAPED_ARGUMENTS.items():
+        index = text.index("(") + 1
+        for impl_name, impl in (
+            ("reference", parse_parameters_escaped),
+            ("previous", _scan_escaped_parameters),
+            ("current", scan_parameters_escaped),
+        ):
+            cases.append(
+                (
+                    f"{text_name} ({impl_name})",
+                    lambda impl=impl, text=text, index=index, count=parameter_count: (
+                        impl(text, index, count, False)
+                    ),
+                )
+            )
+    context = Context()
+    cases.append(
+        ("O()-heavy paragraph (parse)", lambda: parse(_OPTION_PARAGRAPH, context))
+    )
+    return cases
+
+
+_LINT_TEXTS = [
+    _OPTION_PARAGRAPH,
+    "Manages the I(state) of M(foo.bar.baz) and P(foo.bar.baz#lookup).\n"
+    " See U(https://example.com) and L(the docs,https://docs.ansible.com/)"
+    " for details. C(foo: bar) is equivalent to V(bar). HORIZONTALLINE\n" * 5,
+    "Broken M(foo) and O(foo.bar.baz#b m:bar) and P(foo) and L(foo" * 5,
+]
+
+
+@benchmark("validate")
+def _validate() -> list[Case]:
+    context = Context()
+    cases: list[Case] = []
+    for whitespace in (Whitespace.IGNORE, Whitespace.STRIP):
+        options: dict[str, t.Any] = {"strict": True, "whitespace": whitespace}
+        cases.append(
+            (
+                f"{whitespace.name} (parse)",
+                lambda options=options: parse(
+                    _LINT_TEXTS,
+                    context,
+                    errors="collect",
+                    diagnostics=[],
+                    **options,
+                ),
+            )
+        )
+        cases.append(
+            (
+                f"{whitespace.name} (validate)",
+                lambda options=options: validate(_LINT_TEXTS, context, **options),
+            )
+        )
+    return cases
+
+
+_VECTORS_FILE = os.path.join(os.path.dirname(__file__), "..", "test-vectors.yaml")
+
+
+@functools.lru_cache(maxsize=None)
+def _load_vector_paragraphs() -> list[dom.Paragraph]:
+    # All paragraphs of the test vectors, parsed with default options
+    with open(_VECTORS_FILE, "rb") as stream:
+        vectors = yaml.load(stream, Loader=yaml.SafeLoader)["test_vectors"]
+    paragraphs: list[dom.Paragraph] = []
+    for test_data in vectors.values():
+        paragraphs.extend(parse(test_data["source"], Context()))
+    return paragraphs
+
+
+# pylint:disable-next=too-many-branches
+def _reference_walk(  # noqa: C901
+    paragraph: t.Iterable[dom.AnyPart], walker: dom.Walker
+) -> None:
+    # The previous implementation of dom.walk, for comparison
+    for part in paragraph:
+        if part.type == PartType.ERROR:
+            walker.process_error(t.cast(dom.ErrorPart, part))
+        elif part.type == PartType.BOLD:
+            walker.process_bold(t.cast(dom.BoldPart, part))
+        elif part.type == PartType.CODE:
+            walker.process_code(t.cast(dom.CodePart, part))
+        elif part.type == PartType.HORIZONTAL_LINE:
+            walker.process_horizontal_line(t.cast(dom.HorizontalLinePart, part))
+        elif part.type == PartType.ITALIC:
+            walker.process_italic(t.cast(dom.ItalicPart, part))
+        elif part.type == PartType.LINK:
+            walker.process_link(t.cast(dom.LinkPart, part))
+        elif part.type == PartType.MODULE:
+            walker.process_module(t.cast(dom.ModulePart, part))
+        elif part.type == PartType.RST_REF:
+            walker.process_rst_ref(t.cast(dom.RSTRefPart, part))
+        elif part.type == PartType.URL:
+            walker.process_url(t.cast(dom.URLPart, part))
+        elif part.type == PartType.TEXT:
+            walker.process_text(t.cast(dom.TextPart, part))
+        elif part.type == PartType.ENV_VARIABLE:
+            walker.process_env_variable(t.cast(dom.EnvVariablePart, part))
+        elif part.type == PartType.OPTION_NAME:
+            walker.process_option_name(t.cast(dom.OptionNamePart, part))
+        elif part.type == PartType.OPTION_VALUE:
+            walker.process_option_value(t.cast(dom.OptionValuePart, part))
+        elif part.type == PartType.PLUGIN:
+            walker.process_plugin(t.cast(dom.PluginPart, part))
+        elif part.type == PartType.RETURN_VALUE:
+            walker.process_return_value(t.cast(dom.ReturnValuePart, part))
+        else:
+            raise RuntimeError(f"Internal error: unknown type {part.type!r}")
+
+
+@benchmark("walk")
+def _walk() -> list[Case]:
+    paragraphs = _load_vector_paragraphs()
+    walker = dom.NoopWalker()
+
+    def reference() -> None:
+        for paragraph in paragraphs:
+            _reference_walk(paragraph, walker)
+
+    def current() -> None:
+        for paragraph in paragraphs:
+            dom.walk(paragraph, walker)
+
+    return [
+        ("test vectors (previous)", reference),
+        ("test vectors (walk)", current),
+        ("test vectors (walk_many)", lambda: dom.walk_many(paragraphs, walker)),
+    ]
+
+
+@benchmark("compiled-formatter")
+def _compiled_formatter() -> list[Case]:
+    paragraphs = _load_vector_paragraphs()
+    compiled = compile_formatter(DEFAULT_ANTSIBULL_FORMATTER)
+    return [
+        ("test vectors (to_html)", lambda: to_html(paragraphs)),
+        ("test vectors (compiled)", lambda: to_html(paragraphs, formatter=compiled)),
+        ("compile", lambda: compile_formatter(DEFAULT_ANTSIBULL_FORMATTER)),
+    ]
+
+
+@benchmark("render-multi")
+def _render_multi() -> list[Case]:
+    paragraphs = _load_vector_paragraphs()
+    formats = {
+        "html": HTML_FORMAT,
+        "rst": RST_FORMAT,
+        "rst_plain": RST_PLAIN_FORMAT,
+        "ansible_doc_text": ANSIBLE_DOC_TEXT_FORMAT,
+    }
+
+    def separate() -> None:
+        to_html(paragraphs)
+        to_rst(paragraphs)
+        to_rst_plain(paragraphs)
+        to_ansible_doc_text(paragraphs)
+
+    return [
+        ("test vectors (separate)", separate),
+        ("test vectors (render_multi)", lambda: render_multi(paragraphs, formats)),
+    ]
+
+
+_REFERENCE_MD_ESCAPE = re.compile(r"""([!"#$%&'()*+,:;<=>?@[\\\]^_`{|}~.-])""")
+
+
+def _reference_rst_escape(value: str) -> str:
+    value = value.replace("\\", "\\\\")
+    for character in "<>_*`|-":
+        value = value.replace(character, f"\\{character}")
+    return value
+
+
+_ESCAPE_TEXTS = {
+    "fqcn": "community.general.foo_bar",
+    "sentence": "The quick brown fox jumps over the lazy dog",
+    "special": "a_b-c `x` and <*y*> & 'z'",
+    "url": "https://docs.ansible.com/ansible/latest/collections/index.html#foo",
+}
+
+
+@benchmark("escape")
+def _escape_benchmark() -> list[Case]:
+    cases: list[Case] = []
+    for text_name, text in _ESCAPE_TEXTS.items():
+        for impl_name, impl in (
+            ("html previous", lambda text: _html_escape(text).replace("&quot;", '"')),
+            ("html", _escape.html_escape),
+            ("md previous", lambda text: _REFERENCE_MD_ESCAPE.sub(r"\\\1", text)),
+            ("md", _escape.md_escape),
+            ("md memoized", _escape.md_escape_name),
+            ("rst previous", _reference_rst_escape),
+            ("rst", _escape.rst_escape_characters),
+            ("url previous", lambda text: quote(text, safe=":/#?!*'();@&=+$,")),
+            ("url", _escape.url_escape),
+        ):
+            cases.append(
+                (f"{text_name} ({impl_name})", lambda impl=impl, text=text: impl(text))
+            )
+    paragraphs = _load_vector_paragraphs()
+    cases.extend(
+        [
+            ("test vectors (to_html)", lambda: to_html(paragraphs)),
+            ("test vectors (to_md)", lambda: to_md(paragraphs)),
+            ("test vectors (to_rst)", lambda: to_rst(paragraphs)),
+        ]
+    )
+    return cases
+
+
+@benchmark("rst-emit")
+def _rst_emit() -> list[Case]:
+    pars = [
+        format_paragraphs([paragraph], formatter)
+        for paragraph in _load_vector_paragraphs()
+        for formatter in (rst.DEFAULT_ANTSIBULL_FORMATTER, rst.DEFAULT_PLAIN_FORMATTER)
+    ]
+    paragraphs = _load_vector_paragraphs()
+    return [
+        (
+            "test vectors (postprocess_rst_paragraph)",
+            lambda: [rst.postprocess_rst_paragraph(par) for par in pars],
+        ),
+        ("test vectors (emit)", lambda: [rst._emit_paragraph(par) for par in pars]),
+        ("test vectors (to_rst)", lambda: to_rst(paragraphs)),
+    ]
+
+
+@benchmark("md-emit")
+def _md_emit() -> list[Case]:
+    pars = [
+        format_paragraphs([paragraph], md.DEFAULT_FORMATTER)
+        for paragraph in _load_vector_paragraphs()
+    ]
+    paragraphs = _load_vector_paragraphs()
+    return [
+        (
+            "test vectors (postprocess_md_paragraph)",
+            lambda: [md.postprocess_md_paragraph(par) for par in pars],
+        ),
+        ("test vectors (emit)", lambda: [md._emit_paragraph(par) for par in pars]),
+        ("test vectors (to_md)", lambda: to_md(paragraphs)),
+    ]
+
+
+def run(name: str, number: int, repeat: int) -> None:
+    print(f"{name}:")
+    for case_name, func in BENCHMARKS[name]():
+        best = min(timeit.repeat(func, number=number, repeat=repeat))
+        print(f"  {case_name}: {best / number * 1e6:.3f} µs")
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "names",
+        nargs="*",
+        metavar="name",
+        help="The benchmarks to run. By default, all benchmarks are run."
+        f" Available: {', '.join(sorted(BENCHMARKS))}",
+    )
+    parser.add_argument("--number", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"Unknown benchmark {name!r}")
+    for name in args.names or sorted(BENCHMARKS):
+        run(name, args.number, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,59 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+import typing as t
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from antsibull_docs_parser.batch import parse_many
+from antsibull_docs_parser.parser import Context, Whitespace, parse
+
+from .test_parser import TEST_PARSE_DATA
+
+PARSE_MANY_ITEMS: t.List[t.Tuple[t.Union[str, t.List[str]], Context]] = [
+    (paragraphs, context) for paragraphs, context, kwargs, expected in TEST_PARSE_DATA
+]
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 7, 1000])
+def test_parse_many(chunk_size: t.Optional[int]) -> None:
+    expected = [parse(text, context) for text, context in PARSE_MANY_ITEMS]
+    assert parse_many(iter(PARSE_MANY_ITEMS)) == expected
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        assert (
+            parse_many(PARSE_MANY_ITEMS, executor=executor, chunk_size=chunk_size)
+            == expected
+        )
+        assert parse_many([], executor=executor, chunk_size=chunk_size) == []
+
+
+def test_parse_many_options() -> None:
+    items = [("C(  a  )", Context()), (["M(foo)", "bar"], Context())]
+    expected = [
+        parse(text, context, whitespace=Whitespace.STRIP, add_source=True)
+        for text, context in items
+    ]
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        assert (
+            parse_many(
+                items, whitespace=Whitespace.STRIP, add_source=True, executor=executor
+            )
+            == expected
+        )
+        with pytest.raises(ValueError) as exc:
+            parse_many(items, errors="exception", executor=executor)
+        assert str(exc.value) == (
+            'While parsing "M(foo)" at index 1 of paragraph 1:'
+            ' Module name "foo" is not a FQCN'
+        )
+
+
+def test_parse_many_bad_chunk_size() -> None:
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(ValueError) as exc:
+            parse_many([], executor=executor, chunk_size=0)
+    assert str(exc.value) == "chunk_size must be positive"
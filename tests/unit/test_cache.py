@@ -0,0 +1,136 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+import threading
+
+import pytest
+
+from antsibull_docs_parser import dom
+from antsibull_docs_parser.cache import CacheStatistics, ParseCache
+from antsibull_docs_parser.parser import Context, Whitespace, parse
+
+
+def test_parse_cache() -> None:
+    cache = ParseCache()
+    context = Context(current_plugin=dom.PluginIdentifier(fqcn="a.b.c", type="module"))
+    expected = parse("foo O(bar) baz", context)
+
+    assert parse("foo O(bar) baz", context, cache=cache) == expected
+    assert cache.statistics[:3] == (0, 1, 0)
+    assert parse("foo O(bar) baz", context, cache=cache) == expected
+    assert cache.statistics[:4] == (1, 1, 0, 1)
+
+    # Every option and the context are part of the key
+    parse("foo O(bar) baz", Context(), cache=cache)
+    parse(["foo O(bar) baz"], context, cache=cache)
+    parse("foo O(bar) baz", context, cache=cache, whitespace=Whitespace.STRIP)
+    parse("foo O(bar) baz", context, cache=cache, add_source=True)
+    assert cache.statistics[:4] == (1, 5, 0, 5)
+
+
+def test_parse_cache_copies() -> None:
+    cache = ParseCache()
+    result = parse(["O(foo.bar)", "bar"], Context(), cache=cache)
+    result[0][0].link.append("baz")
+    result[1].append(dom.TextPart(text="baz"))
+    result.append([])
+    result = parse(["O(foo.bar)", "bar"], Context(), cache=cache)
+    assert result == [
+        [
+            dom.OptionNamePart(
+                plugin=None,
+                entrypoint=None,
+                link=["foo", "bar"],
+                name="foo.bar",
+                value=None,
+            ),
+        ],
+        [dom.TextPart(text="bar")],
+    ]
+    result[0][0].link.append("baz")
+    assert parse(["O(foo.bar)", "bar"], Context(), cache=cache)[0][0].link == [
+        "foo",
+        "bar",
+    ]
+
+
+def test_parse_cache_exception() -> None:
+    cache = ParseCache()
+    with pytest.raises(ValueError):
+        parse("M(foo)", Context(), errors="exception", cache=cache)
+    assert cache.statistics == CacheStatistics(
+        hits=0, misses=1, evictions=0, entries=0, size=0
+    )
+
+
+def test_parse_cache_lru() -> None:
+    cache = ParseCache(max_entries=2)
+    cache.put("a", [[dom.TextPart(text="a")]])
+    cache.put("b", [[dom.TextPart(text="b")]])
+    assert cache.get("a") == [[dom.TextPart(text="a")]]
+    cache.put("c", [[dom.TextPart(text="c")]])
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    stats = cache.statistics
+    assert stats[:4] == (3, 1, 1, 2)
+
+    cache.put("c", [[dom.TextPart(text="cc")]])
+    assert cache.get("c") == [[dom.TextPart(text="cc")]]
+    assert cache.statistics.entries == 2
+
+    cache.clear()
+    assert cache.get("a") is None
+    assert cache.statistics[2:] == (1, 0, 0)
+
+
+def test_parse_cache_max_bytes() -> None:
+    probe = ParseCache()
+    probe.put("a", [[dom.TextPart(text="a")]])
+    entry_size = probe.statistics.size
+    assert entry_size > 0
+
+    cache = ParseCache(max_bytes=entry_size * 2)
+    cache.put("a", [[dom.TextPart(text="a")]])
+    cache.put("b", [[dom.TextPart(text="b")]])
+    assert cache.statistics.entries == 2
+    cache.put("c", [[dom.TextPart(text="c")]])
+    assert cache.statistics.entries == 2
+    assert cache.statistics.evictions == 1
+    assert cache.statistics.size <= entry_size * 2
+
+    # Entries that are too large by themselves are not stored
+    cache.put("d", [[dom.TextPart(text="d" * entry_size * 2)]])
+    assert cache.get("d") is None
+    assert cache.statistics.entries == 2
+
+
+def test_parse_cache_bad_max_entries() -> None:
+    with pytest.raises(ValueError) as exc:
+        ParseCache(max_entries=0)
+    assert str(exc.value) == "max_entries must be positive"
+
+
+def test_parse_cache_threads() -> None:
+    cache = ParseCache(max_entries=10)
+    texts = [f"I(foo{i}) bar" for i in range(20)]
+    failures = []
+
+    def worker() -> None:
+        for _ in range(20):
+            for text in texts:
+                if parse(text, Context(), cache=cache) != parse(text, Context()):
+                    failures.append(text)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not failures
+    stats = cache.statistics
+    assert stats.hits + stats.misses == 4 * 20 * 20
+    assert stats.entries == 10
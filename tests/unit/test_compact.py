@@ -0,0 +1,89 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+import pickle
+import sys
+import typing as t
+
+import pytest
+
+from antsibull_docs_parser import dom
+from antsibull_docs_parser.compact import CompactParagraph
+from antsibull_docs_parser.format import format_paragraphs
+from antsibull_docs_parser.md import MDFormatter
+from antsibull_docs_parser.parser import Context, parse
+
+TEST_COMPACT: t.List[dom.Paragraph] = [
+    [],
+    [dom.TextPart(text="")],
+    [dom.ErrorPart(message="foo", source="M(foo)", span=(3, 9))],
+    [
+        dom.TextPart(text="foo ", source="foo "),
+        dom.ItalicPart(text="bar"),
+        dom.CodePart(text=" bam "),
+        dom.BoldPart(text=" ( boo "),
+        dom.URLPart(url="https://example.com/?foo=bar"),
+        dom.HorizontalLinePart(span=(0, 14)),
+        dom.LinkPart(text="foo", url="https://bar.com"),
+        dom.RSTRefPart(text=" a", ref="b "),
+        dom.ModulePart(fqcn="foo.bar.baz"),
+        dom.TextPart(text="HORIZONTALLINEx "),
+    ],
+    [
+        dom.EnvVariablePart(name="a),b"),
+        dom.PluginPart(plugin=dom.PluginIdentifier(fqcn="foo.bar.baz", type="bam")),
+        dom.OptionValuePart(value=" b,na)\\m, "),
+        dom.OptionNamePart(
+            plugin=None, entrypoint=None, link=["foo"], name="foo", value=None
+        ),
+        dom.ReturnValuePart(
+            plugin=dom.PluginIdentifier(fqcn="foo.bar.baz", type="role"),
+            entrypoint="main",
+            link=["bar", "baz"],
+            name="bar.baz[1]",
+            value="",
+            source="RV(foo.bar.baz#role:main:bar.baz[1]=)",
+        ),
+        dom.ReturnValuePart(plugin=None, entrypoint=None, link=[], name="", value=None),
+    ],
+]
+
+
+@pytest.mark.parametrize("paragraph", TEST_COMPACT)
+def test_compact_paragraph(paragraph: dom.Paragraph) -> None:
+    compact = CompactParagraph(paragraph)
+    assert len(compact) == len(paragraph)
+    assert list(compact) == paragraph
+    assert compact.to_paragraph() == paragraph
+    assert compact[:] == paragraph
+    assert compact[1::2] == paragraph[1::2]
+    for index, part in enumerate(paragraph):
+        assert compact[index] == part
+        assert compact[index - len(paragraph)] == part
+    with pytest.raises(IndexError):
+        compact[len(paragraph)]
+    with pytest.raises(IndexError):
+        compact[-len(paragraph) - 1]
+
+    assert compact == CompactParagraph(paragraph)
+    assert compact != paragraph
+    assert pickle.loads(pickle.dumps(compact)) == compact
+    assert repr(compact) == f"CompactParagraph({paragraph!r})"
+
+
+def test_compact_paragraph_parsed() -> None:
+    text = "foo I(bar) O(a.b.c#module:foo.bar=baz) bar C(x) M(a.b.c) " * 20
+    paragraphs = parse([text, "", "RV(foo)"], Context(), add_source=True)
+    compact = [CompactParagraph(paragraph) for paragraph in paragraphs]
+    assert [list(paragraph) for paragraph in compact] == paragraphs
+    assert sys.getsizeof(compact[0]) < sys.getsizeof(paragraphs[0]) + sum(
+        sys.getsizeof(part) for part in paragraphs[0]
+    )
+
+    # Compact paragraphs can be walked and formatted directly
+    assert format_paragraphs(compact, MDFormatter()) == format_paragraphs(
+        paragraphs, MDFormatter()
+    )
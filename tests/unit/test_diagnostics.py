@@ -0,0 +1,293 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+import json
+import pickle
+import typing as t
+
+import pytest
+
+from antsibull_docs_parser import dom
+from antsibull_docs_parser.batch import parse_many
+from antsibull_docs_parser.cache import ParseCache
+from antsibull_docs_parser.compact import CompactParagraph
+from antsibull_docs_parser.diagnostics import Diagnostic, DiagnosticCode
+from antsibull_docs_parser.lines import Position
+from antsibull_docs_parser.parser import (
+    CommandParser,
+    Context,
+    Parser,
+    Whitespace,
+    iter_paragraph,
+    iter_parse,
+    parse,
+)
+from antsibull_docs_parser.reparse import reparse_paragraph
+from antsibull_docs_parser.unbound import parse_unbound
+from antsibull_docs_parser.validation import validate, validate_string
+
+from .test_parser import TEST_PARSE_DATA
+
+
+@pytest.mark.parametrize("paragraphs, context, kwargs, expected", TEST_PARSE_DATA)
+def test_collect(
+    paragraphs: t.Union[str, t.List[str]],
+    context: Context,
+    kwargs: t.Dict[str, t.Any],
+    expected: t.List[dom.Paragraph],
+) -> None:
+    if kwargs.get("errors", "message") != "message":
+        return
+    kwargs = {**kwargs, "add_span": True}
+    expected = parse(paragraphs, context, **kwargs)
+    diagnostics: t.List[Diagnostic] = []
+    result = parse(
+        paragraphs, context, **{**kwargs, "errors": "collect"}, diagnostics=diagnostics
+    )
+    assert result == [
+        [part for part in paragraph if part.type != dom.PartType.ERROR]
+        for paragraph in expected
+    ]
+    error_parts = [
+        (index, part)
+        for index, paragraph in enumerate(expected)
+        for part in paragraph
+        if part.type == dom.PartType.ERROR
+    ]
+    assert len(diagnostics) == len(error_parts)
+    for diagnostic, (index, part) in zip(diagnostics, error_parts):
+        assert diagnostic.message == part.message
+        assert (diagnostic.start, diagnostic.end) == part.span
+        assert diagnostic.paragraph == (index if isinstance(paragraphs, list) else None)
+        assert diagnostic.message.endswith(f": {diagnostic.detail}")
+
+
+@pytest.mark.parametrize("paragraphs, context, kwargs, expected", TEST_PARSE_DATA)
+def test_validate(
+    paragraphs: t.Union[str, t.List[str]],
+    context: Context,
+    kwargs: t.Dict[str, t.Any],
+    expected: t.List[dom.Paragraph],
+) -> None:
+    kwargs = {
+        key: value
+        for key, value in kwargs.items()
+        if key not in ("errors", "add_source")
+    }
+    for strict in (False, True):
+        kwargs["strict"] = strict
+        diagnostics: t.List[Diagnostic] = []
+        parse(paragraphs, context, errors="collect", diagnostics=diagnostics, **kwargs)
+        assert validate(paragraphs, context, **kwargs) == diagnostics
+
+
+def test_diagnostic() -> None:
+    diagnostics: t.List[Diagnostic] = []
+    text = "  M(foo) P(a.b.c#b m) O(a.b.c#role:x) L(a"
+    assert parse(
+        ["I(x)", text], Context(), errors="collect", diagnostics=diagnostics
+    ) == [
+        [dom.ItalicPart(text="x")],
+        [dom.TextPart(text="  ")] + [dom.TextPart(text=" ")] * 3,
+    ]
+    assert [
+        (diagnostic.command, diagnostic.paragraph, diagnostic.code)
+        for diagnostic in diagnostics
+    ] == [
+        ("M", 1, DiagnosticCode.INVALID_FQCN),
+        ("P", 1, DiagnosticCode.INVALID_PLUGIN_TYPE),
+        ("O", 1, DiagnosticCode.MISSING_ENTRYPOINT),
+        ("L", 1, DiagnosticCode.MISSING_COMMA),
+    ]
+    diagnostic = diagnostics[0]
+    assert (diagnostic.start, diagnostic.end) == (2, 8)
+    assert diagnostic.source == "M(foo)"
+    assert diagnostic.detail == 'Module name "foo" is not a FQCN'
+    assert diagnostic.message == (
+        'While parsing "M(foo)" at index 3 of paragraph 2:'
+        ' Module name "foo" is not a FQCN'
+    )
+    assert diagnostic == diagnostics[0]
+    assert diagnostic != diagnostics[1]
+    assert hash(diagnostic) == hash(diagnostics[0])
+    assert repr(diagnostic) == (
+        "Diagnostic(command='M', paragraph=1, start=2, end=8,"
+        " code=DiagnosticCode.INVALID_FQCN, message="
+        '\'While parsing "M(foo)" at index 3 of paragraph 2:'
+        ' Module name "foo" is not a FQCN\')'
+    )
+
+    diagnostics = []
+    assert list(
+        iter_paragraph(
+            " P(foo) V(C\\x)",
+            Context(),
+            errors="collect",
+            strict=True,
+            helpful_errors=False,
+            whitespace=Whitespace.STRIP,
+            diagnostics=diagnostics,
+        )
+    ) == [dom.TextPart(text=" "), dom.TextPart(text=")")]
+    assert [
+        (diagnostic.code, diagnostic.start, diagnostic.message)
+        for diagnostic in diagnostics
+    ] == [
+        (
+            DiagnosticCode.INVALID_PLUGIN_REFERENCE,
+            1,
+            'While parsing P() at index 2: Parameter "foo" is not of the form'
+            " FQCN#type",
+        ),
+        (
+            DiagnosticCode.UNNECESSARY_ESCAPE,
+            8,
+            'While parsing V() at index 9: Unnecessarily escaped "x"',
+        ),
+    ]
+
+    diagnostics = []
+    paragraphs = iter_parse(
+        ["O(a:b)", "M(c)"], Context(), errors="collect", diagnostics=diagnostics
+    )
+    assert [list(paragraph) for paragraph in paragraphs] == [[], []]
+    assert [(diagnostic.paragraph, diagnostic.code) for diagnostic in diagnostics] == [
+        (0, DiagnosticCode.INVALID_NAME),
+        (1, DiagnosticCode.INVALID_FQCN),
+    ]
+
+
+def test_diagnostic_position() -> None:
+    text = "  \nfoo M(a.b.c)\n  P(foo)\nO(\na:b) C(x"
+    for whitespace in (
+        Whitespace.IGNORE,
+        Whitespace.STRIP,
+        Whitespace.KEEP_SINGLE_NEWLINES,
+    ):
+        diagnostics: t.List[Diagnostic] = []
+        parse(
+            [text, "M(foo)"],
+            Context(),
+            errors="collect",
+            diagnostics=diagnostics,
+            whitespace=whitespace,
+        )
+        assert validate([text, "M(foo)"], Context(), whitespace=whitespace) == (
+            diagnostics
+        )
+        for result in (diagnostics, validate([text, "M(foo)"], Context())):
+            assert [
+                (diagnostic.paragraph, diagnostic.position, diagnostic.end_position)
+                for diagnostic in result
+            ] == [
+                (0, Position(2, 2), Position(2, 8)),
+                (0, Position(3, 0), Position(4, 4)),
+                (0, Position(4, 5), Position(4, 8)),
+                (1, Position(0, 0), Position(0, 6)),
+            ]
+
+    diagnostics = []
+    parse("M(foo)", Context(), errors="collect", diagnostics=diagnostics)
+    assert diagnostics[0].position == Position(line=0, column=0)
+    with pytest.raises(ValueError) as exc:
+        parse("M(foo)", Context(), errors="exception")
+    assert str(exc.value) == (
+        'While parsing "M(foo)" at index 1: Module name "foo" is not a FQCN'
+    )
+
+
+def test_error_message() -> None:
+    expected = (
+        'While parsing "M(foo)" at index 1 of paragraph 2:'
+        ' Module name "foo" is not a FQCN'
+    )
+    paragraph = parse(["", "M(foo) bar"], Context())[1]
+    part = paragraph[0]
+    assert type(part.message) is str
+    assert part == dom.ErrorPart(message=expected)
+    assert json.dumps(part.message) == json.dumps(expected)
+    unpickled = pickle.loads(pickle.dumps(part))
+    assert unpickled == part
+
+    # Error parts can be stored in compact paragraphs
+    compact = CompactParagraph(paragraph)
+    assert compact == CompactParagraph([part, dom.TextPart(text=" bar")])
+    assert json.dumps([part.message for part in compact[:1]]) == json.dumps([expected])
+
+    with pytest.raises(ValueError) as exc:
+        parse(["", "M(foo)"], Context(), errors="exception")
+    assert exc.value.args == (expected,)
+
+    # Without where, the paragraph index determines the location
+    result = Parser([_FailingCommand()]).parse_string(
+        "F(x)", Context(), paragraph_index=2
+    )
+    assert result[0].message == (
+        'While parsing "F(x)" at index 1 of paragraph 3: Cannot handle x'
+    )
+    result = Parser([_FailingCommand()]).parse_string(
+        "F(x)", Context(), where="", paragraph_index=2
+    )
+    assert result[0].message == 'While parsing "F(x)" at index 1: Cannot handle x'
+
+
+class _FailingCommand(CommandParser):
+    def __init__(self):
+        super().__init__("F", 1, escaped_arguments=True)
+
+    def parse(
+        self,
+        parameters: t.List[str],
+        context: Context,
+        source: t.Optional[str],
+        whitespace: Whitespace,
+    ) -> dom.AnyPart:
+        raise RuntimeError(f"Cannot handle {parameters[0]}")
+
+
+def test_diagnostic_other() -> None:
+    diagnostics: t.List[Diagnostic] = []
+    parser = Parser([_FailingCommand()])
+    result = parser.parse_string(
+        "F(x)", Context(), errors="collect", diagnostics=diagnostics
+    )
+    assert result == []
+    assert diagnostics[0].code == DiagnosticCode.OTHER
+    assert diagnostics[0].command == "F"
+    assert diagnostics[0].message == 'While parsing "F(x)" at index 1: Cannot handle x'
+
+
+def test_collect_unsupported() -> None:
+    with pytest.raises(ValueError) as exc:
+        parse("M(foo)", Context(), errors="collect")
+    assert str(exc.value) == 'errors="collect" needs a diagnostics list'
+    with pytest.raises(ValueError) as exc:
+        parse("M(foo)", Context(), errors="collect", diagnostics=[], cache=ParseCache())
+    assert str(exc.value) == 'A cache cannot be used with errors="collect"'
+    with pytest.raises(ValueError) as exc:
+        parse_many([("M(foo)", Context())], errors="collect")
+    assert str(exc.value) == 'parse_many() does not support errors="collect"'
+    with pytest.raises(ValueError) as exc:
+        parse_unbound("M(foo)", errors="collect")
+    assert str(exc.value) == 'parse_unbound() does not support errors="collect"'
+    with pytest.raises(ValueError) as exc:
+        reparse_paragraph([], "", 0, 0, "M(foo)", Context(), errors="collect")
+    assert str(exc.value) == 'reparse_paragraph() does not support errors="collect"'
+
+
+def test_validate_custom_command() -> None:
+    parser = Parser([_FailingCommand()])
+    assert validate_string(parser, "foo", Context()) == []
+    diagnostics = validate_string(parser, "a F(x) F(y", Context(), where=" here")
+    result = [(diagnostic.code, diagnostic.message) for diagnostic in diagnostics]
+    assert result == [
+        (DiagnosticCode.OTHER, 'While parsing "F(x)" at index 3 here: Cannot handle x'),
+        (
+            DiagnosticCode.MISSING_CLOSING_PARENTHESIS,
+            'While parsing "F(y" at index 8 here:'
+            ' Cannot find closing ")" after last parameter',
+        ),
+    ]
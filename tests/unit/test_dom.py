@@ -5,6 +5,7 @@
 # SPDX-FileCopyrightText: 2023, Ansible Project
 
 import typing as t
+from unittest import mock
 
 import pytest
 
@@ -133,6 +134,55 @@ def test_walk(data: dom.Paragraph) -> None:
     dom.walk(data, walker)
 
 
+def test_walk_many() -> None:
+    walker = _TestWalker()
+    dom.walk_many(TEST_WALKER, walker)
+    assert walker.result == [part for paragraph in TEST_WALKER for part in paragraph]
+
+    walker = _TestWalker()
+    dom.walk_many(iter([iter(paragraph) for paragraph in TEST_WALKER]), walker)
+    assert walker.result == [part for paragraph in TEST_WALKER for part in paragraph]
+
+
+class _TextWalker(dom.NoopWalker):
+    def __init__(self):
+        self.result: t.List[str] = []
+
+    def process_text(self, part: dom.TextPart) -> None:
+        self.result.append(part.text)
+
+
+class _UpperTextWalker(_TextWalker):
+    def process_text(self, part: dom.TextPart) -> None:
+        self.result.append(part.text.upper())
+
+
+def test_walk_subclass() -> None:
+    paragraph: dom.Paragraph = [dom.TextPart(text="a"), dom.BoldPart(text="b")]
+    walker = _TextWalker()
+    dom.walk(paragraph, walker)
+    upper_walker = _UpperTextWalker()
+    dom.walk(paragraph, upper_walker)
+    dom.walk(paragraph, walker)
+    assert walker.result == ["a", "a"]
+    assert upper_walker.result == ["A"]
+
+
+def test_walk_patched_methods() -> None:
+    paragraph: dom.Paragraph = [dom.TextPart(text="a"), dom.BoldPart(text="b")]
+    walker = _TextWalker()
+    dom.walk(paragraph, walker)
+    with mock.patch.object(_TextWalker, "process_text") as process_text:
+        dom.walk(paragraph, walker)
+    process_text.assert_called_once_with(dom.TextPart(text="a"))
+
+    bold: t.List[str] = []
+    walker.process_bold = lambda part: bold.append(part.text)  # type: ignore
+    dom.walk_many([paragraph, paragraph], walker)
+    assert walker.result == ["a", "a", "a"]
+    assert bold == ["b", "b"]
+
+
 def test_internal_error() -> None:
     class FakePart(t.NamedTuple):
         type: int = 23
@@ -140,3 +190,13 @@ def test_internal_error() -> None:
     with pytest.raises(RuntimeError) as exc:
         dom.walk([FakePart()], dom.NoopWalker())
     assert str(exc.value) == "Internal error: unknown type 23"
+    with pytest.raises(RuntimeError) as exc:
+        dom.walk_many([[], [FakePart()]], dom.NoopWalker())
+    assert str(exc.value) == "Internal error: unknown type 23"
+
+
+def test_get_source() -> None:
+    text = "foo I(bar)"
+    assert dom.get_source(dom.ItalicPart(text="bar", span=(4, 10)), text) == "I(bar)"
+    assert dom.get_source(dom.ItalicPart(text="bar", source="I(bar)"), "") == "I(bar)"
+    assert dom.get_source(dom.ItalicPart(text="bar"), text) is None
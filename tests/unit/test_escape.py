@@ -0,0 +1,83 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+import re
+from html import escape
+from urllib.parse import quote
+
+import pytest
+
+from antsibull_docs_parser import _escape
+
+_REFERENCE_MD_ESCAPE = re.compile(r"""([!"#$%&'()*+,:;<=>?@[\\\]^_`{|}~.-])""")
+
+
+def _reference_rst_escape(value: str) -> str:
+    value = value.replace("\\", "\\\\")
+    for character in "<>_*`|-":
+        value = value.replace(character, f"\\{character}")
+    return value
+
+
+def _reference_url_escape(url: str) -> str:
+    return quote(url, safe=":/#?!*'();@&=+$,")
+
+
+TEXTS = [
+    "",
+    "foo",
+    "community.general.foo_bar",
+    "  foo  ",
+    "The quick brown fox jumps over the lazy dog",
+    "".join(chr(index) for index in range(128)),
+    "&lt;&amp;&gt;&quot;&#x27;",
+    "<a href=\"a&b\">'x'</a>",
+    "\\<_>`*<_>*`\\|-",
+    "https://docs.ansible.com/ansible/latest/index.html#foo",
+    "https://example.com/a b/%20/ä?x=[1]&y={2}",
+    "Café au lait, s'il vous plaît.\n  Merci beaucoup !",
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_escape(text: str) -> None:
+    html = escape(text).replace("&quot;", '"')
+    md = _REFERENCE_MD_ESCAPE.sub(r"\\\1", text)
+    rst = _reference_rst_escape(text)
+    url = _reference_url_escape(text)
+    assert _escape.html_escape(text) == html
+    assert _escape.html_attribute_escape(text) == escape(text)
+    assert _escape.md_escape(text) == md
+    assert _escape.rst_escape_characters(text) == rst
+    assert _escape.url_escape(text) == url
+    for _ in range(2):
+        assert _escape.html_escape_name(text) == html
+        assert _escape.md_escape_name(text) == md
+        assert _escape.rst_escape_name(text) == rst
+        assert _escape.html_escape_url(text) == escape(url)
+        assert _escape.md_escape_url(text) == _REFERENCE_MD_ESCAPE.sub(r"\\\1", url)
+        assert _escape.rst_escape_url(text) == url
+
+
+def test_escape_unchanged() -> None:
+    text = "".join(["foo ", "bar"])
+    assert _escape.html_escape(text) is text
+    assert _escape.html_attribute_escape(text) is text
+    assert _escape.md_escape(text) is text
+    assert _escape.rst_escape_characters(text) is text
+    assert _escape.url_escape("https://example.com/foo") == "https://example.com/foo"
+
+
+def test_memos() -> None:
+    _escape.clear_memos()
+    info = _escape.md_escape_name.cache_info()
+    assert info.maxsize == _escape.MEMO_SIZE
+    assert info.currsize == 0
+    for index in range(_escape.MEMO_SIZE + 10):
+        _escape.md_escape_name(f"foo.bar.baz{index}")
+    assert _escape.md_escape_name.cache_info().currsize == _escape.MEMO_SIZE
+    _escape.clear_memos()
+    assert _escape.md_escape_name.cache_info().currsize == 0
@@ -4,10 +4,22 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # SPDX-FileCopyrightText: 2023, Ansible Project
 
+import io
 import typing as t
 
+import pytest
+
 from antsibull_docs_parser import dom
-from antsibull_docs_parser.format import Formatter, format_paragraphs
+from antsibull_docs_parser.format import (
+    FormatSpec,
+    Formatter,
+    LinkProvider,
+    compile_formatter,
+    format_paragraphs,
+    format_paragraphs_stream,
+    format_paragraphs_utf8,
+    render_multi,
+)
 
 
 class _TestFormatter(Formatter):
@@ -68,3 +80,271 @@ def test_format_paragraphs():
         )
         == "format_horizontal_lineformat_text"
     )
+
+
+def test_format_paragraphs_iterators():
+    assert (
+        format_paragraphs(
+            iter(
+                [
+                    iter([dom.HorizontalLinePart(), dom.TextPart(text="foo")]),
+                    iter([]),
+                ]
+            ),
+            formatter=_TestFormatter(),
+            par_sep="|",
+            par_empty="empty",
+        )
+        == "format_horizontal_lineformat_text|empty"
+    )
+
+
+def test_format_paragraphs_utf8():
+    paragraphs = [
+        [dom.HorizontalLinePart(), dom.TextPart(text="foo")],
+        [],
+        [dom.TextPart(text="bar")],
+    ]
+    options: t.Dict[str, t.Any] = dict(
+        formatter=_TestFormatter(), par_start="«", par_sep="|", par_empty="∅"
+    )
+    expected = format_paragraphs(paragraphs, **options).encode("utf-8")
+
+    destination = bytearray(b"prefix")
+    assert format_paragraphs_utf8(paragraphs, destination, **options) == len(expected)
+    assert destination == b"prefix" + expected
+
+    stream = io.BytesIO()
+    assert format_paragraphs_utf8(
+        iter(paragraphs), stream, postprocess_paragraph=str.upper, **options
+    ) == len(expected)
+    assert stream.getvalue() == format_paragraphs(
+        paragraphs, postprocess_paragraph=str.upper, **options
+    ).encode("utf-8")
+
+
+def test_format_paragraphs_stream():
+    paragraphs = [
+        [dom.HorizontalLinePart(), dom.TextPart(text="foo")],
+        [],
+        [dom.TextPart(text="bar")],
+    ]
+    options: t.Dict[str, t.Any] = dict(
+        formatter=_TestFormatter(), par_start="«", par_sep="|", par_empty="∅"
+    )
+    expected = format_paragraphs(paragraphs, **options)
+
+    chunks: t.List[str] = []
+    assert format_paragraphs_stream(paragraphs, chunks.append, **options) == len(
+        expected
+    )
+    assert chunks == [
+        "«",
+        "format_horizontal_line",
+        "format_text",
+        "|",
+        "«",
+        "∅",
+        "|",
+        "«",
+        "format_text",
+    ]
+
+    stream = io.StringIO()
+    assert format_paragraphs_stream(
+        iter(paragraphs), stream, postprocess_paragraph=str.upper, **options
+    ) == len(expected)
+    assert stream.getvalue() == format_paragraphs(
+        paragraphs, postprocess_paragraph=str.upper, **options
+    )
+
+
+class _TestLinkProvider(LinkProvider):
+    def plugin_link(self, plugin: dom.PluginIdentifier) -> t.Optional[str]:
+        return f"{plugin.fqcn}#{plugin.type}"
+
+    def plugin_option_like_link(
+        self,
+        plugin: dom.PluginIdentifier,
+        entrypoint: t.Optional[str],
+        what: "t.Literal['option'] | t.Literal['retval']",
+        name: t.List[str],
+        current_plugin: bool,
+    ) -> t.Optional[str]:
+        return f"{plugin.fqcn}#{plugin.type}:{what}:{'.'.join(name)}:{current_plugin}"
+
+
+class _LinkFormatter(_TestFormatter):
+    def format_module(self, part: dom.ModulePart, url: t.Optional[str]) -> str:
+        return f"[{part.fqcn}]({url})"
+
+    def format_option_name(self, part: dom.OptionNamePart, url: t.Optional[str]) -> str:
+        return f"[{part.name}]({url})"
+
+    def format_plugin(self, part: dom.PluginPart, url: t.Optional[str]) -> str:
+        return f"[{part.plugin.fqcn}]({url})"
+
+    def format_return_value(
+        self, part: dom.ReturnValuePart, url: t.Optional[str]
+    ) -> str:
+        return f"[{part.name}]({url})"
+
+
+def test_compile_formatter() -> None:
+    current_plugin = dom.PluginIdentifier(fqcn="a.b.c", type="role")
+    paragraphs: t.List[dom.Paragraph] = [
+        [
+            dom.ModulePart(fqcn="a.b.c"),
+            dom.PluginPart(plugin=dom.PluginIdentifier(fqcn="a.b.d", type="lookup")),
+            dom.OptionNamePart(
+                plugin=current_plugin,
+                entrypoint="main",
+                link=["x", "y"],
+                name="x.y",
+                value=None,
+            ),
+            dom.OptionNamePart(
+                plugin=None, entrypoint=None, link=["x"], name="x", value=None
+            ),
+            dom.ReturnValuePart(
+                plugin=dom.PluginIdentifier(fqcn="a.b.d", type="module"),
+                entrypoint=None,
+                link=["z"],
+                name="z",
+                value="1",
+            ),
+        ],
+        [],
+        [dom.TextPart(text="foo"), dom.BoldPart(text="bar")],
+    ]
+    options: t.Dict[str, t.Any] = dict(par_start="<", par_end=">", par_empty="-")
+    for formatter, link_provider in [
+        (_TestFormatter(), None),
+        (_LinkFormatter(), None),
+        (_LinkFormatter(), _TestLinkProvider()),
+    ]:
+        expected = format_paragraphs(
+            paragraphs,
+            formatter,
+            link_provider,
+            current_plugin=current_plugin,
+            **options,
+        )
+        compiled = compile_formatter(formatter, link_provider, current_plugin)
+        assert compiled.format_paragraphs(paragraphs, **options) == expected
+        assert format_paragraphs(paragraphs, compiled, **options) == expected
+        assert compiled.format_paragraph(paragraphs[0]) + compiled.format_part(
+            paragraphs[2][0]
+        ) == format_paragraphs(
+            [paragraphs[0] + paragraphs[2][:1]],
+            formatter,
+            link_provider,
+            current_plugin=current_plugin,
+        )
+    assert set(compiled.format_functions) == set(dom.PartType)
+    assert compiled.format_functions[dom.PartType.MODULE](paragraphs[0][0]) == (
+        "[a.b.c](a.b.c#module)"
+    )
+    assert compiled.format_paragraph(paragraphs[0]) == (
+        "[a.b.c](a.b.c#module)[a.b.d](a.b.d#lookup)[x.y](a.b.c#role:option:x.y:True)"
+        "[x](None)[z](a.b.d#module:retval:z:False)"
+    )
+    assert compiled.format_paragraphs(
+        iter(paragraphs), postprocess_paragraph=str.upper
+    ) == format_paragraphs(
+        paragraphs,
+        _LinkFormatter(),
+        _TestLinkProvider(),
+        current_plugin=current_plugin,
+        postprocess_paragraph=str.upper,
+    )
+
+    with pytest.raises(ValueError) as exc:
+        format_paragraphs(paragraphs, compiled, _TestLinkProvider())
+    assert str(exc.value) == (
+        "link_provider and current_plugin cannot be used with a compiled formatter"
+    )
+    with pytest.raises(ValueError) as exc:
+        format_paragraphs_utf8(
+            paragraphs, bytearray(), compiled, current_plugin=current_plugin
+        )
+    assert str(exc.value) == (
+        "link_provider and current_plugin cannot be used with a compiled formatter"
+    )
+
+
+class _CountingLinkProvider(_TestLinkProvider):
+    def __init__(self):
+        self.calls = 0
+
+    def plugin_link(self, plugin: dom.PluginIdentifier) -> t.Optional[str]:
+        self.calls += 1
+        return super().plugin_link(plugin)
+
+    def plugin_option_like_link(self, *args, **kwargs) -> t.Optional[str]:
+        self.calls += 1
+        return super().plugin_option_like_link(*args, **kwargs)
+
+
+def test_render_multi() -> None:
+    current_plugin = dom.PluginIdentifier(fqcn="a.b.c", type="module")
+    paragraphs: t.List[dom.Paragraph] = [
+        [
+            dom.TextPart(text="foo "),
+            dom.ModulePart(fqcn="a.b.c"),
+            dom.OptionNamePart(
+                plugin=current_plugin, entrypoint=None, link=["x"], name="x", value=None
+            ),
+        ],
+        [],
+        [dom.PluginPart(plugin=dom.PluginIdentifier(fqcn="a.b.d", type="lookup"))],
+    ]
+    formats = {
+        "test": FormatSpec(_TestFormatter(), par_sep="|", par_empty="-"),
+        "link": FormatSpec(
+            _LinkFormatter(),
+            par_start="<",
+            par_end=">",
+            postprocess_paragraph=str.upper,
+        ),
+    }
+    link_provider = _CountingLinkProvider()
+    result = render_multi(paragraphs, formats, link_provider, current_plugin)
+    assert link_provider.calls == 3
+    assert result == {
+        name: format_paragraphs(
+            paragraphs,
+            spec.formatter,
+            _TestLinkProvider(),
+            par_start=spec.par_start,
+            par_end=spec.par_end,
+            par_sep=spec.par_sep,
+            par_empty=spec.par_empty,
+            current_plugin=current_plugin,
+            postprocess_paragraph=spec.postprocess_paragraph,
+        )
+        for name, spec in formats.items()
+    }
+    assert result["link"] == (
+        "<FORMAT_TEXT[A.B.C](A.B.C#MODULE)[X](A.B.C#MODULE:OPTION:X:TRUE)><><"
+        "[A.B.D](A.B.D#LOOKUP)>"
+    )
+    assert render_multi(paragraphs, {}) == {}
+    assert render_multi([], formats) == {"test": "", "link": ""}
+
+    class FakePart(t.NamedTuple):
+        type: int = 23
+
+    with pytest.raises(RuntimeError) as exc:
+        render_multi([[FakePart()]], formats)  # type: ignore
+    assert str(exc.value) == "Internal error: unknown type 23"
+
+
+def test_compile_formatter_internal_error() -> None:
+    class FakePart(t.NamedTuple):
+        type: int = 23
+
+    compiled = compile_formatter(_TestFormatter())
+    with pytest.raises(RuntimeError) as exc:
+        compiled.format_paragraph([FakePart()])  # type: ignore
+    assert str(exc.value) == "Internal error: unknown type 23"
@@ -0,0 +1,93 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+from concurrent.futures import ThreadPoolExecutor
+
+from antsibull_docs_parser import dom
+from antsibull_docs_parser.batch import parse_many
+from antsibull_docs_parser.cache import ParseCache
+from antsibull_docs_parser.interning import InternStatistics, InternTable
+from antsibull_docs_parser.parser import Context, parse
+
+TEXTS = [
+    "M(foo.bar.baz) P(foo.bar.baz#module)",
+    "O(foo.bar.baz#module:bam) RV(foo.bar.baz#module:bam=1)",
+    "O(foo.bar.baz#role:main:bam) RV(foo.bar.baz#role:main:bam)",
+    "O(ignore:bam) O(bam)",
+]
+
+
+def test_intern_table() -> None:
+    table = InternTable()
+    assert table.statistics == InternStatistics(
+        strings=0, plugins=0, lookups=0, bytes_saved=0
+    )
+    context = Context(
+        current_plugin=dom.PluginIdentifier(fqcn="a.b.c", type="role"),
+        role_entrypoint="main",
+    )
+    results = [parse(text, context, intern_table=table) for text in TEXTS]
+    assert results == [parse(text, context) for text in TEXTS]
+
+    module = results[0][0][0]
+    plugin = results[0][0][2]
+    option = results[1][0][0]
+    return_value = results[1][0][2]
+    role_option = results[2][0][0]
+    role_return_value = results[2][0][2]
+    assert module.fqcn is plugin.plugin.fqcn
+    assert plugin.plugin is option.plugin
+    assert option.plugin is return_value.plugin
+    assert role_option.plugin is role_return_value.plugin
+    assert role_option.plugin.fqcn is module.fqcn
+    assert role_option.entrypoint is role_return_value.entrypoint
+    assert results[3][0][0].plugin is None
+    assert results[3][0][2].plugin == context.current_plugin
+    assert results[3][0][2].plugin.type is role_option.plugin.type
+
+    stats = table.statistics
+    assert stats.strings == 5
+    assert stats.plugins == 3
+    assert stats.bytes_saved > 0
+
+    table.clear()
+    assert table.statistics[:3] == (0, 0, stats.lookups)
+
+
+def test_intern_table_objects() -> None:
+    table = InternTable()
+    fqcn = "foo.bar.baz"
+    plugin = dom.PluginIdentifier(fqcn="".join(["foo.", "bar.baz"]), type="module")
+    assert table.intern_string(fqcn) is fqcn
+    interned = table.intern_plugin(plugin)
+    assert interned == plugin
+    assert interned is not plugin
+    assert interned.fqcn is fqcn
+    assert table.intern_plugin(interned) is interned
+    assert table.intern_plugin(plugin) is interned
+
+    part = dom.TextPart(text=fqcn)
+    assert table.intern_part(part) is part
+
+
+def test_intern_table_cache_parse_many() -> None:
+    context = Context()
+    table = InternTable()
+    cache = ParseCache()
+    first = parse(TEXTS[1], context, cache=cache, intern_table=table)
+    second = parse(TEXTS[1], context, cache=cache, intern_table=table)
+    assert cache.statistics.hits == 1
+    assert first == second
+    assert first[0][0].plugin is second[0][0].plugin
+
+    items = [(text, context) for text in TEXTS[:2]] * 3
+    expected = parse_many(items)
+    for executor in (None, ThreadPoolExecutor(max_workers=2)):
+        table = InternTable()
+        result = parse_many(items, executor=executor, chunk_size=1, intern_table=table)
+        assert result == expected
+        assert result[1][0][0].plugin is result[5][0][2].plugin
+        assert result[0][0][0].fqcn is result[3][0][0].plugin.fqcn
@@ -0,0 +1,28 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+import pytest
+
+from antsibull_docs_parser.lines import LineIndex, Position
+
+TEST_TEXTS = ["", "foo", "\n", "foo\nbar", "foo\n\nbar\n", "\r\na\nbc\r\n\n"]
+
+
+def _position(text: str, index: int) -> Position:
+    line = text.count("\n", 0, index)
+    return Position(line=line, column=index - (text.rfind("\n", 0, index) + 1))
+
+
+@pytest.mark.parametrize("text", TEST_TEXTS)
+def test_line_index(text: str) -> None:
+    index = LineIndex(text)
+    assert index.line_count == text.count("\n") + 1
+    for position in range(len(text) + 1):
+        assert index.position(position) == _position(text, position)
+    for position in (-1, len(text) + 1):
+        with pytest.raises(IndexError) as exc:
+            index.position(position)
+        assert str(exc.value) == f"Index {position} is outside of the text"
@@ -4,8 +4,17 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # SPDX-FileCopyrightText: 2023, Ansible Project
 
+import random
+
+import pytest
+
 from antsibull_docs_parser import dom
-from antsibull_docs_parser.md import md_escape, postprocess_md_paragraph, to_md
+from antsibull_docs_parser.md import (
+    _emit_paragraph,
+    md_escape,
+    postprocess_md_paragraph,
+    to_md,
+)
 
 
 def test_md_escape():
@@ -22,6 +31,30 @@ def test_postprocess_md_paragraph():
     assert postprocess_md_paragraph(" \n foo \n\r\n \n\tbar \n ") == "foo\nbar"
 
 
+EMIT_PARAGRAPH_DATA = [
+    "",
+    "  ",
+    " foo  bar ",
+    " \n foo \n\r\n \n\tbar \n ",
+    "a\tb",
+    "\xa0a\xa0",
+    "a\x1cb\u2028 c\x85",
+]
+
+
+@pytest.mark.parametrize("par", EMIT_PARAGRAPH_DATA)
+def test_emit_paragraph(par: str) -> None:
+    assert _emit_paragraph(par) == postprocess_md_paragraph(par)
+
+
+def test_emit_paragraph_random() -> None:
+    rng = random.Random(42)
+    alphabet = ["a", " ", "\t", "\n", "\r\n", "\xa0", "\x0c", "b c"]
+    for _ in range(5000):
+        par = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12)))
+        assert _emit_paragraph(par) == postprocess_md_paragraph(par), repr(par)
+
+
 def test_to_md():
     assert to_md([]) == ""
     assert to_md([[dom.TextPart(text="test")]]) == "test"
@@ -4,18 +4,41 @@
 # SPDX-FileCopyrightText: 2022, Ansible Project
 
 import typing as t
+from concurrent.futures import ProcessPoolExecutor
 
 import pytest
 
 from antsibull_docs_parser import dom
+from antsibull_docs_parser import parser as _parser
+from antsibull_docs_parser.batch import parse_many
+from antsibull_docs_parser.diagnostics import DiagnosticCode
 from antsibull_docs_parser.parser import (
+    _COMMANDS,
+    CommandError,
     CommandParser,
+    CommandParserEx,
     Context,
     Parser,
     Whitespace,
     _process_whitespace,
+    classify,
+    iter_paragraph,
+    iter_parse,
     parse,
 )
+from antsibull_docs_parser.unbound import bind_context, parse_unbound
+
+ENGINES = ["state-machine", "regex"]
+
+
+def use_engine(monkeypatch, engine: str) -> None:
+    monkeypatch.setattr(
+        _parser,
+        "_CLASSIC",
+        Parser([cmd for cmd in _COMMANDS if cmd.old_markup], engine=engine),
+    )
+    monkeypatch.setattr(_parser, "_SEMANTIC_MARKUP", Parser(_COMMANDS, engine=engine))
+
 
 PROCESS_WHITESPACE_DATA: t.List[t.Tuple[str, bool, bool, str, str]] = [
     (
@@ -741,18 +764,44 @@ TEST_PARSE_DATA: t.List[
 ]
 
 
+@pytest.mark.parametrize("engine", ENGINES)
 @pytest.mark.parametrize("paragraphs, context, kwargs, expected", TEST_PARSE_DATA)
 def test_parse(
     paragraphs: t.Union[str, t.List[str]],
     context: Context,
     kwargs: t.Dict[str, t.Any],
     expected: t.List[dom.Paragraph],
+    engine: str,
+    monkeypatch,
 ) -> None:
+    use_engine(monkeypatch, engine)
     result = parse(paragraphs, context, **kwargs)
     print(result)
     assert result == expected
 
 
+@pytest.mark.parametrize("paragraphs, context, kwargs, expected", TEST_PARSE_DATA)
+def test_parse_span(
+    paragraphs: t.Union[str, t.List[str]],
+    context: Context,
+    kwargs: t.Dict[str, t.Any],
+    expected: t.List[dom.Paragraph],
+) -> None:
+    kwargs = {key: value for key, value in kwargs.items() if key != "add_source"}
+    texts = [paragraphs] if isinstance(paragraphs, str) else paragraphs
+    with_source = parse(paragraphs, context, add_source=True, **kwargs)
+    with_span = parse(paragraphs, context, add_span=True, **kwargs)
+    assert len(with_span) == len(with_source)
+    for text, par_source, par_span in zip(texts, with_source, with_span):
+        assert [part._replace(source=None) for part in par_source] == [
+            part._replace(span=None) for part in par_span
+        ]
+        for part_source, part_span in zip(par_source, par_span):
+            assert part_source.span is None
+            assert part_span.source is None
+            assert dom.get_source(part_span, text) == part_source.source
+
+
 TEST_PARSE_THROW_DATA: t.List[
     t.Tuple[t.Union[str, t.List[str]], Context, t.Dict[str, t.Any], str]
 ] = [
@@ -871,6 +920,50 @@ TEST_PARSE_THROW_DATA: t.List[
 ]
 
 
+@pytest.mark.parametrize("paragraphs, context, kwargs, expected", TEST_PARSE_DATA)
+def test_iter_parse(
+    paragraphs: t.Union[str, t.List[str]],
+    context: Context,
+    kwargs: t.Dict[str, t.Any],
+    expected: t.List[dom.Paragraph],
+) -> None:
+    result = [
+        list(paragraph) for paragraph in iter_parse(paragraphs, context, **kwargs)
+    ]
+    assert result == expected
+    if isinstance(paragraphs, list):
+        result = [
+            list(paragraph)
+            for paragraph in iter_parse(iter(paragraphs), context, **kwargs)
+        ]
+        assert result == expected
+    else:
+        assert list(iter_paragraph(paragraphs, context, **kwargs)) == (
+            expected[0] if expected else []
+        )
+
+
+def test_iter_parse_lazy() -> None:
+    paragraphs = iter_parse(["I(foo) M(bar) C(baz)", "B(bam)"], Context())
+    first = next(paragraphs)
+    assert next(first) == dom.ItalicPart(text="foo")
+    second = next(paragraphs)
+    assert list(second) == [dom.BoldPart(text="bam")]
+    assert next(first) == dom.TextPart(text=" ")
+    assert next(first) == dom.ErrorPart(
+        message='While parsing "M(bar)" at index 8 of paragraph 1:'
+        ' Module name "bar" is not a FQCN'
+    )
+    assert list(first) == [dom.TextPart(text=" "), dom.CodePart(text="baz")]
+
+    parts = iter_paragraph("I(foo) M(bar) C(baz)", Context(), errors="exception")
+    assert next(parts) == dom.ItalicPart(text="foo")
+    assert next(parts) == dom.TextPart(text=" ")
+    with pytest.raises(ValueError):
+        next(parts)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
 @pytest.mark.parametrize(
     "paragraphs, context, kwargs, exc_message", TEST_PARSE_THROW_DATA
 )
@@ -879,18 +972,145 @@ def test_parse_bad(
     context: Context,
     kwargs: t.Dict[str, t.Any],
     exc_message: str,
+    engine: str,
+    monkeypatch,
 ) -> None:
+    use_engine(monkeypatch, engine)
     with pytest.raises(ValueError) as exc:
         parse(paragraphs, context, **kwargs)
     assert str(exc.value) == exc_message
 
 
+class _LegacyCommand(CommandParserEx):
+    def __init__(self):
+        super().__init__("X", 1, escaped_arguments=True)
+
+    def parse(
+        self,
+        parameters: t.List[str],
+        context: Context,
+        source: t.Optional[str],
+        whitespace: Whitespace,
+    ) -> dom.AnyPart:
+        if not parameters[0]:
+            raise ValueError("Empty parameter")
+        return dom.TextPart(text=parameters[0], source=source)
+
+
+def test_parse_or_error() -> None:
+    commands = {cmd.command: cmd for cmd in _COMMANDS}
+    context = Context()
+    ws = Whitespace.IGNORE
+    assert commands["M"].parse_or_error(["a.b.c"], context, "M(a.b.c)", ws) == (
+        dom.ModulePart(fqcn="a.b.c", source="M(a.b.c)")
+    )
+    assert commands["I"].parse_or_error(["a"], context, None, ws) == (
+        dom.ItalicPart(text="a")
+    )
+    for command, parameter, code in [
+        ("M", "foo", DiagnosticCode.INVALID_FQCN),
+        ("P", "a.b.c#b m", DiagnosticCode.INVALID_PLUGIN_TYPE),
+        ("O", "a.b.c#role:x", DiagnosticCode.MISSING_ENTRYPOINT),
+        ("RV", "a:b", DiagnosticCode.INVALID_NAME),
+    ]:
+        result = commands[command].parse_or_error([parameter], context, None, ws)
+        assert isinstance(result, CommandError)
+        assert result.code == code
+        # parse() keeps raising ValueError with the same message
+        with pytest.raises(ValueError) as exc:
+            commands[command].parse([parameter], context, None, ws)
+        assert str(exc.value) == result.message
+
+    # Subclasses that only implement parse() keep working
+    legacy = _LegacyCommand()
+    assert legacy.parse_or_error(["a"], context, None, ws) == dom.TextPart(text="a")
+    assert legacy.parse_or_error([""], context, None, ws) == CommandError(
+        DiagnosticCode.OTHER, "Empty parameter"
+    )
+    parser = Parser([legacy])
+    assert parser.parse_string("X(a) X()", context, add_source=True) == [
+        dom.TextPart(text="a", source="X(a)"),
+        dom.TextPart(text=" ", source=" "),
+        dom.ErrorPart(
+            message='While parsing "X()" at index 6: Empty parameter', source="X()"
+        ),
+    ]
+
+
 TEST_TRIVIAL_PARSER = ["", "foo", "I(foo) B(bar) HORIZONTALLINE C(baz)"]
 
 
+@pytest.mark.parametrize("engine", ENGINES)
 @pytest.mark.parametrize("input", TEST_TRIVIAL_PARSER)
-def test_trivial_parser(input: str) -> None:
-    parser = Parser([])
+def test_trivial_parser(input: str, engine: str) -> None:
+    parser = Parser([], engine=engine)
     result = parser.parse_string(input, Context())
     expected = [dom.TextPart(text=input)] if input else []
     assert result == expected
+
+
+def test_unknown_engine() -> None:
+    with pytest.raises(ValueError) as exc:
+        Parser([], engine="foo")  # type: ignore
+    assert str(exc.value) == "Unknown scanner engine 'foo'"
+
+
+TEST_CONTAINS_MARKUP = [
+    ("", False, False),
+    ("foo", False, False),
+    ("foo (bar)", False, False),
+    ("I (foo)", False, False),
+    ("XI(foo)", False, False),
+    ("I(foo)", True, True),
+    ("foo HORIZONTALLINE bar", True, True),
+    ("foo HORIZONTALLINEbar", False, False),
+    ("O(foo)", True, False),
+    ("RV(foo", True, False),
+]
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("text, semantic, classic", TEST_CONTAINS_MARKUP)
+def test_contains_markup(text: str, semantic: bool, classic: bool, engine: str) -> None:
+    assert Parser(_COMMANDS, engine=engine).contains_markup(text) == semantic
+    classic_parser = Parser([cmd for cmd in _COMMANDS if cmd.old_markup], engine=engine)
+    assert classic_parser.contains_markup(text) == classic
+    if not semantic:
+        assert Parser(_COMMANDS, engine=engine).parse_string(text, Context()) == (
+            [dom.TextPart(text=text)] if text else []
+        )
+
+
+def test_classify() -> None:
+    texts = ["foo", ["bar", "I(baz)"], [], "O(foo)", ["(a)", "b"], ""]
+    assert classify(texts) == ([1, 3], [0, 2, 4, 5])
+    assert classify(texts, only_classic_markup=True) == ([1], [0, 2, 3, 4, 5])
+    assert classify([]) == ([], [])
+
+
+def test_parse_bytes() -> None:
+    text = "I(café) O(a.b.c#module:bär=x) M(foo)"
+    expected = parse(text, Context(), add_span=True)
+    for encoded in [
+        text.encode("utf-8"),
+        bytearray(text.encode("utf-8")),
+        memoryview(text.encode("utf-8")),
+    ]:
+        assert parse(encoded, Context(), add_span=True) == expected
+        assert parse([encoded], Context(), add_span=True) == parse(
+            [text], Context(), add_span=True
+        )
+        assert [list(par) for par in iter_parse(encoded, Context())] == parse(
+            text, Context()
+        )
+        assert list(iter_paragraph(encoded, Context())) == parse(text, Context())[0]
+        assert bind_context(parse_unbound(encoded), Context()) == parse(text, Context())
+
+    items = [([memoryview(b"I(foo)"), b"B(bar)"], Context())]
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        assert parse_many(items, executor=executor) == [
+            parse(["I(foo)", "B(bar)"], Context())
+        ]
+
+    with pytest.raises(UnicodeDecodeError):
+        parse(b"I(\xff)", Context(), errors="ignore")
@@ -8,8 +8,10 @@ import typing as t
 import pytest
 
 from antsibull_docs_parser._parser_impl import (
+    _scan_escaped_parameters,
     parse_parameters_escaped,
     parse_parameters_unescaped,
+    scan_parameters_escaped,
 )
 
 ESCAPED_TESTS = [
@@ -36,9 +38,29 @@ ESCAPED_TESTS = [
     ["(c\\a)", 1, 1, True, ["c"], 4, 'Unnecessarily escaped "a"'],
     ["(c\\a,b)", 1, 2, False, ["ca", "b"], 7, None],
     ["(c\\a,b)", 1, 2, True, ["c"], 4, 'Unnecessarily escaped "a"'],
+    ["(a , b ,c) ,d)", 1, 2, False, ["a", "b ,c"], 10, None],
+    ["(a)b,c)", 1, 2, False, ["a)b", "c"], 7, None],
+    ["(a\\\n)", 1, 1, False, ["a\\\n"], 5, None],
+    ["(a\\", 1, 1, False, [""], 3, 'Cannot find closing ")" after last parameter'],
+    ["(a,b\\)c)", 1, 2, False, ["a", "b)c"], 8, None],
+    ["(a\\,b,c)", 1, 2, False, ["a,b", "c"], 8, None],
+    ["(a, b)\\a", 1, 2, True, ["a", "b"], 6, None],
+    [
+        "(a,b",
+        1,
+        3,
+        False,
+        ["a", ""],
+        4,
+        "Cannot find comma separating parameter 2 from the next one",
+    ],
 ]
 
 
+@pytest.mark.parametrize(
+    "parse_function",
+    [parse_parameters_escaped, scan_parameters_escaped, _scan_escaped_parameters],
+)
 @pytest.mark.parametrize(
     "text, index, parameter_count, strict, expected_result, expected_index, expected_error",
     ESCAPED_TESTS,
@@ -51,8 +73,9 @@ def test_parse_parameters_escaped(
     expected_result: t.List[str],
     expected_index: int,
     expected_error: t.Optional[str],
+    parse_function: t.Callable,
 ) -> None:
-    result, end_index, error = parse_parameters_escaped(
+    result, end_index, error = parse_function(
         text, index, parameter_count, strict=strict
     )
     print(result, end_index, error)
@@ -0,0 +1,78 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+import pytest
+
+from antsibull_docs_parser import dom
+from antsibull_docs_parser.parser import Context, Whitespace, parse
+from antsibull_docs_parser.reparse import reparse_paragraph
+
+from .test_parser import ENGINES, use_engine
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_reparse_paragraph(engine: str, monkeypatch) -> None:
+    use_engine(monkeypatch, engine)
+    text = "I(foo) M(bar) C(baz) HORIZONTALLINE  B(bam"
+    paragraph = parse([text], Context(), add_source=True)[0]
+
+    # Edits in the middle keep the other parts, but error positions are updated
+    result = reparse_paragraph(paragraph, text, 1, 1, "(", Context(), paragraph_index=0)
+    new_text = "I((foo) M(bar) C(baz) HORIZONTALLINE  B(bam"
+    assert result == parse([new_text], Context(), add_source=True)[0]
+    assert result[0] == dom.ItalicPart(text="(foo", source="I((foo)")
+    assert result[-1] == dom.ErrorPart(
+        message='While parsing "B(bam" at index 39 of paragraph 1:'
+        ' Cannot find closing ")" after last parameter',
+        source="B(bam",
+    )
+    assert result[2] == dom.ErrorPart(
+        message='While parsing "M(bar)" at index 9 of paragraph 1:'
+        ' Module name "bar" is not a FQCN',
+        source="M(bar)",
+    )
+    assert result[3:7] == paragraph[3:7]
+
+    # Edits that destroy or create markup
+    for start, end, replacement in [(12, 13, ""), (42, 42, ")"), (20, 20, " I(x)")]:
+        new_text = text[:start] + replacement + text[end:]
+        assert (
+            reparse_paragraph(
+                paragraph, text, start, end, replacement, Context(), paragraph_index=0
+            )
+            == parse([new_text], Context(), add_source=True)[0]
+        )
+
+
+def test_reparse_paragraph_fallback() -> None:
+    text = "  foo I(bar) baz  "
+    new_text = " foo I(bar) baz  "
+    for whitespace in Whitespace:
+        paragraph = parse(text, Context(), add_source=True, whitespace=whitespace)[0]
+        assert (
+            reparse_paragraph(
+                paragraph, text, 0, 1, "", Context(), whitespace=whitespace
+            )
+            == parse(new_text, Context(), add_source=True, whitespace=whitespace)[0]
+        )
+
+    # Paragraphs without sources, and ignored errors, need a full parse
+    paragraph = parse(text, Context())[0]
+    assert (
+        reparse_paragraph(paragraph, text, 8, 11, "bam", Context())
+        == parse("  foo I(bam) baz  ", Context(), add_source=True)[0]
+    )
+    paragraph = parse("M(foo) bar", Context(), add_source=True, errors="ignore")[0]
+    assert (
+        reparse_paragraph(
+            paragraph, "M(foo) bar", 2, 5, "a.b.c", Context(), errors="ignore"
+        )
+        == parse("M(a.b.c) bar", Context(), add_source=True)[0]
+    )
+
+    with pytest.raises(ValueError) as exc:
+        reparse_paragraph(paragraph, text, 5, 4, "", Context())
+    assert str(exc.value) == "Invalid edit range 5:4 for text of length 18"
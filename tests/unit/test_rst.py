@@ -4,8 +4,13 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # SPDX-FileCopyrightText: 2023, Ansible Project
 
+import random
+
+import pytest
+
 from antsibull_docs_parser import dom
 from antsibull_docs_parser.rst import (
+    _emit_paragraph,
     postprocess_rst_paragraph,
     rst_escape,
     to_rst,
@@ -35,6 +40,52 @@ def test_postprocess_rst_paragraph():
     assert postprocess_rst_paragraph("\\ \\  \\ \\    \\ \\  ") == ""
 
 
+EMIT_PARAGRAPH_DATA = [
+    "",
+    " \n foo \n\r\n \n\tbar \n ",
+    "\\ foo\\  \\  bar \\  \\ \n\nf\\ oo",
+    "a\\ \\ \\ \\ \\ b",
+    "a\\ \\  \\ \\    \\ \\  ",
+    "\\ :strong:`a`\\ . \\ :literal:`\\  b`\\ , c \\ :ref:`d`\\ \\ `e <f>`__\\ ",
+    "\\ :strong:`ERROR while parsing`\\ : \\  foo\\ ",
+    "a\\\\\\  b \\\\ \\ c\\\\",
+    "x\n\n.. raw:: html\n\n  <hr>\n\ny\n\n------------\n\nz",
+    ".. raw:: html",
+    "  <hr>\n\n.. raw:: html\n\t\n  <hr>\n",
+    "a\xa0\\ \\ \\xa0b\u2028\\ c\tb",
+]
+
+_EMIT_PARAGRAPH_ALPHABET = [
+    "\\ ",
+    "\\",
+    " ",
+    ".",
+    ":`",
+    "`",
+    "a",
+    "\n",
+    "\t",
+    "\xa0",
+    ".. raw:: html",
+    "------------",
+    "  <hr>",
+]
+
+
+@pytest.mark.parametrize("par", EMIT_PARAGRAPH_DATA)
+def test_emit_paragraph(par: str) -> None:
+    assert _emit_paragraph(par) == postprocess_rst_paragraph(par)
+
+
+def test_emit_paragraph_random() -> None:
+    rng = random.Random(42)
+    for _ in range(5000):
+        par = "".join(
+            rng.choice(_EMIT_PARAGRAPH_ALPHABET) for _ in range(rng.randint(1, 20))
+        )
+        assert _emit_paragraph(par) == postprocess_rst_paragraph(par), repr(par)
+
+
 def test_to_rst():
     assert to_rst([]) == ""
     assert to_rst([[dom.TextPart(text="test")]]) == "test"
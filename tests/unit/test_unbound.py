@@ -0,0 +1,104 @@
+# Author: Felix Fontein <felix@fontein.de>
+# GNU General Public License v3.0+ (see LICENSES/GPL-3.0-or-later.txt or
+# https://www.gnu.org/licenses/gpl-3.0.txt)
+# SPDX-License-Identifier: GPL-3.0-or-later
+# SPDX-FileCopyrightText: 2026, Ansible Project
+
+import typing as t
+
+import pytest
+
+from antsibull_docs_parser import dom
+from antsibull_docs_parser.parser import Context, parse
+from antsibull_docs_parser.unbound import bind_context, parse_unbound
+
+from .test_parser import TEST_PARSE_DATA
+
+BIND_CONTEXTS = [
+    Context(),
+    Context(current_plugin=dom.PluginIdentifier(fqcn="foo.bar.baz", type="module")),
+    Context(current_plugin=dom.PluginIdentifier(fqcn="foo.bar.baz", type="role")),
+    Context(
+        current_plugin=dom.PluginIdentifier(fqcn="foo.bar.baz", type="role"),
+        role_entrypoint="main",
+    ),
+]
+
+
+@pytest.mark.parametrize("paragraphs, context, kwargs, expected", TEST_PARSE_DATA)
+def test_bind_context(
+    paragraphs: t.Union[str, t.List[str]],
+    context: Context,
+    kwargs: t.Dict[str, t.Any],
+    expected: t.List[dom.Paragraph],
+) -> None:
+    unbound = parse_unbound(paragraphs, **kwargs)
+    assert bind_context(unbound, context) == expected
+    for other_context in BIND_CONTEXTS:
+        assert bind_context(unbound, other_context) == parse(
+            paragraphs, other_context, **kwargs
+        )
+    for errors in ("ignore", "exception"):
+        kwargs = {**kwargs, "errors": errors}
+        unbound = parse_unbound(paragraphs, **kwargs)
+        for other_context in BIND_CONTEXTS:
+            try:
+                expected = parse(paragraphs, other_context, **kwargs)
+            except ValueError as exc:
+                with pytest.raises(ValueError) as bind_exc:
+                    bind_context(unbound, other_context)
+                assert str(bind_exc.value) == str(exc)
+            else:
+                assert bind_context(unbound, other_context) == expected
+
+
+def test_parse_unbound() -> None:
+    unbound = parse_unbound(["I(foo) O(a.b.c#module:bar) RV(ignore:baz)", "M(a.b.c)"])
+    assert not unbound.depends_on_context
+    assert len(unbound) == 2
+    first = bind_context(unbound, BIND_CONTEXTS[1])
+    second = bind_context(unbound, BIND_CONTEXTS[3])
+    assert first == second
+    assert first[0][2] is second[0][2]
+
+    unbound = parse_unbound("I(foo) O(bar) RV(foo.bar.baz#role:main:baz)")
+    assert unbound.depends_on_context
+    assert bind_context(unbound, BIND_CONTEXTS[2]) == [
+        [
+            dom.ItalicPart(text="foo"),
+            dom.TextPart(text=" "),
+            dom.ErrorPart(
+                message='While parsing "O(bar)" at index 8:'
+                " Role reference is missing entrypoint"
+            ),
+            dom.TextPart(text=" "),
+            dom.ReturnValuePart(
+                plugin=BIND_CONTEXTS[2].current_plugin,
+                entrypoint="main",
+                link=["baz"],
+                name="baz",
+                value=None,
+            ),
+        ]
+    ]
+    assert bind_context(unbound, BIND_CONTEXTS[3])[0][2] == dom.OptionNamePart(
+        plugin=BIND_CONTEXTS[3].current_plugin,
+        entrypoint="main",
+        link=["bar"],
+        name="bar",
+        value=None,
+    )
+
+    # Errors are raised in document order when binding
+    unbound = parse_unbound(["O(bar)", "M(foo)"], errors="exception")
+    with pytest.raises(ValueError) as exc:
+        bind_context(unbound, BIND_CONTEXTS[2])
+    assert str(exc.value) == (
+        'While parsing "O(bar)" at index 1 of paragraph 1:'
+        " Role reference is missing entrypoint"
+    )
+    with pytest.raises(ValueError) as exc:
+        bind_context(unbound, BIND_CONTEXTS[0])
+    assert str(exc.value) == (
+        'While parsing "M(foo)" at index 1 of paragraph 2: Module name "foo" is not a FQCN'
+    )
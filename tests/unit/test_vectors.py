@@ -3,18 +3,53 @@
 # SPDX-License-Identifier: GPL-3.0-or-later
 # SPDX-FileCopyrightText: 2022, Ansible Project
 
+import io
+import random
 import typing as t
 
 import pytest
 import yaml
 
-from antsibull_docs_parser import dom
-from antsibull_docs_parser.ansible_doc_text import to_ansible_doc_text
-from antsibull_docs_parser.format import LinkProvider
-from antsibull_docs_parser.html import to_html, to_html_plain
-from antsibull_docs_parser.md import to_md
-from antsibull_docs_parser.parser import Context, parse
-from antsibull_docs_parser.rst import to_rst, to_rst_plain
+from antsibull_docs_parser import ansible_doc_text, dom, html, md
+from antsibull_docs_parser import parser as _parser
+from antsibull_docs_parser import rst
+from antsibull_docs_parser.ansible_doc_text import (
+    to_ansible_doc_text,
+    to_ansible_doc_text_stream,
+    to_ansible_doc_text_utf8,
+)
+from antsibull_docs_parser.format import (
+    Formatter,
+    LinkProvider,
+    compile_formatter,
+    format_paragraphs,
+    render_multi,
+)
+from antsibull_docs_parser.html import (
+    to_html,
+    to_html_plain,
+    to_html_plain_stream,
+    to_html_plain_utf8,
+    to_html_stream,
+    to_html_utf8,
+)
+from antsibull_docs_parser.md import to_md, to_md_stream, to_md_utf8
+from antsibull_docs_parser.parser import (
+    _COMMANDS,
+    Context,
+    Parser,
+    parse,
+)
+from antsibull_docs_parser.reparse import reparse_paragraph
+from antsibull_docs_parser.rst import (
+    to_rst,
+    to_rst_plain,
+    to_rst_plain_stream,
+    to_rst_plain_utf8,
+    to_rst_stream,
+    to_rst_utf8,
+)
+from antsibull_docs_parser.unbound import bind_context, parse_unbound
 
 from .vectors import (
     VECTORS_FILE,
@@ -41,12 +76,21 @@ def load_yaml_file(path: str) -> t.Any:
 TEST_DATA = sorted(load_yaml_file(VECTORS_FILE)["test_vectors"].items())
 
 
+@pytest.mark.parametrize("engine", ["state-machine", "regex"])
 @pytest.mark.parametrize(
     "test_name, test_data",
     TEST_DATA,
     ids=[test_name for test_name, test_data in TEST_DATA],
 )
-def test_vectors(test_name: str, test_data: t.Mapping[str, t.Any]) -> None:
+def test_vectors(
+    test_name: str, test_data: t.Mapping[str, t.Any], engine: str, monkeypatch
+) -> None:
+    monkeypatch.setattr(
+        _parser,
+        "_CLASSIC",
+        Parser([cmd for cmd in _COMMANDS if cmd.old_markup], engine=engine),
+    )
+    monkeypatch.setattr(_parser, "_SEMANTIC_MARKUP", Parser(_COMMANDS, engine=engine))
     context, parse_opts = get_context_parse_opts(test_data)
     parsed = parse(test_data["source"], context, **parse_opts)
 
@@ -78,3 +122,339 @@ def test_vectors(test_name: str, test_data: t.Mapping[str, t.Any]) -> None:
     if "ansible_doc_text" in test_data:
         result = to_ansible_doc_text(parsed, **ansible_doc_text_opts)
         assert result == test_data["ansible_doc_text"]
+
+
+@pytest.mark.parametrize(
+    "test_name, test_data",
+    TEST_DATA,
+    ids=[test_name for test_name, test_data in TEST_DATA],
+)
+def test_vectors_utf8(test_name: str, test_data: t.Mapping[str, t.Any]) -> None:
+    context, parse_opts = get_context_parse_opts(test_data)
+    source = test_data["source"]
+    if isinstance(source, str):
+        encoded: t.Any = memoryview(source.encode("utf-8"))
+    else:
+        encoded = [par.encode("utf-8") for par in source]
+    parsed = parse(encoded, context, **parse_opts)
+    assert parsed == parse(source, context, **parse_opts)
+
+    ansible_doc_text_opts = get_ansible_doc_text_opts(test_data)
+    html_opts, html_link_provider = get_html_opts_link_provider(test_data)
+    md_opts, md_link_provider = get_md_opts_link_provider(test_data)
+    rst_opts = get_rst_opts(test_data)
+
+    def check(key: str, func: t.Callable[..., int], **kwargs) -> None:
+        if key in test_data:
+            destination = bytearray()
+            expected = test_data[key].encode("utf-8")
+            assert func(parsed, destination, **kwargs) == len(expected)
+            assert destination == expected
+
+    check("html", to_html_utf8, link_provider=html_link_provider, **html_opts)
+    check(
+        "html_plain", to_html_plain_utf8, link_provider=html_link_provider, **html_opts
+    )
+    check("md", to_md_utf8, link_provider=md_link_provider, **md_opts)
+    check("rst", to_rst_utf8, **rst_opts)
+    check("rst_plain", to_rst_plain_utf8, **rst_opts)
+    check("ansible_doc_text", to_ansible_doc_text_utf8, **ansible_doc_text_opts)
+
+
+@pytest.mark.parametrize(
+    "test_name, test_data",
+    TEST_DATA,
+    ids=[test_name for test_name, test_data in TEST_DATA],
+)
+def test_vectors_stream(test_name: str, test_data: t.Mapping[str, t.Any]) -> None:
+    context, parse_opts = get_context_parse_opts(test_data)
+    parsed = parse(test_data["source"], context, **parse_opts)
+
+    ansible_doc_text_opts = get_ansible_doc_text_opts(test_data)
+    html_opts, html_link_provider = get_html_opts_link_provider(test_data)
+    md_opts, md_link_provider = get_md_opts_link_provider(test_data)
+    rst_opts = get_rst_opts(test_data)
+
+    def check(key: str, func: t.Callable[..., int], **kwargs) -> None:
+        if key in test_data:
+            expected = test_data[key]
+            stream = io.StringIO()
+            assert func(parsed, stream, **kwargs) == len(expected)
+            assert stream.getvalue() == expected
+            chunks: t.List[str] = []
+            assert func(iter(parsed), chunks.append, **kwargs) == len(expected)
+            assert "".join(chunks) == expected
+
+    check("html", to_html_stream, link_provider=html_link_provider, **html_opts)
+    check(
+        "html_plain",
+        to_html_plain_stream,
+        link_provider=html_link_provider,
+        **html_opts,
+    )
+    check("md", to_md_stream, link_provider=md_link_provider, **md_opts)
+    check("rst", to_rst_stream, **rst_opts)
+    check("rst_plain", to_rst_plain_stream, **rst_opts)
+    check("ansible_doc_text", to_ansible_doc_text_stream, **ansible_doc_text_opts)
+
+
+@pytest.mark.parametrize(
+    "test_name, test_data",
+    TEST_DATA,
+    ids=[test_name for test_name, test_data in TEST_DATA],
+)
+def test_vectors_compiled(test_name: str, test_data: t.Mapping[str, t.Any]) -> None:
+    context, parse_opts = get_context_parse_opts(test_data)
+    parsed = parse(test_data["source"], context, **parse_opts)
+
+    ansible_doc_text_opts = get_ansible_doc_text_opts(test_data)
+    html_opts, html_link_provider = get_html_opts_link_provider(test_data)
+    md_opts, md_link_provider = get_md_opts_link_provider(test_data)
+    rst_opts = get_rst_opts(test_data)
+
+    def check(
+        key: str,
+        func: t.Callable[..., str],
+        utf8_func: t.Callable[..., int],
+        formatter: t.Any,
+        link_provider: t.Optional[LinkProvider] = None,
+        **kwargs,
+    ) -> None:
+        if key not in test_data:
+            return
+        compiled = compile_formatter(
+            formatter, link_provider, kwargs.pop("current_plugin", None)
+        )
+        assert func(parsed, formatter=compiled, **kwargs) == test_data[key]
+        destination = bytearray()
+        utf8_func(parsed, destination, formatter=compiled, **kwargs)
+        assert destination == test_data[key].encode("utf-8")
+
+    check(
+        "html",
+        to_html,
+        to_html_utf8,
+        html.DEFAULT_ANTSIBULL_FORMATTER,
+        html_link_provider,
+        **html_opts,
+    )
+    check(
+        "html_plain",
+        to_html_plain,
+        to_html_plain_utf8,
+        html.DEFAULT_PLAIN_FORMATTER,
+        html_link_provider,
+        **html_opts,
+    )
+    check("md", to_md, to_md_utf8, md.DEFAULT_FORMATTER, md_link_provider, **md_opts)
+    check("rst", to_rst, to_rst_utf8, rst.DEFAULT_ANTSIBULL_FORMATTER, **rst_opts)
+    check(
+        "rst_plain",
+        to_rst_plain,
+        to_rst_plain_utf8,
+        rst.DEFAULT_PLAIN_FORMATTER,
+        **rst_opts,
+    )
+    check(
+        "ansible_doc_text",
+        to_ansible_doc_text,
+        to_ansible_doc_text_utf8,
+        ansible_doc_text.DEFAULT_ANSIBLE_DOC_FORMATTER,
+        **ansible_doc_text_opts,
+    )
+
+
+@pytest.mark.parametrize(
+    "test_name, test_data",
+    TEST_DATA,
+    ids=[test_name for test_name, test_data in TEST_DATA],
+)
+def test_vectors_render_multi(test_name: str, test_data: t.Mapping[str, t.Any]) -> None:
+    context, parse_opts = get_context_parse_opts(test_data)
+    parsed = parse(test_data["source"], context, **parse_opts)
+
+    html_opts, html_link_provider = get_html_opts_link_provider(test_data)
+    md_opts, md_link_provider = get_md_opts_link_provider(test_data)
+
+    def check(
+        formats: t.Dict[str, t.Any],
+        link_provider: t.Optional[LinkProvider] = None,
+        **kwargs,
+    ) -> None:
+        par_opts = {
+            key: kwargs[key] for key in ("par_start", "par_end") if key in kwargs
+        }
+        formats = {
+            key: spec._replace(**par_opts)
+            for key, spec in formats.items()
+            if key in test_data
+        }
+        result = render_multi(
+            iter(parsed), formats, link_provider, kwargs.get("current_plugin")
+        )
+        assert result == {key: test_data[key] for key in formats}
+
+    check(
+        {"html": html.HTML_FORMAT, "html_plain": html.HTML_PLAIN_FORMAT},
+        html_link_provider,
+        **html_opts,
+    )
+    check({"md": md.MD_FORMAT}, md_link_provider, **md_opts)
+    check(
+        {
+            "rst": rst.RST_FORMAT,
+            "rst_plain": rst.RST_PLAIN_FORMAT,
+            "ansible_doc_text": ansible_doc_text.ANSIBLE_DOC_TEXT_FORMAT,
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "test_name, test_data",
+    TEST_DATA,
+    ids=[test_name for test_name, test_data in TEST_DATA],
+)
+def test_vectors_emit(test_name: str, test_data: t.Mapping[str, t.Any]) -> None:
+    context, parse_opts = get_context_parse_opts(test_data)
+    parsed = parse(test_data["source"], context, **parse_opts)
+    rst_opts = get_rst_opts(test_data)
+    md_opts, md_link_provider = get_md_opts_link_provider(test_data)
+
+    def check(
+        key: str,
+        formatter: Formatter,
+        emit_paragraph: t.Callable[[str], str],
+        postprocess_paragraph: t.Callable[[str], str],
+        par_empty: str,
+        link_provider: t.Optional[LinkProvider] = None,
+        **kwargs,
+    ) -> None:
+        current_plugin = kwargs.get("current_plugin")
+        for paragraph in parsed:
+            par = format_paragraphs(
+                [paragraph],
+                formatter,
+                link_provider=link_provider,
+                current_plugin=current_plugin,
+            )
+            assert emit_paragraph(par) == postprocess_paragraph(par)
+        if key in test_data:
+            result = format_paragraphs(
+                parsed,
+                formatter,
+                link_provider=link_provider,
+                par_sep="\n\n",
+                par_empty=par_empty,
+                postprocess_paragraph=postprocess_paragraph,
+                **kwargs,
+            )
+            assert result == test_data[key]
+
+    for key, formatter in (
+        ("rst", rst.DEFAULT_ANTSIBULL_FORMATTER),
+        ("rst_plain", rst.DEFAULT_PLAIN_FORMATTER),
+    ):
+        check(
+            key,
+            formatter,
+            rst._emit_paragraph,
+            rst.postprocess_rst_paragraph,
+            "\\",
+            **rst_opts,
+        )
+    check(
+        "md",
+        md.DEFAULT_FORMATTER,
+        md._emit_paragraph,
+        md.postprocess_md_paragraph,
+        " ",
+        md_link_provider,
+        **md_opts,
+    )
+
+
+def _parse_error(text: t.Union[str, t.List[str]], *args, **kwargs) -> t.Any:
+    try:
+        return parse(text, *args, **kwargs)
+    except ValueError as exc:
+        return str(exc)
+
+
+@pytest.mark.parametrize("add_span", [False, True])
+@pytest.mark.parametrize(
+    "test_name, test_data",
+    TEST_DATA,
+    ids=[test_name for test_name, test_data in TEST_DATA],
+)
+def test_vectors_reparse(
+    test_name: str, test_data: t.Mapping[str, t.Any], add_span: bool
+) -> None:
+    context, parse_opts = get_context_parse_opts(test_data)
+    parse_opts["add_span"] = add_span
+    source = test_data["source"]
+    texts = [source] if isinstance(source, str) else list(source)
+    parsed = _parse_error(source, context, add_source=True, **parse_opts)
+    if isinstance(parsed, str):
+        return
+    rng = random.Random(test_name)
+    for index, paragraph in enumerate(parsed):
+        paragraph_index = None if isinstance(source, str) else index
+        for _ in range(20):
+            text = texts[index]
+            start = rng.randint(0, len(text))
+            end = rng.randint(start, min(len(text), start + 10))
+            # Insert pieces of the text itself so that markup is created and destroyed
+            other = rng.randint(0, len(text))
+            replacement = text[other : other + rng.randint(0, 8)]
+            texts[index] = text[:start] + replacement + text[end:]
+            if not texts[index]:
+                texts[index] = text
+                continue
+            expected = _parse_error(
+                texts[0] if isinstance(source, str) else texts,
+                context,
+                add_source=True,
+                **parse_opts,
+            )
+            try:
+                result = reparse_paragraph(
+                    paragraph,
+                    text,
+                    start,
+                    end,
+                    replacement,
+                    context,
+                    paragraph_index=paragraph_index,
+                    **parse_opts,
+                )
+            except ValueError as exc:
+                assert str(exc) == expected
+                texts[index] = text
+                continue
+            assert result == expected[index]
+            paragraph = result
+
+
+@pytest.mark.parametrize(
+    "test_name, test_data",
+    TEST_DATA,
+    ids=[test_name for test_name, test_data in TEST_DATA],
+)
+def test_vectors_bind_context(test_name: str, test_data: t.Mapping[str, t.Any]) -> None:
+    context, parse_opts = get_context_parse_opts(test_data)
+    unbound = parse_unbound(test_data["source"], **parse_opts)
+    for other_context in [
+        context,
+        Context(),
+        Context(current_plugin=dom.PluginIdentifier(fqcn="a.b.c", type="role")),
+        Context(
+            current_plugin=dom.PluginIdentifier(fqcn="a.b.c", type="role"),
+            role_entrypoint="main",
+        ),
+    ]:
+        expected = _parse_error(test_data["source"], other_context, **parse_opts)
+        try:
+            result = bind_context(unbound, other_context)
+        except ValueError as exc:
+            result = str(exc)
+        assert result == expected